@@ -2,9 +2,12 @@
 Core Importer functionality for Django Gyro.
 """
 
+import contextlib
 import csv
 import os
+import tempfile
 import warnings
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any, Dict, List, Optional, Type, Union
 
 from django.db import models
@@ -51,6 +54,12 @@ class ImporterMeta(type):
         # Register the importer
         cls._registry[model] = cls
 
+        # Dependencies are read from the registry, so cached ones may now be incomplete
+        from .importing import ExportPlan
+
+        ExportPlan.clear_caches()
+        ImportJob._dependency_cache.clear()
+
         # Validate columns if they exist
         if hasattr(cls, "Columns"):
             mcs._validate_columns(cls, model)
@@ -349,6 +358,26 @@ class ImportJob:
         Returns:
             list: Sorted list of ImportJob instances
 
+        Raises:
+            ValueError: If circular dependencies are detected
+        """
+        return [job for level in cls.group_by_dependency_level(jobs) for job in level]
+
+    @classmethod
+    def group_by_dependency_level(cls, jobs):
+        """
+        Group ImportJobs into dependency levels.
+
+        Each level holds the jobs whose dependencies are all satisfied by
+        earlier levels, so jobs within one level are independent of each
+        other and can run concurrently.
+
+        Args:
+            jobs: List of ImportJob instances to group
+
+        Returns:
+            list: Lists of ImportJob instances, one per level, in dependency order
+
         Raises:
             ValueError: If circular dependencies are detected
         """
@@ -363,31 +392,25 @@ class ImportJob:
                 models_in_cycle = [j.model.__name__ for j in jobs]
                 raise ValueError(f"Circular dependency detected among models: {models_in_cycle}") from e
 
-        # Topological sort
-        sorted_jobs = []
+        # Topological sort, one level of ready jobs at a time
+        levels = []
         remaining_jobs = list(jobs)
 
         while remaining_jobs:
             # Find jobs with no unsatisfied dependencies
-            ready_jobs = []
-            for job in remaining_jobs:
-                job_deps = dependencies[job.model]
-                unsatisfied_deps = [dep for dep in job_deps if dep in [j.model for j in remaining_jobs]]
-
-                if not unsatisfied_deps:
-                    ready_jobs.append(job)
+            remaining_models = {j.model for j in remaining_jobs}
+            ready_jobs = [job for job in remaining_jobs if not remaining_models.intersection(dependencies[job.model])]
 
             if not ready_jobs:
                 # If no jobs are ready, we have a circular dependency
-                remaining_models = [job.model.__name__ for job in remaining_jobs]
-                raise ValueError(f"Circular dependency detected among models: {remaining_models}")
+                remaining_names = [job.model.__name__ for job in remaining_jobs]
+                raise ValueError(f"Circular dependency detected among models: {remaining_names}")
 
-            # Add ready jobs to sorted list and remove from remaining
-            sorted_jobs.extend(ready_jobs)
-            for job in ready_jobs:
-                remaining_jobs.remove(job)
+            # Record the level and remove its jobs from remaining
+            levels.append(ready_jobs)
+            remaining_jobs = [job for job in remaining_jobs if job not in ready_jobs]
 
-        return sorted_jobs
+        return levels
 
     def _is_django_model(self, obj):
         """Check if an object is a Django model class."""
@@ -427,6 +450,9 @@ class DataSlicer:
     in the correct dependency order.
     """
 
+    # Default cap on concurrent exports in run(); each worker holds its own source connection
+    DEFAULT_MAX_WORKERS = 4
+
     def __init__(self, config: List[Union[Type["Importer"], Type[models.Model]]]):
         """
         Initialize DataSlicer with list of importers or models.
@@ -538,7 +564,7 @@ class DataSlicer:
         return {"files_created": files_created, "jobs_executed": len(jobs)}
 
     @classmethod
-    def run(cls, *, source, target, jobs, progress_callback=None, use_notebook_progress=False):
+    def run(cls, *, source, target, jobs, progress_callback=None, use_notebook_progress=False, max_workers=None):
         """
         Execute complete ETL workflow from source to target.
 
@@ -546,6 +572,17 @@ class DataSlicer:
         It orchestrates the entire process of extracting data from a source (like PostgreSQL)
         and writing it to a target (like file system).
 
+        When the target is a FileTarget configured with a server_path, PostgreSQL
+        writes each CSV file directly; otherwise COPY output is streamed through
+        this process into the target.
+
+        Jobs are grouped into dependency levels. The jobs within a level do not
+        depend on each other, so their exports run concurrently; each level
+        finishes before the next one starts. Jobs for the same model write the
+        same file, so they never share a level and run in the order given. One
+        thread pool serves the whole run, so the source opens at most
+        max_workers connections, and they are closed before run() returns.
+
         Args:
             source: Source instance (e.g., PostgresSource)
             target: Target instance (e.g., FileTarget)
@@ -553,6 +590,9 @@ class DataSlicer:
             Each job may specify an 'exclude' list of columns to omit from export.
             progress_callback: Optional callback for progress updates
             use_notebook_progress: Whether to use notebook-style progress bars
+            max_workers: Maximum concurrent exports (default: DEFAULT_MAX_WORKERS, capped at
+                the widest level). Each worker opens its own source connection; pass 1 to
+                export serially.
 
         Returns:
             Dict with execution results
@@ -567,9 +607,82 @@ class DataSlicer:
         if not isinstance(jobs, (list, tuple)):
             raise TypeError("jobs must be a list or tuple of ImportJob instances")
 
-        # Convert to list and sort by dependencies
-        jobs_list = list(jobs)
-        sorted_jobs = ImportJob.sort_by_dependencies(jobs_list)
+        if max_workers is None:
+            max_workers = cls.DEFAULT_MAX_WORKERS
+        elif max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        # Convert to list and group by dependency level
+        levels = []
+        for level in ImportJob.group_by_dependency_level(list(jobs)):
+            # Jobs for the same model write the same file, so they run one after
+            # another in consecutive levels, in the order they were given
+            while level:
+                current, deferred, level_models = [], [], set()
+                for job in level:
+                    (deferred if job.model in level_models else current).append(job)
+                    level_models.add(job.model)
+                levels.append(current)
+                level = deferred
+        sorted_jobs = [job for level in levels for job in level]
+
+        # Resolve every output filename before any export starts
+        filenames = {}
+        for job in sorted_jobs:
+            if job.model in filenames:
+                continue
+            importer = Importer.get_importer_for_model(job.model)
+            if not importer:
+                raise ValueError(f"No importer found for model {job.model.__name__}")
+            filenames[job.model] = importer.get_file_name()
+
+        if not isinstance(source, PostgresSource):
+            raise ValueError(f"Unsupported source type: {type(source)}")
+
+        server_side = isinstance(target, FileTarget) and target.supports_server_side_copy(source)
+
+        # Compile every COPY statement on this thread; Django's database connections are
+        # thread-local, so workers would otherwise each open one just to build SQL
+        copy_statements = {}
+        server_paths = {}
+        for job in sorted_jobs:
+            query = job.query if job.query is not None else job.model.objects.all()
+            exclude = getattr(job, "exclude", [])
+            if server_side:
+                server_paths[job] = target.prepare_server_side_copy(filenames[job.model])
+                copy_statements[job] = source.generate_server_side_copy_statement(
+                    query, server_paths[job][0], exclude=exclude
+                )
+            else:
+                copy_statements[job] = source.generate_copy_statement(query, filenames[job.model], exclude=exclude)
+
+        def export_job(job):
+            """Export one job, streaming COPY output straight into a file target."""
+            copy_statement = copy_statements[job]
+
+            if server_side:
+                # PostgreSQL writes the file itself; no CSV bytes reach this process
+                server_path, local_path = server_paths[job]
+                return source.execute_server_side_copy(copy_statement, server_path), local_path
+
+            if isinstance(target, FileTarget):
+                with target.open_stream(filenames[job.model]) as stream:
+                    export_result = source.execute_copy(copy_statement, stream)
+                return export_result, stream.name
+
+            # Other targets: export to a temporary file
+            with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as temp_file:
+                temp_path = temp_file.name
+
+            try:
+                # Export from PostgreSQL
+                export_result = source.execute_copy(copy_statement, temp_path)
+                return export_result, None
+
+            finally:
+                # Clean up temporary file
+                if os.path.exists(temp_path):
+                    os.unlink(temp_path)
 
         # Setup progress tracking
         if use_notebook_progress:
@@ -604,37 +717,28 @@ class DataSlicer:
         files_created = []
         total_rows_exported = 0
 
-        # Execute jobs with progress tracking
-        with tqdm(total=len(sorted_jobs), desc="Exporting data") as pbar:
-            for job in sorted_jobs:
-                # Find importer for this model
-                importer = Importer.get_importer_for_model(job.model)
-                if not importer:
-                    raise ValueError(f"No importer found for model {job.model.__name__}")
-
-                # Generate filename
-                filename = importer.get_file_name()
-
-                # Execute based on source type
-                if isinstance(source, PostgresSource):
-                    # Use PostgreSQL COPY operation
-                    query = job.query if job.query is not None else job.model.objects.all()
-
-                    # Create temporary file for this export
-                    import tempfile
-
-                    with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as temp_file:
-                        temp_path = temp_file.name
+        # Reuse one pool across levels so worker threads, and their connections, are not multiplied per level
+        workers = min(max(len(level) for level in levels), max_workers)
+        executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
 
-                    try:
-                        # Export from PostgreSQL
-                        export_result = source.export_queryset(query, temp_path, exclude=getattr(job, "exclude", []))
+        def export_level(level):
+            """Yield (job, result) for each job in a level as its export finishes."""
+            if executor is None:
+                for job in level:
+                    yield job, export_job(job)
+                return
 
-                        # Copy to target
-                        if isinstance(target, FileTarget):
-                            copy_result = target.copy_file_from_source(temp_path, filename)
-                            files_created.append(copy_result["target_path"])
+            futures = {executor.submit(export_job, job): job for job in level}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
 
+        # Execute jobs level by level with progress tracking
+        try:
+            with tqdm(total=len(sorted_jobs), desc="Exporting data") as pbar, executor or contextlib.nullcontext():
+                for level in levels:
+                    level_results = {}
+                    for job, (export_result, target_path) in export_level(level):
+                        level_results[job] = target_path
                         total_rows_exported += export_result.get("rows_exported", 0)
 
                         # Call progress callback if provided
@@ -642,24 +746,23 @@ class DataSlicer:
                             progress_callback(
                                 {
                                     "job": job,
-                                    "file_created": filename,
+                                    "file_created": filenames[job.model],
                                     "rows_exported": export_result.get("rows_exported", 0),
                                     "file_size": export_result.get("file_size", 0),
                                 }
                             )
 
-                    finally:
-                        # Clean up temporary file
-                        import os
-
-                        if os.path.exists(temp_path):
-                            os.unlink(temp_path)
-
-                else:
-                    raise ValueError(f"Unsupported source type: {type(source)}")
-
-                # Update progress bar
-                pbar.update(1)
+                        # Update progress bar
+                        pbar.update(1)
+
+                    # Record files in job order, whichever export finished first
+                    for job in level:
+                        if level_results[job] is not None:
+                            files_created.append(level_results[job])
+        finally:
+            if executor is not None:
+                # Pool threads have exited; close their connections rather than leaving one per thread per run
+                source.close_thread_connections()
 
         return {
             "jobs_executed": len(sorted_jobs),
@@ -6,12 +6,20 @@ back into Django models with support for ID remapping, bulk loading,
 and circular dependency resolution.
 """
 
+import functools
+import graphlib
+import hashlib
+import os
 from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Type
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Set, TextIO, Tuple, Type, Union
 
+from django.core.exceptions import EmptyResultSet
 from django.db import models
+from psycopg2.extras import execute_values
 
 
 @dataclass
@@ -48,6 +56,10 @@ class ImportContext:
             self.id_mapping[model_label] = {}
         self.id_mapping[model_label][old_id] = new_id
 
+    def update_id_mappings(self, model_label: str, old_ids: Iterable[int], new_ids: Iterable[int]) -> None:
+        """Add a batch of ID mappings for a model, pairing old_ids with new_ids in order."""
+        self.id_mapping.setdefault(model_label, {}).update(zip(_source_id_values(old_ids), _source_id_values(new_ids)))
+
     def get_id_mapping(self, model_label: str, old_id: int) -> Optional[int]:
         """Get the new ID for an old ID, or None if not mapped."""
         return self.id_mapping.get(model_label, {}).get(old_id)
@@ -62,7 +74,31 @@ class ImportContext:
 
     def discover_csv_files(self) -> List[Path]:
         """Discover all CSV files in the source directory."""
-        return sorted(self.source_directory.glob("*.csv"))
+        # scandir entries carry their file type, so matching needs no Path or stat() per entry
+        with os.scandir(self.source_directory) as entries:
+            return sorted(
+                self.source_directory / entry.name
+                for entry in entries
+                if entry.name.endswith(".csv") and entry.is_file()
+            )
+
+
+def _source_id_values(source_ids: Any) -> Iterable[Any]:
+    """
+    Normalize source IDs to an iterable of plain Python values.
+
+    Array-likes such as array.array, numpy arrays or pandas Series are converted
+    with a single tolist() call, which is faster than iterating them element by
+    element and yields built-in ints rather than numpy scalars. A single scalar
+    ID is wrapped in a tuple.
+    """
+    if hasattr(source_ids, "tolist"):
+        values = source_ids.tolist()
+        # 0-d arrays and numpy scalars convert to a bare value
+        return values if isinstance(values, list) else (values,)
+    if hasattr(source_ids, "__iter__") and not isinstance(source_ids, (str, bytes)):
+        return source_ids
+    return (source_ids,)
 
 
 class IdRemappingStrategy(ABC):
@@ -77,37 +113,131 @@ class IdRemappingStrategy(ABC):
 class SequentialRemappingStrategy(IdRemappingStrategy):
     """Assigns new sequential IDs starting from MAX(existing_id) + 1."""
 
-    def __init__(self, model):
+    def __init__(self, model, max_id: Optional[int] = None):
+        """
+        Args:
+            model: Django model whose IDs are remapped
+            max_id: Current MAX(id) of the model's table, e.g. from preallocate().
+                When given, generate_mapping skips its own MAX() query.
+        """
         self.model = model
+        self.max_id = max_id
 
-    def generate_mapping(self, source_ids: Any, target_db: Any) -> Dict[int, int]:
-        """Generate sequential ID mappings."""
-        # Convert to list and get unique values
-        if hasattr(source_ids, "__iter__") and not isinstance(source_ids, (str, bytes)):
-            # Preserve order while removing duplicates
-            seen = set()
-            unique_source_ids = []
-            for sid in source_ids:
-                if sid not in seen:
-                    seen.add(sid)
-                    unique_source_ids.append(sid)
-        else:
-            unique_source_ids = [source_ids]
+    @classmethod
+    def preallocate(cls, models_to_map: Iterable[Type[models.Model]], target_db: Any) -> Dict[Type[models.Model], int]:
+        """
+        Read MAX(id) for several models in one round trip.
+
+        Args:
+            models_to_map: Django models to read the current maximum ID for
+            target_db: Database connection to query
 
-        # Query database for current MAX(id)
+        Returns:
+            Dict mapping each model to its table's current MAX(id), 0 when empty
+        """
+        models_to_map = list(models_to_map)
+        if not models_to_map:
+            return {}
+
+        # Tag each row with its model's position, since UNION ALL row order isn't guaranteed
+        sql = " UNION ALL ".join(
+            f"SELECT {index}, COALESCE(MAX(id), 0) FROM {model._meta.db_table}"
+            for index, model in enumerate(models_to_map)
+        )
         with target_db.cursor() as cursor:
-            cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {self.model._meta.db_table}")
-            max_id = cursor.fetchone()[0]
+            cursor.execute(sql)
+            rows = cursor.fetchall()
 
-        # Generate sequential mappings
-        mapping = {}
-        next_id = max_id + 1
+        return {models_to_map[index]: max_id for index, max_id in rows}
+
+    @classmethod
+    def generate_mappings(
+        cls, source_ids_by_model: Mapping[Type[models.Model], Any], target_db: Any
+    ) -> Dict[Type[models.Model], Dict[int, int]]:
+        """
+        Generate sequential ID mappings for several models with one MAX() round trip.
+
+        Args:
+            source_ids_by_model: Source IDs to remap, keyed by model
+            target_db: Database connection to query
+
+        Returns:
+            Dict mapping each model to its old-to-new ID mapping
+        """
+        max_ids = cls.preallocate(source_ids_by_model, target_db)
+        return {
+            model: cls(model, max_id=max_ids[model]).generate_mapping(source_ids, target_db)
+            for model, source_ids in source_ids_by_model.items()
+        }
+
+    def generate_mapping(self, source_ids: Any, target_db: Any = None, *, cursor: Any = None) -> Dict[int, int]:
+        """
+        Generate sequential ID mappings.
+
+        Pass an open ``cursor`` to share it across a batch of strategies
+        instead of opening one from ``target_db`` per call.
+        """
+        return dict(self.iter_mapping(source_ids, target_db, cursor=cursor))
 
-        for source_id in unique_source_ids:
-            mapping[source_id] = next_id
-            next_id += 1
+    def iter_mapping(self, source_ids: Any, target_db: Any = None, *, cursor: Any = None) -> Iterator[Tuple[int, int]]:
+        """
+        Lazily yield (old_id, new_id) pairs without building a mapping dict.
+
+        For callers that walk the pairs once. Source IDs are deduplicated and
+        the new ID range is reserved up front; only the pairing is deferred.
+        """
+        if isinstance(source_ids, range):
+            # A range never repeats a value, so there is nothing to deduplicate
+            unique_source_ids = source_ids
+        else:
+            # Get unique values; dict keys keep first-seen order, so no list copy is needed
+            unique_source_ids = dict.fromkeys(_source_id_values(source_ids))
+
+        if self.max_id is not None:
+            max_id = self.max_id
+            # Later batches continue after the IDs handed out here
+            self.max_id += len(unique_source_ids)
+        elif cursor is not None:
+            max_id = self._query_max_id(cursor)
+        else:
+            with target_db.cursor() as cursor:
+                max_id = self._query_max_id(cursor)
+
+        # Pair each unique source ID with the next sequential ID
+        new_ids = range(max_id + 1, max_id + 1 + len(unique_source_ids))
+        return zip(unique_source_ids, new_ids)
 
-        return mapping
+    def _query_max_id(self, cursor: Any) -> int:
+        """Query the current MAX(id) of the model's table."""
+        cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {self.model._meta.db_table}")
+        return cursor.fetchone()[0]
+
+
+@functools.lru_cache(maxsize=None)
+def _label_hasher(model_label: str):
+    """Return an MD5 hasher primed with a model's "<label>_" hash prefix."""
+    return hashlib.md5(f"{model_label}_".encode())
+
+
+@functools.lru_cache(maxsize=65536)
+def _hashed_business_id(model_label: str, business_text: str) -> int:
+    """
+    Hash one formatted business value into a positive ID.
+
+    Cached at module level, so every HashBasedRemappingStrategy for the same
+    model reuses hashes from earlier imports instead of rerunning MD5. Callers
+    pass the value already formatted, so the cache keys on the text that is
+    hashed: 1, 1.0 and True stay distinct, and unhashable values still work.
+    """
+    # Continue from the hashed "<label>_" prefix instead of rehashing it per value
+    hasher = _label_hasher(model_label).copy()
+    hasher.update(business_text.encode())
+
+    # Use the first 4 digest bytes (the first 8 hex digits) as the ID
+    hash_id = int.from_bytes(hasher.digest()[:4], "big")
+
+    # Ensure positive ID
+    return hash_id or 1
 
 
 class HashBasedRemappingStrategy(IdRemappingStrategy):
@@ -119,8 +249,6 @@ class HashBasedRemappingStrategy(IdRemappingStrategy):
 
     def generate_mapping(self, source_data: Any) -> Dict[int, int]:
         """Generate hash-based ID mappings using business key."""
-        import hashlib
-
         mapping = {}
 
         # Ensure we have a dictionary or list of dictionaries
@@ -145,27 +273,15 @@ class HashBasedRemappingStrategy(IdRemappingStrategy):
         else:
             raise ValueError("HashBasedRemappingStrategy requires dict or list of dicts input")
 
-        for row in source_data:
-            source_id = row["id"]
-            business_value = row[self.business_key]
+        model_label = self.model._meta.label
+        business_key = self.business_key
 
-            # Skip empty business values
-            if business_value is None or business_value == "":
-                continue
-
-            # Generate deterministic hash-based ID
-            hash_input = f"{self.model._meta.label}_{business_value}"
-            hash_object = hashlib.md5(hash_input.encode())
-            # Use first 8 bytes of hash as integer (avoid collision in most cases)
-            hash_id = int(hash_object.hexdigest()[:8], 16)
-
-            # Ensure positive ID
-            if hash_id <= 0:
-                hash_id = abs(hash_id) + 1
-
-            mapping[source_id] = hash_id
-
-        return mapping
+        # Generate deterministic hash-based IDs in one pass, skipping empty business values
+        return {
+            row["id"]: _hashed_business_id(model_label, f"{business_value}")
+            for row in source_data
+            if (business_value := row[business_key]) is not None and business_value != ""
+        }
 
 
 class NoRemappingStrategy(IdRemappingStrategy):
@@ -176,11 +292,8 @@ class NoRemappingStrategy(IdRemappingStrategy):
 
     def generate_mapping(self, source_ids: Any, target_db: Any = None) -> Dict[int, int]:
         """Generate identity mapping (no change)."""
-        # Convert to iterable and create identity mapping
-        if hasattr(source_ids, "__iter__") and not isinstance(source_ids, (str, bytes)):
-            return {source_id: source_id for source_id in source_ids}
-        else:
-            return {source_ids: source_ids}
+        # A comprehension beats list() + dict(zip(ids, ids)) here and needs no copy
+        return {source_id: source_id for source_id in _source_id_values(source_ids)}
 
 
 class PostgresBulkLoader:
@@ -197,7 +310,7 @@ class PostgresBulkLoader:
     def load_csv_with_copy(
         self,
         model: Type[models.Model],
-        csv_path: Path,
+        csv_path: Union[Path, TextIO],
         connection: Any,
         id_mappings: Optional[Dict[str, Dict[int, int]]] = None,
         on_conflict: str = "raise",
@@ -208,7 +321,7 @@ class PostgresBulkLoader:
 
         Args:
             model: Django model to load data into
-            csv_path: Path to CSV file
+            csv_path: Path to CSV file, or a seekable text stream of CSV data
             connection: Database connection
             id_mappings: Optional ID remapping dictionary
             on_conflict: How to handle conflicts ('raise', 'ignore', 'update')
@@ -217,8 +330,7 @@ class PostgresBulkLoader:
         Returns:
             Dictionary with load statistics
         """
-        if not csv_path.exists():
-            raise FileNotFoundError(f"CSV file not found: {csv_path}")
+        self._check_csv_exists(csv_path)
 
         staging_table = f"import_staging_{model._meta.db_table}"
 
@@ -254,7 +366,7 @@ class PostgresBulkLoader:
     def load_csv_with_insert(
         self,
         model: Type[models.Model],
-        csv_path: Path,
+        csv_path: Union[Path, TextIO],
         connection: Any,
         batch_size: int = 1000,
         id_mappings: Optional[Dict[str, Dict[int, int]]] = None,
@@ -264,7 +376,7 @@ class PostgresBulkLoader:
 
         Args:
             model: Django model to load data into
-            csv_path: Path to CSV file
+            csv_path: Path to CSV file, or a text stream of CSV data
             connection: Database connection
             batch_size: Number of rows to insert per batch
             id_mappings: Optional ID remapping dictionary
@@ -274,14 +386,13 @@ class PostgresBulkLoader:
         """
         import csv
 
-        if not csv_path.exists():
-            raise FileNotFoundError(f"CSV file not found: {csv_path}")
+        self._check_csv_exists(csv_path)
 
         # Read CSV in chunks for memory efficiency
         total_rows = 0
 
         with connection.cursor() as cursor:
-            with open(csv_path, newline="", encoding="utf-8") as csvfile:
+            with self._open_csv(csv_path) as csvfile:
                 reader = csv.DictReader(csvfile)
                 batch = []
 
@@ -306,7 +417,7 @@ class PostgresBulkLoader:
         return {"rows_loaded": total_rows, "used_copy": False}
 
     def load_csv_batch(
-        self, model: Type[models.Model], csv_paths: List[Path], connection: Any, **kwargs
+        self, model: Type[models.Model], csv_paths: List[Union[Path, TextIO]], connection: Any, **kwargs
     ) -> List[Dict[str, Any]]:
         """Load multiple CSV files in batch."""
         results = []
@@ -318,7 +429,7 @@ class PostgresBulkLoader:
         return results
 
     def load_csv_with_context(
-        self, model: Type[models.Model], csv_path: Path, context: "ImportContext", connection: Any
+        self, model: Type[models.Model], csv_path: Union[Path, TextIO], context: "ImportContext", connection: Any
     ) -> Dict[str, Any]:
         """Load CSV using ImportContext configuration."""
         if context.use_copy:
@@ -334,6 +445,22 @@ class PostgresBulkLoader:
                 id_mappings=context.id_mapping,
             )
 
+    @staticmethod
+    def _check_csv_exists(csv_path: Union[Path, TextIO]) -> None:
+        """Raise FileNotFoundError for a CSV path that does not exist; streams always pass."""
+        if not hasattr(csv_path, "read") and not csv_path.exists():
+            raise FileNotFoundError(f"CSV file not found: {csv_path}")
+
+    @staticmethod
+    @contextmanager
+    def _open_csv(csv_path: Union[Path, TextIO]) -> Iterator[TextIO]:
+        """Yield a text stream for the CSV; streams passed in are left open for the caller."""
+        if hasattr(csv_path, "read"):
+            yield csv_path
+        else:
+            with open(csv_path, newline="", encoding="utf-8") as csvfile:
+                yield csvfile
+
     def _create_staging_table(self, cursor: Any, model: Type[models.Model]) -> None:
         """Create temporary staging table with same structure as target table."""
         staging_table = f"import_staging_{model._meta.db_table}"
@@ -348,39 +475,40 @@ class PostgresBulkLoader:
             alter_sql = f'ALTER TABLE "{staging_table}" ALTER COLUMN "{geom_column}" TYPE TEXT'
             cursor.execute(alter_sql)
 
-    def _copy_csv_to_staging(self, cursor: Any, csv_path: Path, model: Type[models.Model]) -> None:
+    def _copy_csv_to_staging(self, cursor: Any, csv_path: Union[Path, TextIO], model: Type[models.Model]) -> None:
         """Copy CSV data to staging table using PostgreSQL COPY command."""
         import csv
 
         staging_table = f"import_staging_{model._meta.db_table}"
 
-        # Read CSV headers to determine column mapping
-        with open(csv_path, newline="", encoding="utf-8") as csvfile:
-            reader = csv.reader(csvfile)
-            csv_headers = next(reader)
-
-        # Get database table column names
-        db_columns = [field.column for field in model._meta.get_fields() if hasattr(field, "column")]
-
-        # Map CSV headers to database columns (exact match for now)
-        mapped_columns = []
-        for header in csv_headers:
-            if header in db_columns:
-                mapped_columns.append(header)
-            else:
-                # Log warning about unmapped column but continue
-                print(f"Warning: CSV column '{header}' not found in model {model.__name__}")
+        with self._open_csv(csv_path) as csvfile:
+            # Read CSV headers to determine column mapping, then rewind so
+            # COPY ... HEADER sees the same stream without reopening the file
+            start = csvfile.tell()
+            csv_headers = next(csv.reader(csvfile))
+            csvfile.seek(start)
+
+            # Get database table column names
+            db_columns = [field.column for field in model._meta.get_fields() if hasattr(field, "column")]
+
+            # Map CSV headers to database columns (exact match for now)
+            mapped_columns = []
+            for header in csv_headers:
+                if header in db_columns:
+                    mapped_columns.append(header)
+                else:
+                    # Log warning about unmapped column but continue
+                    print(f"Warning: CSV column '{header}' not found in model {model.__name__}")
 
-        if not mapped_columns:
-            raise ValueError(f"No CSV columns could be mapped to database columns for model {model.__name__}")
+            if not mapped_columns:
+                raise ValueError(f"No CSV columns could be mapped to database columns for model {model.__name__}")
 
-        # Construct COPY statement with explicit column list - quote identifiers for PostgreSQL
-        quoted_columns = [f'"{column}"' for column in mapped_columns]
-        columns_sql = "(" + ", ".join(quoted_columns) + ")"
-        copy_sql = f'COPY "{staging_table}" {columns_sql} FROM STDIN WITH CSV HEADER'
+            # Construct COPY statement with explicit column list - quote identifiers for PostgreSQL
+            quoted_columns = [f'"{column}"' for column in mapped_columns]
+            columns_sql = "(" + ", ".join(quoted_columns) + ")"
+            copy_sql = f'COPY "{staging_table}" {columns_sql} FROM STDIN WITH CSV HEADER'
 
-        with open(csv_path, newline="", encoding="utf-8") as f:
-            cursor.copy_expert(copy_sql, f)
+            cursor.copy_expert(copy_sql, csvfile)
 
     def _apply_id_remappings(
         self, cursor: Any, model: Type[models.Model], staging_table: str, id_mappings: Dict[str, Dict[int, int]]
@@ -403,15 +531,15 @@ class PostgresBulkLoader:
 
     def _apply_fk_remapping(self, cursor: Any, staging_table: str, column_name: str, mapping: Dict[int, int]) -> None:
         """Apply foreign key remapping using efficient CASE statement."""
-        if not mapping:
+        # IDs that map to themselves need no update, e.g. NoRemappingStrategy output
+        changed = [(old_id, new_id) for old_id, new_id in mapping.items() if old_id != new_id]
+        if not changed:
             return
 
         # Build CASE statement for efficient bulk update
-        case_clauses = []
-        for old_id, new_id in mapping.items():
-            case_clauses.append(f'WHEN "{column_name}" = {old_id} THEN {new_id}')
+        case_clauses = [f'WHEN "{column_name}" = {old_id} THEN {new_id}' for old_id, new_id in changed]
 
-        old_ids = ", ".join(str(old_id) for old_id in mapping.keys())
+        old_ids = ", ".join(str(old_id) for old_id, _new_id in changed)
 
         sql = f'UPDATE "{staging_table}" SET "{column_name}" = CASE {" ".join(case_clauses)} END WHERE "{column_name}" IN ({old_ids})'
 
@@ -558,6 +686,12 @@ class CircularDependency:
     nullable_field: Optional[str] = None  # Which field can be loaded as NULL initially
 
 
+@functools.lru_cache(maxsize=1024)
+def _model_fk_fields(model: Type[models.Model]) -> Tuple[models.ForeignKey, ...]:
+    """Return the ForeignKey fields declared on model, walking _meta only once per model."""
+    return tuple(f for f in model._meta.get_fields() if isinstance(f, models.ForeignKey))
+
+
 class CircularDependencyResolver:
     """
     Resolves circular dependencies during import by using deferred updates.
@@ -570,9 +704,19 @@ class CircularDependencyResolver:
     5. Update first model's nullable FK with correct values
     """
 
+    # Above this many models, cycle detection falls back to Tarjan's SCC pass
+    BITSET_MAX_MODELS = 64
+
     def __init__(self):
         self.detected_cycles = []
         self.deferred_updates = []
+        # FK graphs built by this resolver, keyed by model list
+        self._graph_cache = {}
+
+    @classmethod
+    def clear_caches(cls) -> None:
+        """Drop the per-model FK fields shared by all resolvers, e.g. after models are redefined."""
+        _model_fk_fields.cache_clear()
 
     def detect_circular_dependencies(self, models: List[Type[models.Model]]) -> List[CircularDependency]:
         """
@@ -584,61 +728,244 @@ class CircularDependencyResolver:
         Returns:
             List of CircularDependency objects
         """
-        cycles = []
+        graph = self._build_fk_graph(models)
 
-        for i, model_a in enumerate(models):
-            for _j, model_b in enumerate(models[i + 1 :], i + 1):
-                cycle = self._find_cycle_between_models(model_a, model_b)
-                if cycle:
-                    cycles.append(cycle)
+        # Fast path: most schemas are DAGs, which Kahn's algorithm drains
+        # completely. Only models it cannot drain can sit on a cycle.
+        remaining = self._undrained_models(models, graph)
+        if not remaining:
+            self.detected_cycles = []
+            return []
+
+        if len(remaining) <= self.BITSET_MAX_MODELS:
+            cycles = self._detect_cycles_bitset(remaining, graph)
+        else:
+            cycles, _components = self._analyze_dependency_graph(remaining, graph)
+        return cycles
+
+    def _build_fk_graph(self, models: List[Type[models.Model]]) -> Dict[Type[models.Model], List[Type[models.Model]]]:
+        """
+        Map each model to the other given models it references via FK.
+
+        Graphs are cached per model list for the lifetime of this resolver,
+        so callers must not mutate the result.
+        """
+        cache_key = tuple(models)
+        if cache_key in self._graph_cache:
+            return self._graph_cache[cache_key]
+
+        graph = {model: [] for model in models}
+        for model_a in models:
+            for model_b in models:
+                if model_a is not model_b and self._find_fk_to_model(model_a, model_b):
+                    graph[model_a].append(model_b)
+
+        self._graph_cache[cache_key] = graph
+        return graph
+
+    def _undrained_models(
+        self, models: List[Type[models.Model]], graph: Dict[Type[models.Model], List[Type[models.Model]]]
+    ) -> List[Type[models.Model]]:
+        """
+        Run Kahn's algorithm and return the models it could not remove.
+
+        The result is empty for an acyclic graph. Otherwise it holds every
+        cycle plus the models those cycles depend on, and no remaining model
+        references a removed one.
+        """
+        in_degree = dict.fromkeys(models, 0)
+        for model in models:
+            for dependency in graph[model]:
+                in_degree[dependency] += 1
+
+        ready = deque(model for model in models if in_degree[model] == 0)
+        while ready:
+            model = ready.popleft()
+            del in_degree[model]
+            for dependency in graph[model]:
+                in_degree[dependency] -= 1
+                if in_degree[dependency] == 0:
+                    ready.append(dependency)
+
+        return [model for model in models if model in in_degree]
+
+    def _reachability_masks(
+        self, models: List[Type[models.Model]], graph: Dict[Type[models.Model], List[Type[models.Model]]]
+    ) -> List[int]:
+        """
+        Return, per model, a bitmask of the models reachable through its FKs.
+
+        Bit j of the i-th mask is set when models[j] can be reached from
+        models[i]. Each mask absorbs the masks of the models it reaches
+        until no mask changes.
+        """
+        bit = {model: 1 << i for i, model in enumerate(models)}
+        reach = []
+        for model in models:
+            mask = 0
+            for dependency in graph[model]:
+                mask |= bit.get(dependency, 0)
+            reach.append(mask)
+
+        changed = True
+        while changed:
+            changed = False
+            for i, mask in enumerate(reach):
+                expanded = mask
+                pending = mask
+                while pending:
+                    lowest = pending & -pending
+                    expanded |= reach[lowest.bit_length() - 1]
+                    pending ^= lowest
+                if expanded != mask:
+                    reach[i] = expanded
+                    changed = True
+        return reach
+
+    def _detect_cycles_bitset(
+        self, models: List[Type[models.Model]], graph: Dict[Type[models.Model], List[Type[models.Model]]]
+    ) -> List[CircularDependency]:
+        """
+        Detect cycles among a small set of models using reachability bitmasks.
+
+        Two models share a strongly connected component when each reaches the
+        other. A component reaches strictly more models than any component it
+        depends on, so ordering components by reach size keeps cycles in
+        dependency-first order, as the Tarjan pass does.
+        """
+        reach = self._reachability_masks(models, graph)
+
+        components = []
+        assigned = 0
+        for i in range(len(models)):
+            if assigned >> i & 1 or not reach[i] >> i & 1:
+                # Already grouped, or not on any cycle
+                continue
+            members = [j for j in range(i, len(models)) if reach[i] >> j & 1 and reach[j] >> i & 1]
+            for j in members:
+                assigned |= 1 << j
+            components.append((bin(reach[i]).count("1"), i, [models[j] for j in members]))
+        components.sort(key=lambda component: component[:2])
+
+        cycles = []
+        for _size, _first, component in components:
+            for i, model_a in enumerate(component):
+                for model_b in component[i + 1 :]:
+                    cycle = self._find_cycle_between_models(model_a, model_b)
+                    if cycle:
+                        cycles.append(cycle)
 
         self.detected_cycles = cycles
         return cycles
 
+    def _analyze_dependency_graph(
+        self,
+        models: List[Type[models.Model]],
+        graph: Optional[Dict[Type[models.Model], List[Type[models.Model]]]] = None,
+    ) -> Tuple[List[CircularDependency], List[List[Type[models.Model]]]]:
+        """
+        Run a single Tarjan SCC pass over the FK graph of ``models``.
+
+        Tarjan emits each strongly connected component only after every
+        component it depends on, so the component list is already in
+        loading order. Components with more than one model are the cycles.
+
+        Returns:
+            Tuple of (detected cycles, components in dependency-first order)
+        """
+        if graph is None:
+            graph = self._build_fk_graph(models)
+        position = {model: i for i, model in enumerate(models)}
+
+        index_of = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+        components = []
+
+        for root in models:
+            if root in index_of:
+                continue
+
+            index_of[root] = lowlink[root] = len(index_of)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(graph[root]))]
+
+            while work:
+                node, neighbors = work[-1]
+                advanced = False
+                for neighbor in neighbors:
+                    if neighbor not in index_of:
+                        index_of[neighbor] = lowlink[neighbor] = len(index_of)
+                        stack.append(neighbor)
+                        on_stack.add(neighbor)
+                        work.append((neighbor, iter(graph[neighbor])))
+                        advanced = True
+                        break
+                    if neighbor in on_stack:
+                        lowlink[node] = min(lowlink[node], index_of[neighbor])
+
+                if advanced:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+                if lowlink[node] == index_of[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member is node:
+                            break
+                    # Keep the caller's ordering inside a component
+                    component.sort(key=position.__getitem__)
+                    components.append(component)
+
+        cycles = []
+        for component in components:
+            for i, model_a in enumerate(component):
+                for model_b in component[i + 1 :]:
+                    cycle = self._find_cycle_between_models(model_a, model_b)
+                    if cycle:
+                        cycles.append(cycle)
+
+        self.detected_cycles = cycles
+        return cycles, components
+
+    def _fk_fields(self, model: Type[models.Model]) -> Tuple[models.ForeignKey, ...]:
+        """Return the ForeignKey fields declared on model, shared across resolvers."""
+        return _model_fk_fields(model)
+
+    def _find_fk_to_model(self, model_a: Type[models.Model], model_b: Type[models.Model]) -> Optional[str]:
+        """Return the name of the first FK on model_a that references model_b, if any."""
+        for model_field in self._fk_fields(model_a):
+            # Handle both class references and string references. related_model
+            # is read per call because lazy string references resolve later.
+            related_model = model_field.related_model
+            if hasattr(related_model, "_meta"):
+                # Direct class reference
+                if related_model == model_b:
+                    return model_field.name
+            else:
+                # String reference - compare by name
+                if (
+                    related_model == model_b.__name__
+                    or related_model == f"{model_b._meta.app_label}.{model_b.__name__}"
+                ):
+                    return model_field.name
+        return None
+
     def _find_cycle_between_models(
         self, model_a: Type[models.Model], model_b: Type[models.Model]
     ) -> Optional[CircularDependency]:
         """Check if there's a circular dependency between two specific models."""
-
-        # Find FK from model_a to model_b
-        field_a_to_b = None
-        for model_field in model_a._meta.get_fields():
-            if isinstance(model_field, models.ForeignKey):
-                # Handle both class references and string references
-                related_model = model_field.related_model
-                if hasattr(related_model, "_meta"):
-                    # Direct class reference
-                    if related_model == model_b:
-                        field_a_to_b = model_field.name
-                        break
-                else:
-                    # String reference - compare by name
-                    if (
-                        related_model == model_b.__name__
-                        or related_model == f"{model_b._meta.app_label}.{model_b.__name__}"
-                    ):
-                        field_a_to_b = model_field.name
-                        break
-
-        # Find FK from model_b to model_a
-        field_b_to_a = None
-        for model_field in model_b._meta.get_fields():
-            if isinstance(model_field, models.ForeignKey):
-                # Handle both class references and string references
-                related_model = model_field.related_model
-                if hasattr(related_model, "_meta"):
-                    # Direct class reference
-                    if related_model == model_a:
-                        field_b_to_a = model_field.name
-                        break
-                else:
-                    # String reference - compare by name
-                    if (
-                        related_model == model_a.__name__
-                        or related_model == f"{model_a._meta.app_label}.{model_a.__name__}"
-                    ):
-                        field_b_to_a = model_field.name
-                        break
+        field_a_to_b = self._find_fk_to_model(model_a, model_b)
+        field_b_to_a = self._find_fk_to_model(model_b, model_a)
 
         # If both FKs exist, we have a circular dependency
         if field_a_to_b and field_b_to_a:
@@ -666,65 +993,71 @@ class CircularDependencyResolver:
         """
         Determine the optimal loading order considering circular dependencies.
 
-        For circular dependencies, we load the model with nullable FK first.
+        Models are loaded dependencies-first. Within a cycle, the model owning
+        the nullable FK is loaded first so the FK can be filled in afterwards.
         """
-        cycles = self.detect_circular_dependencies(models)
-
-        if not cycles:
-            # No cycles, return topological sort
-            return self._topological_sort(models)
-
-        # Handle cycles by modifying the dependency graph
-        modified_order = []
-        processed = set()
+        cycles, components = self._analyze_dependency_graph(models)
 
+        nullable_owners = set()
         for cycle in cycles:
-            if cycle.nullable_field:
-                # Load the model with nullable FK first (without FK values)
-                if cycle.nullable_field in [f.name for f in cycle.model_a._meta.get_fields()]:
-                    # model_a has the nullable field
-                    if cycle.model_a not in processed:
-                        modified_order.append(cycle.model_a)
-                        processed.add(cycle.model_a)
-                    if cycle.model_b not in processed:
-                        modified_order.append(cycle.model_b)
-                        processed.add(cycle.model_b)
-                else:
-                    # model_b has the nullable field
-                    if cycle.model_b not in processed:
-                        modified_order.append(cycle.model_b)
-                        processed.add(cycle.model_b)
-                    if cycle.model_a not in processed:
-                        modified_order.append(cycle.model_a)
-                        processed.add(cycle.model_a)
-
-        # Add remaining models
-        for model in models:
-            if model not in processed:
-                modified_order.append(model)
+            if cycle.model_a._meta.get_field(cycle.field_a).null:
+                nullable_owners.add(cycle.model_a)
+            elif cycle.nullable_field:
+                nullable_owners.add(cycle.model_b)
 
-        return modified_order
+        loading_order = []
+        for component in components:
+            # Stable sort: nullable-FK owners first, otherwise caller order
+            loading_order.extend(sorted(component, key=lambda model: model not in nullable_owners))
 
-    def _topological_sort(self, models: List[Type[models.Model]]) -> List[Type[models.Model]]:
-        """Simple topological sort for models without cycles."""
-        # This is a simplified version - in practice you'd want proper topological sorting
-        return models
+        return loading_order
 
     def prepare_deferred_updates(
-        self, cycles: List[CircularDependency], csv_data: Dict[str, Any]
+        self, cycles: List[CircularDependency], csv_data: Union[Mapping[str, Iterable[Dict[str, Any]]], Iterable]
     ) -> List[Dict[str, Any]]:
         """
         Prepare deferred update operations for circular dependencies.
 
         Args:
             cycles: List of detected circular dependencies
-            csv_data: Dictionary of CSV data keyed by model name
+            csv_data: Dictionary of CSV rows keyed by model name, or an iterable
+                of ``(model_key, row)`` pairs (see iter_deferred_update_batches)
 
         Returns:
             List of update operations to execute after initial load
         """
         updates = []
+        for batch in self.iter_deferred_update_batches(cycles, csv_data):
+            updates.extend(batch)
+
+        self.deferred_updates = updates
+        return updates
 
+    def iter_deferred_update_batches(
+        self,
+        cycles: List[CircularDependency],
+        csv_rows: Union[Mapping[str, Iterable[Dict[str, Any]]], Iterable],
+        batch_size: int = 10000,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield deferred update operations in batches of at most ``batch_size``.
+
+        ``csv_rows`` may be an iterable of ``(model_key, row)`` pairs, e.g. rows
+        streamed from ``csv.DictReader``, so only one batch of updates is held
+        in memory at a time. Each batch can be passed straight to
+        execute_deferred_updates. Model keys are either ``app_label_modelname``
+        or just ``modelname``.
+
+        Args:
+            cycles: List of detected circular dependencies
+            csv_rows: ``(model_key, row)`` pairs, or a dict of rows keyed by model key
+            batch_size: Maximum number of updates per yielded batch
+
+        Yields:
+            Lists of update operations
+        """
+        # Map each accepted CSV key to the (model, nullable field) pairs it feeds
+        targets = defaultdict(list)
         for cycle in cycles:
             if not cycle.nullable_field:
                 continue
@@ -737,64 +1070,80 @@ class CircularDependencyResolver:
                 source_model = cycle.model_b
                 nullable_field = cycle.field_b
 
-            # Read original CSV data to get the FK mappings
             # Try multiple possible key formats
-            source_csv_key = f"{source_model._meta.app_label}_{source_model._meta.model_name}"
-            if source_csv_key not in csv_data:
-                # Try without app label prefix
-                source_csv_key = source_model._meta.model_name
-
-            if source_csv_key in csv_data:
-                source_data = csv_data[source_csv_key]
-
-                # Extract ID mappings for deferred update
-                for row in source_data:
-                    if row.get(nullable_field):  # If the FK was supposed to be set
-                        updates.append(
-                            {
-                                "model": source_model,
-                                "pk": row["id"],
-                                "field": nullable_field,
-                                "value": row[nullable_field],
-                            }
-                        )
+            for source_csv_key in (
+                f"{source_model._meta.app_label}_{source_model._meta.model_name}",
+                source_model._meta.model_name,
+            ):
+                if isinstance(csv_rows, Mapping) and source_csv_key not in csv_rows:
+                    continue
+                targets[source_csv_key].append((source_model, nullable_field))
+                # A dict only ever uses the first key format that is present
+                if isinstance(csv_rows, Mapping):
+                    break
+
+        if isinstance(csv_rows, Mapping):
+            row_pairs = ((key, row) for key in targets for row in csv_rows[key])
+        else:
+            row_pairs = csv_rows
+
+        batch = []
+        for source_csv_key, row in row_pairs:
+            for source_model, nullable_field in targets.get(source_csv_key, ()):
+                if row.get(nullable_field):  # If the FK was supposed to be set
+                    batch.append(
+                        {
+                            "model": source_model,
+                            "pk": row["id"],
+                            "field": nullable_field,
+                            "value": row[nullable_field],
+                        }
+                    )
+                    if len(batch) >= batch_size:
+                        yield batch
+                        batch = []
 
-        self.deferred_updates = updates
-        return updates
+        if batch:
+            yield batch
 
     def execute_deferred_updates(
-        self, updates: List[Dict[str, Any]], connection: Any, id_mappings: Dict[str, Dict[int, int]]
+        self, updates: Iterable[Dict[str, Any]], connection: Any, id_mappings: Dict[str, Dict[int, int]]
     ):
         """
         Execute the deferred FK updates after initial loading.
 
         Args:
-            updates: List of update operations
+            updates: Iterable of update operations (e.g. one deferred update batch)
             connection: Database connection
             id_mappings: ID remapping dictionary for FK resolution
         """
-        with connection.cursor() as cursor:
-            for update in updates:
-                model = update["model"]
-                pk = update["pk"]
-                field = update["field"]
-                original_fk_value = update["value"]
+        # Group rows by (model, field) so label building, field lookup and
+        # mapping resolution happen once per group instead of once per row
+        grouped_updates = defaultdict(list)
+        for update in updates:
+            grouped_updates[(update["model"], update["field"])].append(update)
 
-                # Apply ID remapping to both PK and FK
+        with connection.cursor() as cursor:
+            for (model, field), group in grouped_updates.items():
                 model_key = f"{model._meta.app_label}.{model.__name__}"
-
-                # Remap the record's PK
-                new_pk = id_mappings.get(model_key, {}).get(pk, pk)
-
-                # Remap the FK value
                 fk_field = model._meta.get_field(field)
                 related_model = fk_field.related_model
                 related_key = f"{related_model._meta.app_label}.{related_model.__name__}"
-                new_fk_value = id_mappings.get(related_key, {}).get(original_fk_value, original_fk_value)
 
-                # Execute the update
-                sql = f'UPDATE "{model._meta.db_table}" SET "{field}" = %s WHERE "id" = %s'
-                cursor.execute(sql, [new_fk_value, new_pk])
+                # Apply ID remapping to both the record's PK and the FK value
+                pk_mapping = id_mappings.get(model_key, {})
+                fk_mapping = id_mappings.get(related_key, {})
+                params = [
+                    (pk_mapping.get(update["pk"], update["pk"]), fk_mapping.get(update["value"], update["value"]))
+                    for update in group
+                ]
+
+                # One UPDATE ... FROM (VALUES ...) statement per group instead of one per row
+                sql = (
+                    f'UPDATE "{model._meta.db_table}" AS t SET "{fk_field.column}" = v.fk '
+                    f'FROM (VALUES %s) AS v(pk, fk) WHERE t."{model._meta.pk.column}" = v.pk'
+                )
+                execute_values(cursor, sql, params, page_size=len(params))
 
 
 class TenantAwareRemappingStrategy:
@@ -916,7 +1265,8 @@ class ImportPlan:
     def estimate_row_count(self) -> int:
         """Estimate the number of rows in the CSV file."""
         try:
-            with open(self.csv_path) as f:
+            # Binary mode: counting lines needs no UTF-8 decode pass
+            with open(self.csv_path, "rb") as f:
                 # Count lines and subtract 1 for header
                 line_count = sum(1 for _ in f) - 1
                 return max(0, line_count)
@@ -941,8 +1291,16 @@ class ExportPlan:
     This class was formerly called ImportJob but renamed to better reflect its purpose.
     """
 
-    # Class-level cache for dependency computations
+    # Class-level caches derived from the importer registry; cleared whenever an importer registers
     _dependency_cache = {}
+    # Direct dependencies per model, shared by every plan's graph walk
+    _direct_dependency_cache = {}
+
+    @classmethod
+    def clear_caches(cls) -> None:
+        """Drop cached dependency results so they are recomputed from the importer registry."""
+        cls._dependency_cache.clear()
+        cls._direct_dependency_cache.clear()
 
     def __init__(self, model, query=None):
         """
@@ -972,6 +1330,7 @@ class ExportPlan:
         # Set properties (make them private to prevent modification)
         self._model = model
         self._query = query
+        self._key = None
 
     @property
     def model(self):
@@ -988,7 +1347,8 @@ class ExportPlan:
         Get the list of Django models that this plan depends on.
 
         Dependencies are determined by analyzing foreign key relationships
-        in the Importer's Columns configuration. The result is cached for
+        in the Importer's Columns configuration. Each dependency is followed
+        by its own dependencies, depth-first. The result is cached for
         performance since model relationships are static.
 
         Returns:
@@ -1002,64 +1362,89 @@ class ExportPlan:
         if cache_key in self._dependency_cache:
             return self._dependency_cache[cache_key]
 
-        # Compute dependencies
+        # Walk the importer graph breadth-first, recording each model's direct dependencies
+        direct_deps = {}
+        queue = deque([self.model])
+        while queue:
+            model = queue.popleft()
+            if model in direct_deps:
+                continue
+
+            model_deps = self._direct_dependencies(model)
+            direct_deps[model] = model_deps
+            queue.extend(dep for dep in model_deps if dep not in direct_deps)
+
+        # Kahn's algorithm: a model drains once nothing left depends on it.
+        # Self-references never block a model, so they are not counted.
+        dependents = dict.fromkeys(direct_deps, 0)
+        for model, model_deps in direct_deps.items():
+            for dep in set(model_deps):
+                if dep is not model:
+                    dependents[dep] += 1
+
+        ready = deque(model for model, count in dependents.items() if count == 0)
+        drained = 0
+        while ready:
+            model = ready.popleft()
+            drained += 1
+            for dep in set(direct_deps[model]):
+                if dep is not model:
+                    dependents[dep] -= 1
+                    if dependents[dep] == 0:
+                        ready.append(dep)
+
+        if drained < len(direct_deps):
+            blocked = ", ".join(model.__name__ for model, count in dependents.items() if count)
+            raise ValueError(f"Circular dependency detected involving {blocked}")
+
+        # Collect dependencies depth-first, each followed by its own dependencies,
+        # removing duplicates; a self-reference is listed but not expanded
         dependencies = []
-        visited = set()
-        visiting = set()
-
-        def _get_model_dependencies(model):
-            """Recursively get dependencies for a model."""
-            if model in visiting:
-                raise ValueError(f"Circular dependency detected involving {model.__name__}")
-
-            if model in visited:
-                return []
-
-            visiting.add(model)
-            model_deps = []
-
-            # Get the importer for this model
-            from django_gyro.core import Importer
-
-            importer_class = Importer.get_importer_for_model(model)
-            if importer_class and hasattr(importer_class, "Columns"):
-                # Analyze the Columns configuration
-                columns_class = importer_class.Columns
-
-                for attr_name in dir(columns_class):
-                    if not attr_name.startswith("_"):
-                        attr_value = getattr(columns_class, attr_name)
-
-                        # If it's a Django model, it's a dependency
-                        if self._is_django_model(attr_value):
-                            if attr_value == model:
-                                # Self-reference: add to dependencies but don't recurse
-                                model_deps.append(attr_value)
-                            else:
-                                # Regular dependency: add and recurse
-                                model_deps.append(attr_value)
-                                nested_deps = _get_model_dependencies(attr_value)
-                                model_deps.extend(nested_deps)
-
-            visiting.remove(model)
-            visited.add(model)
-            return model_deps
-
-        # Get all dependencies
-        all_deps = _get_model_dependencies(self.model)
-
-        # Remove duplicates while preserving order
         seen = set()
-        for dep in all_deps:
-            if dep not in seen:
-                dependencies.append(dep)
-                seen.add(dep)
+        stack = list(reversed(direct_deps[self.model]))
+        while stack:
+            dep = stack.pop()
+            if dep in seen:
+                continue
+            dependencies.append(dep)
+            seen.add(dep)
+            if dep is not self.model:
+                stack.extend(reversed(direct_deps[dep]))
 
         # Cache the result
         self._dependency_cache[cache_key] = dependencies
 
         return dependencies
 
+    def _direct_dependencies(self, model):
+        """
+        Get the models that an importer's Columns configuration references directly.
+
+        The result is shared by every plan through a class-level cache, so an
+        ancestor such as Tenant is introspected once however many plans reach it.
+        """
+        if model in self._direct_dependency_cache:
+            return self._direct_dependency_cache[model]
+
+        from django_gyro.core import Importer
+
+        model_deps = []
+        importer_class = Importer.get_importer_for_model(model)
+        if importer_class and hasattr(importer_class, "Columns"):
+            # Analyze the Columns configuration
+            columns_class = importer_class.Columns
+
+            for attr_name in dir(columns_class):
+                if not attr_name.startswith("_"):
+                    attr_value = getattr(columns_class, attr_name)
+
+                    # If it's a Django model, it's a dependency
+                    if self._is_django_model(attr_value):
+                        model_deps.append(attr_value)
+
+        self._direct_dependency_cache[model] = model_deps
+        return model_deps
+
     @classmethod
     def sort_by_dependencies(cls, plans):
         """
@@ -1089,31 +1474,21 @@ class ExportPlan:
                 models_in_cycle = [p.model.__name__ for p in plans]
                 raise ValueError(f"Circular dependency detected among models: {models_in_cycle}") from e
 
-        # Topological sort
-        sorted_plans = []
-        remaining_plans = list(plans)
-
-        while remaining_plans:
-            # Find plans with no unsatisfied dependencies
-            ready_plans = []
-            for plan in remaining_plans:
-                plan_deps = dependencies[plan.model]
-                unsatisfied_deps = [dep for dep in plan_deps if dep in [p.model for p in remaining_plans]]
-
-                if not unsatisfied_deps:
-                    ready_plans.append(plan)
-
-            if not ready_plans:
-                # If no plans are ready, we have a circular dependency
-                remaining_models = [plan.model.__name__ for plan in remaining_plans]
-                raise ValueError(f"Circular dependency detected among models: {remaining_models}")
+        # Several plans may export the same model (e.g. different querysets); keep them all
+        plans_by_model = defaultdict(list)
+        for plan in plans:
+            plans_by_model[plan.model].append(plan)
 
-            # Add ready plans to sorted list and remove from remaining
-            sorted_plans.extend(ready_plans)
-            for plan in ready_plans:
-                remaining_plans.remove(plan)
+        # Topological sort over models
+        sorter = graphlib.TopologicalSorter()
+        for model, deps in dependencies.items():
+            sorter.add(model, *(dep for dep in deps if dep in plans_by_model))
 
-        return sorted_plans
+        try:
+            return [plan for model in sorter.static_order() for plan in plans_by_model[model]]
+        except graphlib.CycleError as e:
+            cycle_names = [model.__name__ for model in e.args[1]]
+            raise ValueError(f"Circular dependency detected among models: {cycle_names}") from e
 
     def _is_django_model(self, obj):
         """Check if an object is a Django model class."""
@@ -1142,12 +1517,38 @@ class ExportPlan:
         """Detailed string representation of the ExportPlan."""
         return self.__str__()
 
+    def _identity(self):
+        """
+        Return the key used to compare and hash this plan.
+
+        Querysets are compared by database alias and compiled SQL, so separately
+        built but identical querysets (e.g. two ``filter(tenant_id=1)`` calls)
+        give equal plans. The key is computed once and cached on the plan.
+        """
+        if self._key is None:
+            query_key = None
+            if self._query is not None:
+                try:
+                    sql, params = self._query.query.sql_with_params()
+                except EmptyResultSet:
+                    # Querysets that can match nothing (e.g. ``id__in=[]``) have no SQL to compare
+                    query_key = id(self._query)
+                else:
+                    query_key = (self._query.db, sql, tuple(params))
+                    try:
+                        hash(query_key)
+                    except TypeError:
+                        # Unhashable parameters, e.g. lists for array lookups
+                        query_key = id(self._query)
+            self._key = (self._model, query_key)
+        return self._key
+
     def __eq__(self, other):
         """Check equality based on model and query."""
         if not isinstance(other, ExportPlan):
             return False
-        return self.model == other.model and self.query == other.query
+        return self._identity() == other._identity()
 
     def __hash__(self):
         """Hash based on model and query."""
-        return hash((self.model, id(self.query)))
+        return hash(self._identity())
@@ -6,7 +6,13 @@ primarily file systems with CSV format support.
 """
 
 import os
-from typing import Any, Dict, List, Optional
+import posixpath
+import stat
+from contextlib import contextmanager, suppress
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Write buffer for streamed CSV output
+STREAM_BUFFER_SIZE = 1 << 20
 
 
 class FileTarget:
@@ -17,25 +23,31 @@ class FileTarget:
     overwrite protection, and file validation.
     """
 
-    def __init__(self, base_path: str, overwrite: bool = False):
+    def __init__(self, base_path: str, overwrite: bool = False, server_path: Optional[str] = None):
         """
         Initialize File target.
 
         Args:
             base_path: Base directory path for writing files
             overwrite: Whether to overwrite existing files
+            server_path: Path at which the PostgreSQL server sees base_path, when
+                they share a filesystem. If set, PostgreSQL sources write export
+                files there directly instead of streaming them to the client.
 
         Raises:
             ValueError: If directory doesn't exist or isn't accessible
         """
         self.base_path = os.path.abspath(base_path)
         self.overwrite = overwrite
+        self.server_path = server_path
 
-        # Validate directory exists and is accessible
-        if not os.path.exists(self.base_path):
-            raise ValueError(f"Directory does not exist or is not accessible: {self.base_path}")
+        # Validate directory exists and is accessible, with a single stat() call
+        try:
+            mode = os.stat(self.base_path).st_mode
+        except (OSError, ValueError):
+            raise ValueError(f"Directory does not exist or is not accessible: {self.base_path}") from None
 
-        if not os.path.isdir(self.base_path):
+        if not stat.S_ISDIR(mode):
             raise ValueError(f"Path is not a directory: {self.base_path}")
 
         if not os.access(self.base_path, os.W_OK):
@@ -93,39 +105,128 @@ class FileTarget:
                     f"Files already exist: {existing_files}. Use overwrite=True to overwrite existing files."
                 )
 
-    def write_csv(self, file_path: str, csv_data: str) -> Dict[str, Any]:
+    def supports_server_side_copy(self, source) -> bool:
         """
-        Write CSV data to file.
+        Check whether a source can write files into this target itself.
+
+        Args:
+            source: Source instance that will produce the data
+
+        Returns:
+            True if source is a PostgresSource and a server_path is configured
+        """
+        from .sources import PostgresSource
+
+        return self.server_path is not None and isinstance(source, PostgresSource)
+
+    def prepare_server_side_copy(self, file_path: str) -> Tuple[str, str]:
+        """
+        Prepare a file to be written by the PostgreSQL server.
 
         Args:
             file_path: Relative file path within base directory
-            csv_data: CSV data as string
 
         Returns:
-            Dict with write statistics
+            Tuple of (path as seen by the server, local full path)
+
+        Raises:
+            ValueError: If the file exists and overwrite is not allowed
         """
-        # Ensure directory exists
+        # PostgreSQL overwrites silently, so check before handing it the path
+        self.validate_overwrite([file_path])
         self.ensure_directory_exists(file_path)
 
-        # Validate overwrite if needed
-        self.validate_overwrite([file_path])
+        server_file_path = posixpath.join(self.server_path, *file_path.split(os.sep))
+        return server_file_path, os.path.join(self.base_path, file_path)
+
+    @contextmanager
+    def open_stream(self, file_path: str) -> Iterator[BinaryIO]:
+        """
+        Open a file for streamed binary writes.
+
+        The directory is created before the file is opened, so a producer
+        such as PostgreSQL COPY can write straight into the target file
+        without a temporary copy. If the caller raises while writing, the
+        partial file is removed, so nothing of a failed export is left behind.
+        Without overwrite the file is opened in exclusive-create mode, so the
+        existence check and the open are one atomic step.
+
+        Args:
+            file_path: Relative file path within base directory
+
+        Yields:
+            Buffered binary file object; its ``name`` is the full path
+
+        Raises:
+            ValueError: If the file exists and overwrite is not allowed
+        """
+        # Ensure directory exists
+        self.ensure_directory_exists(file_path)
 
-        # Write file
         full_path = os.path.join(self.base_path, file_path)
+        try:
+            f = open(full_path, "wb" if self.overwrite else "xb", buffering=STREAM_BUFFER_SIZE)
+        except FileExistsError:
+            raise ValueError(
+                f"Files already exist: {[file_path]}. Use overwrite=True to overwrite existing files."
+            ) from None
+
+        try:
+            with f:
+                yield f
+        except BaseException:
+            # A failed export must not leave a truncated file that looks complete
+            with suppress(OSError):
+                os.unlink(full_path)
+            raise
+
+    def write_csv_stream(self, file_path: str, chunks: Iterable[bytes]) -> Dict[str, Any]:
+        """
+        Write CSV data to file from an iterable of byte chunks.
 
-        with open(full_path, "w", encoding="utf-8", newline="") as f:
-            f.write(csv_data)
+        Only one chunk is held in memory at a time.
 
-        # Get file statistics
-        file_size = os.path.getsize(full_path)
+        Args:
+            file_path: Relative file path within base directory
+            chunks: Iterable of encoded CSV data
 
-        # Count rows (approximate)
-        rows_written = csv_data.count("\n")
-        if csv_data and not csv_data.endswith("\n"):
+        Returns:
+            Dict with write statistics
+        """
+        rows_written = 0
+        last_chunk = b""
+
+        with self.open_stream(file_path) as f:
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                f.write(chunk)
+                rows_written += chunk.count(b"\n")
+                last_chunk = chunk
+            full_path = f.name
+
+        # Count rows (approximate); a final line without a newline still counts
+        if last_chunk and not last_chunk.endswith(b"\n"):
             rows_written += 1
 
+        # Get file statistics
+        file_size = os.path.getsize(full_path)
+
         return {"file_path": full_path, "bytes_written": file_size, "rows_written": rows_written}
 
+    def write_csv(self, file_path: str, csv_data: str) -> Dict[str, Any]:
+        """
+        Write CSV data to file.
+
+        Args:
+            file_path: Relative file path within base directory
+            csv_data: CSV data as string
+
+        Returns:
+            Dict with write statistics
+        """
+        return self.write_csv_stream(file_path, [csv_data.encode("utf-8")])
+
     def copy_file_from_source(self, source_path: str, target_path: str) -> Dict[str, Any]:
         """
         Copy a file from source to target location.
@@ -193,15 +294,15 @@ class FileTarget:
         """
         full_path = os.path.join(self.base_path, file_path)
 
-        if not os.path.exists(full_path):
-            raise FileNotFoundError(f"File not found: {file_path}")
-
-        stat = os.stat(full_path)
+        try:
+            file_stat = os.stat(full_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found: {file_path}") from None
 
         return {
             "file_path": file_path,
             "full_path": full_path,
-            "size_bytes": stat.st_size,
-            "modified_time": stat.st_mtime,
-            "created_time": stat.st_ctime,
+            "size_bytes": file_stat.st_size,
+            "modified_time": file_stat.st_mtime,
+            "created_time": file_stat.st_ctime,
         }
@@ -42,6 +42,17 @@ class Command(BaseCommand):
             help="Export to gyro_example/exports (mounted to host) for easy verification",
         )
 
+    def _count_querysets(self, *querysets):
+        """Count several querysets with one round-trip instead of one COUNT(*) each."""
+        selects, params = [], []
+        for queryset in querysets:
+            sql, query_params = queryset.values("pk").query.sql_with_params()
+            selects.append(f"(SELECT COUNT(*) FROM ({sql}) AS counted)")
+            params.extend(query_params)
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT {', '.join(selects)}", params)
+            return cursor.fetchone()
+
     def handle(self, *args, **options):
         tenant_id = options["tenant_id"]
 
@@ -66,13 +77,23 @@ class Command(BaseCommand):
             return
 
         # Check data counts
-        tenant_count = Tenant.objects.count()
-        shop_count = Shop.objects.count()
-        customer_count = Customer.objects.count()
-        product_count = Product.objects.count()
-        order_count = Order.objects.count()
-        order_item_count = OrderItem.objects.count()
-        referral_count = CustomerReferral.objects.count()
+        (
+            tenant_count,
+            shop_count,
+            customer_count,
+            product_count,
+            order_count,
+            order_item_count,
+            referral_count,
+        ) = self._count_querysets(
+            Tenant.objects.all(),
+            Shop.objects.all(),
+            Customer.objects.all(),
+            Product.objects.all(),
+            Order.objects.all(),
+            OrderItem.objects.all(),
+            CustomerReferral.objects.all(),
+        )
 
         self.stdout.write("   📊 Data Summary:")
         self.stdout.write(f"      - Tenants: {tenant_count}")
@@ -119,14 +140,20 @@ class Command(BaseCommand):
         order_items_query = OrderItem.objects.filter(tenant=target_tenant)
         referrals_query = CustomerReferral.objects.filter(tenant=target_tenant)
 
+        export_counts = self._count_querysets(
+            tenant_query,
+            shops_query,
+            customers_query,
+            products_query,
+            orders_query,
+            order_items_query,
+            referrals_query,
+        )
+        labels = ["Tenant", "Shops", "Customers", "Products", "Orders", "Order Items", "Customer Referrals"]
+
         self.stdout.write("   📋 Export Query Summary:")
-        self.stdout.write(f"      - Tenant: {tenant_query.count()} record(s)")
-        self.stdout.write(f"      - Shops: {shops_query.count()} record(s)")
-        self.stdout.write(f"      - Customers: {customers_query.count()} record(s)")
-        self.stdout.write(f"      - Products: {products_query.count()} record(s)")
-        self.stdout.write(f"      - Orders: {orders_query.count()} record(s)")
-        self.stdout.write(f"      - Order Items: {order_items_query.count()} record(s)")
-        self.stdout.write(f"      - Customer Referrals: {referrals_query.count()} record(s)")
+        for label, count in zip(labels, export_counts):
+            self.stdout.write(f"      - {label}: {count} record(s)")
 
         # Step 3: Set up DataSlicer export
         self.stdout.write("\n3. Setting up DataSlicer export...")
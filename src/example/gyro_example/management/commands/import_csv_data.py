@@ -219,7 +219,7 @@ class Command(BaseCommand):
 
                 if csv_file:
                     # Count rows in CSV (subtract 1 for header)
-                    with open(csv_file) as f:
+                    with open(csv_file, "rb") as f:
                         row_count = sum(1 for line in f) - 1
                     total_rows += row_count
                     self.stdout.write(f"   📄 Would import {row_count} rows from {csv_file.name} to {model.__name__}")
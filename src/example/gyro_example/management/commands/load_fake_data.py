@@ -1,6 +1,5 @@
 import logging
 import random
-from decimal import Decimal
 
 from django.core.management.base import BaseCommand
 from faker import Faker
@@ -61,23 +60,26 @@ class Command(BaseCommand):
 
     def create_tenants(self, count):
         tenants = []
+        subdomains = set()
         for _ in range(count):
             company_name = fake.company()
             subdomain = company_name.lower().replace(" ", "").replace(",", "").replace(".", "")[:20]
             # Ensure unique subdomain
             counter = 1
             original_subdomain = subdomain
-            while Tenant.objects.filter(subdomain=subdomain).exists():
+            while subdomain in subdomains:
                 subdomain = f"{original_subdomain}{counter}"
                 counter += 1
+            subdomains.add(subdomain)
 
-            tenant = Tenant.objects.create(
+            tenant = Tenant(
                 name=company_name,
                 subdomain=subdomain[:50],
                 is_active=random.choice([True, True, True, False]),  # 75% active
             )
             tenants.append(tenant)
-        return tenants
+        # Tenant ids are database-assigned; bulk_create fills them in on PostgreSQL
+        return Tenant.objects.bulk_create(tenants)
 
     def create_shops(self, tenants):
         shops = []
@@ -88,14 +90,14 @@ class Command(BaseCommand):
             num_shops = random.randint(1, 4)
             for _ in range(num_shops):
                 shop_name = f"{fake.word().title()} {random.choice(['Store', 'Shop', 'Market', 'Boutique'])}"
-                shop = Shop.objects.create(
+                shop = Shop(
                     tenant=tenant,
                     name=shop_name,
                     url=f"https://{shop_name.lower().replace(' ', '')}.example.com",
                     currency=random.choice(currencies),
                 )
                 shops.append(shop)
-        return shops
+        return Shop.objects.bulk_create(shops)
 
     def create_products(self, shops):
         products = []
@@ -123,6 +125,7 @@ class Command(BaseCommand):
         for shop in shops:
             # Each shop has 10-50 products
             num_products = random.randint(10, 50)
+            skus = set()
             for _ in range(num_products):
                 product_name = f"{fake.color_name().title()} {random.choice(product_types)}"
 
@@ -130,28 +133,30 @@ class Command(BaseCommand):
                 sku = f"{''.join(fake.random_letters(3)).upper()}{fake.random_number(digits=4)}"
                 counter = 1
                 original_sku = sku
-                while Product.objects.filter(shop=shop, sku=sku).exists():
+                while sku in skus:
                     sku = f"{original_sku}{counter}"
                     counter += 1
+                skus.add(sku)
 
-                product = Product.objects.create(
+                product = Product(
                     tenant=shop.tenant,
                     shop=shop,
                     sku=sku,
                     name=product_name,
                     description=fake.text(max_nb_chars=200),
-                    price=Decimal(str(random.uniform(9.99, 299.99))).quantize(Decimal("0.01")),
+                    price=random.randint(999, 29999),  # cents
                     inventory_count=random.randint(0, 100),
                     is_active=random.choice([True, True, True, False]),  # 75% active
                 )
                 products.append(product)
-        return products
+        return Product.objects.bulk_create(products)
 
     def create_customers(self, shops):
         customers = []
         for shop in shops:
             # Each shop has 20-100 customers
             num_customers = random.randint(20, 100)
+            emails = set()
             for _ in range(num_customers):
                 first_name = fake.first_name()
                 last_name = fake.last_name()
@@ -159,13 +164,14 @@ class Command(BaseCommand):
 
                 # Ensure unique email per shop
                 counter = 1
-                while Customer.objects.filter(shop=shop, email=email).exists():
+                while email in emails:
                     email = f"{first_name.lower()}.{last_name.lower()}{counter}@{fake.domain_name()}"
                     counter += 1
+                emails.add(email)
 
                 phone = fake.phone_number()[:20]
 
-                customer = Customer.objects.create(
+                customer = Customer(
                     tenant=shop.tenant,
                     shop=shop,
                     email=email,
@@ -174,12 +180,13 @@ class Command(BaseCommand):
                     phone=phone,
                 )
                 customers.append(customer)
-        return customers
+        return Customer.objects.bulk_create(customers)
 
     def create_orders(self, customers):
         orders = []
         statuses = ["pending", "processing", "shipped", "delivered", "cancelled"]
         status_weights = [0.1, 0.2, 0.3, 0.35, 0.05]  # Most orders are delivered
+        order_numbers = set()
 
         for customer in customers:
             # Each customer has 0-5 orders
@@ -190,18 +197,18 @@ class Command(BaseCommand):
                 # Ensure unique order number per shop
                 counter = 1
                 original_order_number = order_number
-                while Order.objects.filter(shop=customer.shop, order_number=order_number).exists():
+                while (customer.shop_id, order_number) in order_numbers:
                     order_number = f"{original_order_number}-{counter}"
                     counter += 1
+                order_numbers.add((customer.shop_id, order_number))
 
-                # Calculate realistic amounts
-                subtotal = Decimal(str(random.uniform(25.00, 500.00))).quantize(Decimal("0.01"))
-                tax_rate = Decimal("0.08")  # 8% tax
-                tax_amount = (subtotal * tax_rate).quantize(Decimal("0.01"))
-                shipping_amount = Decimal(str(random.uniform(5.00, 25.00))).quantize(Decimal("0.01"))
+                # Calculate realistic amounts (in cents)
+                subtotal = random.randint(2500, 50000)
+                tax_amount = round(subtotal * 0.08)  # 8% tax
+                shipping_amount = random.randint(500, 2500)
                 total_amount = subtotal + tax_amount + shipping_amount
 
-                order = Order.objects.create(
+                order = Order(
                     tenant=customer.tenant,
                     shop=customer.shop,
                     customer=customer,
@@ -212,14 +219,17 @@ class Command(BaseCommand):
                     shipping_amount=shipping_amount,
                 )
                 orders.append(order)
-        return orders
+        return Order.objects.bulk_create(orders)
 
     def create_order_items(self, orders):
         order_items = []
+        products_by_shop = {}
 
         for order in orders:
-            # Get active products from the same shop
-            shop_products = list(Product.objects.filter(shop=order.shop, is_active=True))
+            # Get active products from the same shop, querying each shop only once
+            if order.shop_id not in products_by_shop:
+                products_by_shop[order.shop_id] = list(Product.objects.filter(shop_id=order.shop_id, is_active=True))
+            shop_products = products_by_shop[order.shop_id]
 
             if not shop_products:
                 continue
@@ -233,7 +243,7 @@ class Command(BaseCommand):
                 unit_price = product.price
                 total_price = unit_price * quantity
 
-                order_item = OrderItem.objects.create(
+                order_item = OrderItem(
                     tenant=order.tenant,
                     shop=order.shop,
                     order=order,
@@ -244,16 +254,17 @@ class Command(BaseCommand):
                 )
                 order_items.append(order_item)
 
-        return order_items
+        return OrderItem.objects.bulk_create(order_items)
 
     def create_customer_referrals(self, customers):
         """Create customer referrals - demonstrates circular dependency Customer ↔ CustomerReferral"""
         referrals = []
+        referral_codes = set()
 
         # Group customers by shop for referral generation
         customers_by_shop = {}
         for customer in customers:
-            shop_key = customer.shop.id
+            shop_key = customer.shop_id
             if shop_key not in customers_by_shop:
                 customers_by_shop[shop_key] = []
             customers_by_shop[shop_key].append(customer)
@@ -275,16 +286,17 @@ class Command(BaseCommand):
                 referral_code = f"REF-{letters}{fake.random_number(digits=4)}"
                 counter = 1
                 original_code = referral_code
-                while CustomerReferral.objects.filter(referral_code=referral_code).exists():
+                while referral_code in referral_codes:
                     referral_code = f"{original_code}{counter}"
                     counter += 1
+                referral_codes.add(referral_code)
 
                 # Create referral with business metrics
-                commission = Decimal(str(random.uniform(5.0, 50.0))).quantize(Decimal("0.01"))
+                commission = random.randint(500, 5000)  # cents
                 orders_count = random.randint(0, 15)
-                revenue = Decimal(str(random.uniform(50.0, 500.0))).quantize(Decimal("0.01"))
+                revenue = random.randint(5000, 50000)  # cents
 
-                referral = CustomerReferral.objects.create(
+                referral = CustomerReferral(
                     tenant=referring_customer.tenant,
                     shop=referring_customer.shop,
                     referred_customer=referred_customer,
@@ -299,13 +311,16 @@ class Command(BaseCommand):
                     total_revenue=revenue,
                 )
                 referrals.append(referral)
+        CustomerReferral.objects.bulk_create(referrals)
 
         # CIRCULAR DEPENDENCY PART: Update some customers with primary_referrer
         # This demonstrates the circular Customer -> CustomerReferral relationship
+        referred_customers = {}
         for referral in referrals[: len(referrals) // 2]:  # Update about half
             if referral.status in ["confirmed", "rewarded"]:
                 # Set this as the customer's primary referral source
                 referral.referred_customer.primary_referrer = referral
-                referral.referred_customer.save()
+                referred_customers[referral.referred_customer.pk] = referral.referred_customer
+        Customer.objects.bulk_update(referred_customers.values(), ["primary_referrer"])
 
         return referrals
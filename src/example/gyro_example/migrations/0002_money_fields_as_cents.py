@@ -0,0 +1,76 @@
+from django.db import migrations, models
+from django.db.models import F
+
+import gyro_example.models
+
+MONEY_FIELDS = {
+    "product": ["price"],
+    "order": ["total_amount", "tax_amount", "shipping_amount"],
+    "orderitem": ["unit_price", "total_price"],
+    "customerreferral": ["commission_earned", "total_revenue"],
+}
+
+
+def to_cents(apps, schema_editor):
+    for model_name, field_names in MONEY_FIELDS.items():
+        model = apps.get_model("gyro_example", model_name)
+        model.objects.update(**{name: F(name) * 100 for name in field_names})
+
+
+def from_cents(apps, schema_editor):
+    for model_name, field_names in MONEY_FIELDS.items():
+        model = apps.get_model("gyro_example", model_name)
+        model.objects.update(**{name: F(name) / 100 for name in field_names})
+
+
+def _widen(model_name, name, **kwargs):
+    # Two extra integral digits so amounts still fit once multiplied by 100
+    return migrations.AlterField(
+        model_name=model_name,
+        name=name,
+        field=models.DecimalField(decimal_places=2, max_digits=12, **kwargs),
+    )
+
+
+def _to_money(model_name, name, **kwargs):
+    return migrations.AlterField(
+        model_name=model_name,
+        name=name,
+        field=gyro_example.models.MoneyField(**kwargs),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("gyro_example", "0001_initial"),
+    ]
+
+    operations = [
+        _widen("product", "price"),
+        _widen("order", "total_amount"),
+        _widen("order", "tax_amount", default=0),
+        _widen("order", "shipping_amount", default=0),
+        _widen("orderitem", "unit_price"),
+        _widen("orderitem", "total_price"),
+        _widen("customerreferral", "commission_earned", default=0),
+        _widen(
+            "customerreferral",
+            "total_revenue",
+            default=0,
+            help_text="Total revenue generated from this referral",
+        ),
+        migrations.RunPython(to_cents, from_cents),
+        _to_money("product", "price"),
+        _to_money("order", "total_amount"),
+        _to_money("order", "tax_amount", default=0),
+        _to_money("order", "shipping_amount", default=0),
+        _to_money("orderitem", "unit_price"),
+        _to_money("orderitem", "total_price"),
+        _to_money("customerreferral", "commission_earned", default=0),
+        _to_money(
+            "customerreferral",
+            "total_revenue",
+            default=0,
+            help_text="Total revenue generated from this referral",
+        ),
+    ]
@@ -1,4 +1,5 @@
 import uuid
+from decimal import Decimal
 
 from django.db import models
 
@@ -21,6 +22,34 @@ except ImportError:
         MultiPolygonField = DummyGeometryField
 
 
+# Geometry field - uses PostGIS if available, otherwise falls back to text field
+if HAS_POSTGIS:
+    GEOM_FIELD_FACTORY = gis_models.MultiPolygonField
+else:
+
+    def GEOM_FIELD_FACTORY(**kwargs):
+        return models.TextField(help_text="PostGIS not available - geometry stored as text", **kwargs)
+
+
+class MoneyField(models.BigIntegerField):
+    """
+    Monetary amount stored as integer cents.
+
+    Integers serialize far cheaper than ``Decimal`` on export and can be sent
+    to COPY as-is on import. A ``<name>_decimal`` property is added to the
+    model for callers that want the amount in currency units.
+    """
+
+    def contribute_to_class(self, cls, name, **kwargs):
+        super().contribute_to_class(cls, name, **kwargs)
+
+        def _as_decimal(instance):
+            cents = getattr(instance, self.attname)
+            return None if cents is None else Decimal(cents) / 100
+
+        setattr(cls, f"{name}_decimal", property(_as_decimal))
+
+
 class Tenant(models.Model):
     """Multi-tenant organization"""
 
@@ -53,11 +82,7 @@ class Customer(models.Model):
     phone = models.CharField(max_length=20, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
-    # Geometry field - uses PostGIS if available, otherwise falls back to text field
-    if HAS_POSTGIS:
-        geom = gis_models.MultiPolygonField(null=True, blank=True)
-    else:
-        geom = models.TextField(null=True, blank=True, help_text="PostGIS not available - geometry stored as text")
+    geom = GEOM_FIELD_FACTORY(null=True, blank=True)
 
     # CIRCULAR DEPENDENCY: Customer -> CustomerReferral (nullable, loads first)
     primary_referrer = models.ForeignKey(
@@ -81,7 +106,7 @@ class Product(models.Model):
     sku = models.CharField(max_length=100)
     name = models.CharField(max_length=200)
     description = models.TextField(blank=True)
-    price = models.DecimalField(max_digits=10, decimal_places=2)
+    price = MoneyField()
     inventory_count = models.IntegerField(default=0)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -107,9 +132,9 @@ class Order(models.Model):
     customer = models.ForeignKey(Customer, on_delete=models.CASCADE)
     order_number = models.CharField(max_length=50)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
-    total_amount = models.DecimalField(max_digits=10, decimal_places=2)
-    tax_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0)
-    shipping_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    total_amount = MoneyField()
+    tax_amount = MoneyField(default=0)
+    shipping_amount = MoneyField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -125,8 +150,8 @@ class OrderItem(models.Model):
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name="items")
     product = models.ForeignKey(Product, on_delete=models.CASCADE)
     quantity = models.IntegerField()
-    unit_price = models.DecimalField(max_digits=10, decimal_places=2)
-    total_price = models.DecimalField(max_digits=10, decimal_places=2)
+    unit_price = MoneyField()
+    total_price = MoneyField()
 
 
 class CustomerReferral(models.Model):
@@ -155,11 +180,9 @@ class CustomerReferral(models.Model):
     status = models.CharField(max_length=20, choices=REFERRAL_STATUS, default="pending")
 
     # Tracking business value
-    commission_earned = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    commission_earned = MoneyField(default=0)
     orders_generated = models.IntegerField(default=0, help_text="Number of orders from this referral")
-    total_revenue = models.DecimalField(
-        max_digits=10, decimal_places=2, default=0, help_text="Total revenue generated from this referral"
-    )
+    total_revenue = MoneyField(default=0, help_text="Total revenue generated from this referral")
 
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
@@ -33,7 +33,5 @@ DATABASES = {
     },
 }
 
-# Ensure PostGIS extension is available
-INSTALLED_APPS = list(INSTALLED_APPS)
-if "django.contrib.gis" not in INSTALLED_APPS:
-    INSTALLED_APPS.insert(0, "django.contrib.gis")
+# Ensure PostGIS extension is available (the base settings never include it)
+INSTALLED_APPS = ["django.contrib.gis", *INSTALLED_APPS]
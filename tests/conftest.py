@@ -0,0 +1,36 @@
+"""
+Shared pytest fixtures for the Django Gyro test suite.
+"""
+
+import os
+import shutil
+import tempfile
+import uuid
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def gyro_tmp_root(tmp_path_factory):
+    """
+    One scratch directory for the whole session, on tmpfs when available.
+
+    Per-test directories live underneath it and are removed together at the
+    end of the session instead of one rmtree() per test.
+    """
+    shm = Path("/dev/shm")
+    if shm.is_dir() and os.access(shm, os.W_OK):
+        root = Path(tempfile.mkdtemp(prefix="gyro-", dir=shm))
+        yield root
+        shutil.rmtree(root, ignore_errors=True)
+    else:
+        yield tmp_path_factory.mktemp("gyro")
+
+
+@pytest.fixture
+def temp_dir(gyro_tmp_root):
+    """A fresh, empty directory for one test, as a string path."""
+    path = gyro_tmp_root / uuid.uuid4().hex
+    path.mkdir()
+    return str(path)
@@ -62,9 +62,11 @@ DATABASES = {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": ":memory:",
     },
+    # Import target alias; tests mock its connection, so skip migrating it
     "import_test": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": ":memory:",
+        "TEST": {"NAME": ":memory:", "MIGRATE": False},
     },
 }
 
@@ -0,0 +1,268 @@
+"""
+Tests for CircularDependencyResolver.
+
+These tests cover detecting FK cycles between models, ordering models so
+that they can be loaded, and preparing the deferred FK updates that close
+each cycle after the initial load.
+
+"""
+
+from unittest.mock import MagicMock, patch
+
+from django.db import models
+
+from django_gyro.importing import CircularDependency, CircularDependencyResolver
+
+APP_LABEL = "test_circular_dependency_resolver"
+
+
+# Asset <-> AssetRisk cycle where Asset.primary_risk is nullable.
+class Asset(models.Model):
+    name = models.CharField(max_length=100)
+    primary_risk = models.ForeignKey("AssetRisk", on_delete=models.SET_NULL, null=True)
+
+    class Meta:
+        app_label = APP_LABEL
+
+
+class AssetRisk(models.Model):
+    asset = models.ForeignKey(Asset, on_delete=models.CASCADE)
+
+    class Meta:
+        app_label = APP_LABEL
+
+
+# Plain ModelB -> ModelA chain with no cycle.
+class ModelA(models.Model):
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        app_label = APP_LABEL
+
+
+class ModelB(models.Model):
+    model_a = models.ForeignKey(ModelA, on_delete=models.CASCADE)
+
+    class Meta:
+        app_label = APP_LABEL
+
+
+# Member <-> Referral cycle, both depending on Group; Referral.member is nullable.
+class Group(models.Model):
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        app_label = APP_LABEL
+
+
+class Member(models.Model):
+    group = models.ForeignKey(Group, on_delete=models.CASCADE)
+    referral = models.ForeignKey("Referral", on_delete=models.CASCADE)
+
+    class Meta:
+        app_label = APP_LABEL
+
+
+class Referral(models.Model):
+    group = models.ForeignKey(Group, on_delete=models.CASCADE)
+    member = models.ForeignKey(Member, on_delete=models.SET_NULL, null=True)
+
+    class Meta:
+        app_label = APP_LABEL
+
+
+# Self-referencing model whose primary key column is not "id".
+class Ticket(models.Model):
+    ticket_code = models.AutoField(primary_key=True, db_column="code")
+    parent = models.ForeignKey("self", on_delete=models.SET_NULL, null=True)
+
+    class Meta:
+        app_label = APP_LABEL
+
+
+class TestCircularDependencyResolver:
+    """Tests for CircularDependencyResolver behavior."""
+
+    def test_detects_circular_dependency(self):
+        """Resolver detects a two-model FK cycle and the nullable side."""
+        # Setup
+        resolver = CircularDependencyResolver()
+
+        # Exercise
+        cycles = resolver.detect_circular_dependencies([Asset, AssetRisk])
+
+        # Verify
+        assert cycles == [
+            CircularDependency(
+                model_a=Asset,
+                model_b=AssetRisk,
+                field_a="primary_risk",
+                field_b="asset",
+                nullable_field="primary_risk",
+            )
+        ]
+        assert resolver.detected_cycles == cycles
+
+    def test_handles_no_circular_dependencies(self):
+        """Resolver reports no cycles for a plain FK chain."""
+        # Setup
+        resolver = CircularDependencyResolver()
+
+        # Exercise
+        cycles = resolver.detect_circular_dependencies([ModelA, ModelB])
+
+        # Verify
+        assert cycles == []
+
+    def test_bitset_detection_matches_tarjan(self):
+        """The bitset fast path reports the same cycles as the Tarjan pass."""
+        # Setup
+        models = [Member, Asset, Referral, Group, AssetRisk]
+        resolver = CircularDependencyResolver()
+        graph = resolver._build_fk_graph(models)
+
+        # Exercise
+        bitset_cycles = resolver._detect_cycles_bitset(models, graph)
+        tarjan_cycles, _components = resolver._analyze_dependency_graph(models, graph)
+
+        # Verify
+        # Independent cycles may come out in either order
+        assert len(bitset_cycles) == len(tarjan_cycles) == 2
+        assert all(cycle in tarjan_cycles for cycle in bitset_cycles)
+
+    def test_reuses_fk_graph_within_resolver(self):
+        """A resolver builds the FK graph for a model list once; other resolvers build their own."""
+        # Setup
+        models = [Asset, AssetRisk]
+        resolver = CircularDependencyResolver()
+        graph = resolver._build_fk_graph(models)
+
+        # Exercise
+        with patch.object(resolver, "_find_fk_to_model", side_effect=AssertionError("graph rebuilt")):
+            cached_graph = resolver._build_fk_graph(models)
+
+        # Verify
+        assert cached_graph is graph
+        assert CircularDependencyResolver()._build_fk_graph(models) is not graph
+
+    def test_reuses_fk_fields_across_lookups(self):
+        """Each model's FK fields are collected from _meta once and reused."""
+        # Setup
+        resolver = CircularDependencyResolver()
+        fk_fields = resolver._fk_fields(Asset)
+
+        # Exercise
+        with patch.object(Asset._meta, "get_fields", side_effect=AssertionError("fields re-read")):
+            field_name = resolver._find_fk_to_model(Asset, AssetRisk)
+
+        # Verify
+        assert field_name == "primary_risk"
+        assert CircularDependencyResolver()._fk_fields(Asset) is fk_fields
+
+        # clear_caches() drops the shared fields so they are read from _meta again
+        CircularDependencyResolver.clear_caches()
+        assert CircularDependencyResolver()._fk_fields(Asset) is not fk_fields
+
+    def test_resolves_loading_order_without_cycles(self):
+        """Models are ordered so FK targets load before the models using them."""
+        # Setup
+        resolver = CircularDependencyResolver()
+
+        # Exercise
+        order = resolver.resolve_loading_order([ModelB, ModelA])
+
+        # Verify
+        assert order == [ModelA, ModelB]
+
+    def test_detects_cycle_and_resolves_loading_order(self):
+        """A cycle among acyclic dependencies is detected and its nullable-FK owner loads first."""
+        # Setup
+        models = [Member, Referral, Group]
+        resolver = CircularDependencyResolver()
+
+        # Exercise: both calls share the FK graph built for this model list
+        cycles = resolver.detect_circular_dependencies(models)
+        order = resolver.resolve_loading_order(models)
+
+        # Verify
+        assert [(cycle.model_a, cycle.model_b) for cycle in cycles] == [(Member, Referral)]
+        assert order == [Group, Referral, Member]
+        assert len(resolver.detected_cycles) == 1
+        assert resolver.detected_cycles[0].nullable_field == "member"
+
+    def test_prepares_deferred_updates(self):
+        """Deferred updates are produced for rows whose nullable FK was set."""
+        # Setup
+        resolver = CircularDependencyResolver()
+        cycles = resolver.detect_circular_dependencies([Asset, AssetRisk])
+        csv_data = {
+            "test_circular_dependency_resolver_asset": [
+                {"id": 1, "name": "Server", "primary_risk": 10},
+                {"id": 2, "name": "Laptop", "primary_risk": ""},
+            ]
+        }
+
+        # Exercise
+        updates = resolver.prepare_deferred_updates(cycles, csv_data)
+
+        # Verify
+        assert updates == [{"model": Asset, "pk": 1, "field": "primary_risk", "value": 10}]
+        assert resolver.deferred_updates == updates
+
+    def test_streams_deferred_updates_in_batches(self):
+        """Rows streamed as (model_key, row) pairs yield bounded update batches."""
+        # Setup
+        resolver = CircularDependencyResolver()
+        cycles = resolver.detect_circular_dependencies([Asset, AssetRisk])
+        csv_rows = (("asset", {"id": pk, "name": f"Asset {pk}", "primary_risk": pk * 10}) for pk in range(1, 6))
+
+        # Exercise
+        batches = list(resolver.iter_deferred_update_batches(cycles, csv_rows, batch_size=2))
+
+        # Verify
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert batches[-1] == [{"model": Asset, "pk": 5, "field": "primary_risk", "value": 50}]
+
+    def test_executes_deferred_updates_with_remapped_ids(self):
+        """Deferred updates remap PK and FK values and run as one batch per field."""
+        # Setup
+        resolver = CircularDependencyResolver()
+        updates = [
+            {"model": Asset, "pk": 1, "field": "primary_risk", "value": 10},
+            {"model": Asset, "pk": 2, "field": "primary_risk", "value": 20},
+        ]
+        id_mappings = {
+            "test_circular_dependency_resolver.Asset": {1: 101},
+            "test_circular_dependency_resolver.AssetRisk": {10: 110, 20: 120},
+        }
+        mock_connection = MagicMock()
+        mock_cursor = mock_connection.cursor.return_value.__enter__.return_value
+
+        # Exercise
+        with patch("django_gyro.importing.execute_values") as mock_execute_values:
+            resolver.execute_deferred_updates(updates, mock_connection, id_mappings)
+
+        # Verify
+        mock_execute_values.assert_called_once_with(
+            mock_cursor,
+            'UPDATE "test_circular_dependency_resolver_asset" AS t SET "primary_risk_id" = v.fk '
+            'FROM (VALUES %s) AS v(pk, fk) WHERE t."id" = v.pk',
+            [(101, 110), (2, 120)],
+            page_size=2,
+        )
+
+    def test_deferred_updates_match_on_primary_key_column(self):
+        """Deferred updates match rows on the model's primary key column, not a hardcoded "id"."""
+        # Setup
+        resolver = CircularDependencyResolver()
+        updates = [{"model": Ticket, "pk": 2, "field": "parent", "value": 1}]
+        mock_connection = MagicMock()
+
+        # Exercise
+        with patch("django_gyro.importing.execute_values") as mock_execute_values:
+            resolver.execute_deferred_updates(updates, mock_connection, {})
+
+        # Verify
+        sql = mock_execute_values.call_args.args[1]
+        assert sql.endswith('WHERE t."code" = v.pk')
+        assert 'SET "parent_id" = v.fk' in sql
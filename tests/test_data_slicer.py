@@ -9,502 +9,540 @@ Following the test plan Phase 3: DataSlicer Operations
 """
 
 import os
-import tempfile
-from unittest.mock import Mock, patch
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
 
-from django.db import models
-from django.db.models.query import QuerySet
+import pytest
+from django.db import connection, models
 
 from django_gyro import DataSlicer, Importer, ImportJob
+from django_gyro.sources import PostgresSource
+from django_gyro.targets import FileTarget
 
-from .test_utils import clear_django_gyro_registries
+from .test_utils import clear_django_gyro_registries, clear_importer_registry, mock_db_operations
 
 
-# Mock Django database operations for tests
-def mock_db_operations():
-    """Create a mock for database operations to prevent geo_db_type errors."""
-    mock_ops = Mock()
-    mock_ops.geo_db_type = Mock(return_value="geometry")
-    mock_ops.max_name_length = Mock(return_value=63)  # Standard PostgreSQL limit
-    return mock_ops
+# Models are defined once at import time; defining them inside each test
+# re-runs Django's model metaclass and app registry bookkeeping every time.
+class SlicerModel1(models.Model):
+    name = models.CharField(max_length=100)
 
+    class Meta:
+        app_label = "test_data_slicer"
 
-def mock_db_connection():
-    """Create a mock database connection."""
-    mock_conn = Mock()
-    mock_conn.ops = mock_db_operations()
-    return mock_conn
 
+class SlicerModel2(models.Model):
+    name = models.CharField(max_length=100)
 
-class MockQuerySet(QuerySet):
-    """A mock QuerySet that can be used in tests without database access."""
+    class Meta:
+        app_label = "test_data_slicer"
 
-    def __init__(self, model=None):
-        # Don't call super().__init__() to avoid database dependencies
-        self.model = model
-        self._result_cache = []
 
+class ActiveSlicerModel(models.Model):
+    name = models.CharField(max_length=100)
+    active = models.BooleanField(default=True)
 
-class TestDataSlicerConfiguration:
-    """Test DataSlicer instantiation and configuration."""
+    class Meta:
+        app_label = "test_data_slicer"
 
-    def setup_method(self):
-        """Clear registries before each test."""
-        clear_django_gyro_registries()
-        # Patch database connection to prevent geo_db_type errors
-        self.db_conn_patcher = patch("django.db.connection", mock_db_connection())
-        self.db_conn_patcher.start()
 
-    def teardown_method(self):
-        """Clear registries after each test."""
-        clear_django_gyro_registries()
-        self.db_conn_patcher.stop()
+class UnregisteredSlicerModel(models.Model):
+    name = models.CharField(max_length=100)
 
-    def test_data_slicer_creation_with_importers(self):
-        """Test creating DataSlicer with importer class list."""
+    class Meta:
+        app_label = "test_data_slicer"
 
-        class TestModel1(models.Model):
-            name = models.CharField(max_length=100)
 
-            class Meta:
-                app_label = "test_data_slicer"
+class Tenant(models.Model):
+    name = models.CharField(max_length=100)
 
-        class TestModel2(models.Model):
-            name = models.CharField(max_length=100)
+    class Meta:
+        app_label = "test_data_slicer"
 
-            class Meta:
-                app_label = "test_data_slicer"
 
-        class TestImporter1(Importer):
-            model = TestModel1
+class Shop(models.Model):
+    name = models.CharField(max_length=100)
+    tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE)
 
-            class Columns:
-                pass
+    class Meta:
+        app_label = "test_data_slicer"
 
-        class TestImporter2(Importer):
-            model = TestModel2
 
-            class Columns:
-                pass
+class Product(models.Model):
+    name = models.CharField(max_length=100)
+    shop = models.ForeignKey(Shop, on_delete=models.CASCADE)
 
-        # Should accept list of importer classes
-        slicer = DataSlicer([TestImporter1, TestImporter2])
+    class Meta:
+        app_label = "test_data_slicer"
 
-        assert len(slicer.importers) == 2
-        assert TestImporter1 in slicer.importers
-        assert TestImporter2 in slicer.importers
 
-    def test_data_slicer_creation_with_models(self):
-        """Test creating DataSlicer with model class list."""
+class ModelA(models.Model):
+    name = models.CharField(max_length=100)
+    b_ref = models.ForeignKey("ModelB", on_delete=models.CASCADE, null=True)
 
-        class TestModel1(models.Model):
-            name = models.CharField(max_length=100)
+    class Meta:
+        app_label = "test_data_slicer"
 
-            class Meta:
-                app_label = "test_data_slicer"
 
-        class TestModel2(models.Model):
-            name = models.CharField(max_length=100)
+class ModelB(models.Model):
+    name = models.CharField(max_length=100)
+    a_ref = models.ForeignKey(ModelA, on_delete=models.CASCADE, null=True)
 
-            class Meta:
-                app_label = "test_data_slicer"
+    class Meta:
+        app_label = "test_data_slicer"
 
-        class TestImporter1(Importer):
-            model = TestModel1
 
-            class Columns:
-                pass
+class Category(models.Model):
+    name = models.CharField(max_length=100)
 
-        class TestImporter2(Importer):
-            model = TestModel2
+    class Meta:
+        app_label = "test_data_slicer"
 
-            class Columns:
-                pass
 
-        # Should accept list of model classes and find their importers
-        slicer = DataSlicer([TestModel1, TestModel2])
+class CategorizedProduct(models.Model):
+    name = models.CharField(max_length=100)
+    category = models.ForeignKey(Category, on_delete=models.CASCADE)
 
-        assert len(slicer.importers) == 2
-        assert TestImporter1 in slicer.importers
-        assert TestImporter2 in slicer.importers
+    class Meta:
+        app_label = "test_data_slicer"
 
-    def test_data_slicer_invalid_configuration_fails(self):
-        """Test that invalid configurations raise errors."""
-        # Test with non-list
-        try:
-            DataSlicer("not_a_list")
-            raise AssertionError("Expected TypeError")
-        except TypeError as e:
-            assert "must be a list" in str(e)
 
-        # Test with empty list
-        try:
-            DataSlicer([])
-            raise AssertionError("Expected ValueError")
-        except ValueError as e:
-            assert "cannot be empty" in str(e)
+@pytest.fixture(scope="module", autouse=True)
+def _isolated_module_registries():
+    """Reset every Django Gyro registry and cache once around this module."""
+    clear_django_gyro_registries()
+    yield
+    clear_django_gyro_registries()
 
-        # Test with invalid types in list
-        try:
-            DataSlicer(["not_a_class"])
-            raise AssertionError("Expected TypeError")
-        except TypeError as e:
-            assert "must be Django model or Importer class" in str(e)
 
-        # Test with model that has no importer
-        class UnregisteredSlicerModel(models.Model):
-            name = models.CharField(max_length=100)
+@pytest.fixture(autouse=True)
+def _isolated_registries():
+    """Clear the importer registry around each test."""
+    clear_importer_registry()
+    yield
+    clear_importer_registry()
 
-            class Meta:
-                app_label = "test_data_slicer"
 
-        try:
-            DataSlicer([UnregisteredSlicerModel])
-            raise AssertionError("Expected ValueError")
-        except ValueError as e:
-            assert "no importer found" in str(e)
+@pytest.fixture
+def db_conn_mock():
+    """Stub the database operations for tests that reach connection.ops."""
+    # Swap the ops attribute directly to prevent geo_db_type errors
+    original_ops = connection.ops
+    connection.ops = mock_db_operations()
+    yield connection.ops
+    connection.ops = original_ops
 
-    def test_data_slicer_mixed_configuration_works(self):
-        """Test that mixed importers and models work together."""
 
-        class TestModel1(models.Model):
-            name = models.CharField(max_length=100)
+@pytest.fixture
+def importers():
+    """Register an importer for every module-level model except UnregisteredSlicerModel."""
 
-            class Meta:
-                app_label = "test_data_slicer"
+    class TestImporter1(Importer):
+        model = SlicerModel1
 
-        class TestModel2(models.Model):
-            name = models.CharField(max_length=100)
+        class Columns:
+            pass
 
-            class Meta:
-                app_label = "test_data_slicer"
+    class TestImporter2(Importer):
+        model = SlicerModel2
 
-        class TestImporter1(Importer):
-            model = TestModel1
+        class Columns:
+            pass
 
-            class Columns:
-                pass
+    class TestImporter(Importer):
+        model = ActiveSlicerModel
 
-        class TestImporter2(Importer):
-            model = TestModel2
+        class Columns:
+            pass
 
-            class Columns:
-                pass
+    class TenantImporter(Importer):
+        model = Tenant
 
-        # Should accept mixed list of models and importers
-        slicer = DataSlicer([TestImporter1, TestModel2])
+        class Columns:
+            pass
 
-        assert len(slicer.importers) == 2
-        assert TestImporter1 in slicer.importers
-        assert TestImporter2 in slicer.importers
+    class ShopImporter(Importer):
+        model = Shop
 
+        class Columns:
+            tenant = Tenant
 
-class TestDataSlicerJobGeneration:
-    """Test DataSlicer job generation functionality."""
+    class ProductImporter(Importer):
+        model = Product
 
-    def setup_method(self):
-        """Clear registries before each test."""
-        clear_django_gyro_registries()
-        # Patch database connection to prevent geo_db_type errors
-        self.db_conn_patcher = patch("django.db.connection", mock_db_connection())
-        self.db_conn_patcher.start()
+        class Columns:
+            shop = Shop
 
-    def teardown_method(self):
-        """Clear registries after each test."""
-        clear_django_gyro_registries()
-        self.db_conn_patcher.stop()
+    class ModelAImporter(Importer):
+        model = ModelA
 
-    def test_generate_import_jobs_from_importers(self):
-        """Test generating ImportJobs from registered importers."""
+        class Columns:
+            b_ref = ModelB
 
-        class TestModel1(models.Model):
-            name = models.CharField(max_length=100)
+    class ModelBImporter(Importer):
+        model = ModelB
 
-            class Meta:
-                app_label = "test_data_slicer"
+        class Columns:
+            a_ref = ModelA
 
-        class TestModel2(models.Model):
-            name = models.CharField(max_length=100)
+    class CategoryImporter(Importer):
+        model = Category
 
-            class Meta:
-                app_label = "test_data_slicer"
+        class Columns:
+            pass
 
-        class TestImporter1(Importer):
-            model = TestModel1
+    class CategorizedProductImporter(Importer):
+        model = CategorizedProduct
 
-            class Columns:
-                pass
+        class Columns:
+            category = Category
 
-        class TestImporter2(Importer):
-            model = TestModel2
+    return SimpleNamespace(
+        TestImporter1=TestImporter1,
+        TestImporter2=TestImporter2,
+        TestImporter=TestImporter,
+        TenantImporter=TenantImporter,
+        ShopImporter=ShopImporter,
+        ProductImporter=ProductImporter,
+        ModelAImporter=ModelAImporter,
+        ModelBImporter=ModelBImporter,
+        CategoryImporter=CategoryImporter,
+        CategorizedProductImporter=CategorizedProductImporter,
+    )
 
-            class Columns:
-                pass
 
-        slicer = DataSlicer([TestImporter1, TestImporter2])
-        jobs = slicer.generate_import_jobs()
+@pytest.fixture
+def run_mocks():
+    """Mock PostgresSource and FileTarget for DataSlicer.run, streaming each job into a named stream."""
+    source = MagicMock(spec=PostgresSource)
+    # Each statement names its queryset's model, so tests can tell which job was executed
+    source.generate_copy_statement.side_effect = lambda queryset, _filename, exclude=None: queryset.model
+    source.execute_copy.return_value = {"rows_exported": 2, "file_size": 10}
+    target = MagicMock(spec=FileTarget)
+    target.supports_server_side_copy.return_value = False
+    target.open_stream.side_effect = lambda filename: nullcontext(SimpleNamespace(name=filename))
+    return SimpleNamespace(source=source, target=target)
 
-        assert len(jobs) == 2
-        assert all(isinstance(job, ImportJob) for job in jobs)
 
-        job_models = {job.model for job in jobs}
-        assert TestModel1 in job_models
-        assert TestModel2 in job_models
+# DataSlicer instantiation and configuration.
 
-    def test_generate_import_jobs_with_querysets(self):
-        """Test generating ImportJobs with custom QuerySets."""
 
-        class TestModel1(models.Model):
-            name = models.CharField(max_length=100)
-            active = models.BooleanField(default=True)
+def test_data_slicer_creation_with_importers(importers):
+    """Test creating DataSlicer with importer class list."""
+    # Should accept list of importer classes
+    slicer = DataSlicer([importers.TestImporter1, importers.TestImporter2])
 
-            class Meta:
-                app_label = "test_data_slicer"
+    assert len(slicer.importers) == 2
+    assert importers.TestImporter1 in slicer.importers
+    assert importers.TestImporter2 in slicer.importers
 
-        class TestImporter1(Importer):
-            model = TestModel1
 
-            class Columns:
-                pass
+def test_data_slicer_creation_with_models(importers, db_conn_mock):
+    """Test creating DataSlicer with model class list."""
+    # Should accept list of model classes and find their importers
+    slicer = DataSlicer([SlicerModel1, SlicerModel2])
 
-        slicer = DataSlicer([TestImporter1])
+    assert len(slicer.importers) == 2
+    assert importers.TestImporter1 in slicer.importers
+    assert importers.TestImporter2 in slicer.importers
 
-        # Create mock QuerySet that will pass isinstance check
-        mock_queryset = MockQuerySet(model=TestModel1)
 
-        # Test with custom querysets dict
-        custom_querysets = {TestModel1: mock_queryset}
-        jobs = slicer.generate_import_jobs(querysets=custom_querysets)
+def test_data_slicer_invalid_configuration_fails():
+    """Test that invalid configurations raise errors."""
+    # Test with non-list
+    with pytest.raises(TypeError, match="must be a list"):
+        DataSlicer("not_a_list")
 
-        assert len(jobs) == 1
-        assert jobs[0].model == TestModel1
-        assert jobs[0].query is not None
+    # Test with empty list
+    with pytest.raises(ValueError, match="cannot be empty"):
+        DataSlicer([])
 
-    def test_generate_import_jobs_dependency_sorting(self):
-        """Test that jobs are auto-sorted by dependencies."""
+    # Test with invalid types in list
+    with pytest.raises(TypeError, match="must be Django model or Importer class"):
+        DataSlicer(["not_a_class"])
 
-        class Tenant(models.Model):
-            name = models.CharField(max_length=100)
+    # Test with model that has no importer
+    with pytest.raises(ValueError, match="no importer found"):
+        DataSlicer([UnregisteredSlicerModel])
 
-            class Meta:
-                app_label = "test_data_slicer"
 
-        class Shop(models.Model):
-            name = models.CharField(max_length=100)
-            tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE)
+def test_data_slicer_mixed_configuration_works(importers, db_conn_mock):
+    """Test that mixed importers and models work together."""
+    # Should accept mixed list of models and importers
+    slicer = DataSlicer([importers.TestImporter1, SlicerModel2])
 
-            class Meta:
-                app_label = "test_data_slicer"
+    assert len(slicer.importers) == 2
+    assert importers.TestImporter1 in slicer.importers
+    assert importers.TestImporter2 in slicer.importers
 
-        class Product(models.Model):
-            name = models.CharField(max_length=100)
-            shop = models.ForeignKey(Shop, on_delete=models.CASCADE)
 
-            class Meta:
-                app_label = "test_data_slicer"
+# DataSlicer job generation functionality.
 
-        class TenantImporter(Importer):
-            model = Tenant
 
-            class Columns:
-                pass
+def test_generate_import_jobs_from_importers(importers, db_conn_mock):
+    """Test generating ImportJobs from registered importers."""
+    slicer = DataSlicer([importers.TestImporter1, importers.TestImporter2])
+    jobs = slicer.generate_import_jobs()
 
-        class ShopImporter(Importer):
-            model = Shop
+    assert len(jobs) == 2
+    assert all(isinstance(job, ImportJob) for job in jobs)
 
-            class Columns:
-                tenant = Tenant
+    job_models = {job.model for job in jobs}
+    assert SlicerModel1 in job_models
+    assert SlicerModel2 in job_models
 
-        class ProductImporter(Importer):
-            model = Product
 
-            class Columns:
-                shop = Shop
+def test_generate_import_jobs_with_querysets(importers, db_conn_mock):
+    """Test generating ImportJobs with custom QuerySets."""
+    slicer = DataSlicer([importers.TestImporter])
 
-        # Create slicer with importers in wrong order
-        slicer = DataSlicer([ProductImporter, TenantImporter, ShopImporter])
-        jobs = slicer.generate_import_jobs()
+    # QuerySets are lazy, so building one never touches the database
+    custom_querysets = {ActiveSlicerModel: ActiveSlicerModel.objects.filter(active=True)}
+    jobs = slicer.generate_import_jobs(querysets=custom_querysets)
 
-        # Should be sorted: Tenant, Shop, Product
-        assert jobs[0].model == Tenant
-        assert jobs[1].model == Shop
-        assert jobs[2].model == Product
+    assert len(jobs) == 1
+    assert jobs[0].model == ActiveSlicerModel
+    assert jobs[0].query is not None
 
-    def test_generate_import_jobs_handles_circular_deps(self):
-        """Test that circular dependencies are detected in job generation."""
 
-        class ModelA(models.Model):
-            name = models.CharField(max_length=100)
-            b_ref = models.ForeignKey("ModelB", on_delete=models.CASCADE, null=True)
+def test_generate_import_jobs_dependency_sorting(importers):
+    """Test that jobs are auto-sorted by dependencies."""
+    # Create slicer with importers in wrong order
+    slicer = DataSlicer([importers.ProductImporter, importers.TenantImporter, importers.ShopImporter])
+    jobs = slicer.generate_import_jobs()
 
-            class Meta:
-                app_label = "test_data_slicer"
+    # Should be sorted: Tenant, Shop, Product
+    assert jobs[0].model == Tenant
+    assert jobs[1].model == Shop
+    assert jobs[2].model == Product
 
-        class ModelB(models.Model):
-            name = models.CharField(max_length=100)
-            a_ref = models.ForeignKey(ModelA, on_delete=models.CASCADE, null=True)
 
-            class Meta:
-                app_label = "test_data_slicer"
+def test_generate_import_jobs_handles_circular_deps(importers):
+    """Test that circular dependencies are detected in job generation."""
+    slicer = DataSlicer([importers.ModelAImporter, importers.ModelBImporter])
 
-        class ModelAImporter(Importer):
-            model = ModelA
+    with pytest.raises(ValueError, match="Circular dependency detected"):
+        slicer.generate_import_jobs()
 
-            class Columns:
-                b_ref = ModelB
 
-        class ModelBImporter(Importer):
-            model = ModelB
+# DataSlicer export operations.
 
-            class Columns:
-                a_ref = ModelA
 
-        slicer = DataSlicer([ModelAImporter, ModelBImporter])
+@pytest.mark.parametrize(
+    "querysets, subdir",
+    [
+        (None, "."),
+        ({ActiveSlicerModel: ActiveSlicerModel.objects.filter(active=True)}, "."),
+        (None, os.path.join("exports", "data")),
+    ],
+    ids=["single_model", "with_querysets", "custom_directory"],
+)
+def test_export_to_csv(importers, db_conn_mock, tmp_path, querysets, subdir):
+    """Test exporting a single model, optionally filtered, into a (possibly new) directory."""
+    slicer = DataSlicer([importers.TestImporter])
+    output_dir = os.path.join(str(tmp_path), subdir)
 
-        try:
-            slicer.generate_import_jobs()
-            raise AssertionError("Expected ValueError")
-        except ValueError as e:
-            assert "Circular dependency detected" in str(e)
+    result = slicer.export_to_csv(output_dir, querysets=querysets)
 
+    assert result is not None
+    assert "files_created" in result
+    assert len(result["files_created"]) == 1
 
-class TestDataSlicerExportOperations:
-    """Test DataSlicer export operations."""
+    # Should create the directory if needed and the file inside it
+    fname = importers.TestImporter.get_file_name()
+    assert Path(output_dir, fname).exists()
 
-    def setup_method(self):
-        """Clear registries before each test."""
-        clear_django_gyro_registries()
-        # Patch database connection to prevent geo_db_type errors
-        self.db_conn_patcher = patch("django.db.connection", mock_db_connection())
-        self.db_conn_patcher.start()
 
-    def teardown_method(self):
-        """Clear registries after each test."""
-        clear_django_gyro_registries()
-        self.db_conn_patcher.stop()
+def test_export_to_csv_multiple_models(importers, db_conn_mock, tmp_path):
+    """Test exporting multiple models with dependencies."""
+    slicer = DataSlicer([importers.CategorizedProductImporter, importers.CategoryImporter])
 
-    def test_export_to_csv_single_model(self):
-        """Test exporting single model to CSV."""
+    result = slicer.export_to_csv(str(tmp_path))
 
-        class TestModel(models.Model):
-            name = models.CharField(max_length=100)
+    assert len(result["files_created"]) == 2
 
-            class Meta:
-                app_label = "test_data_slicer"
+    # Check both files were created, listing the directory once
+    with os.scandir(tmp_path) as entries:
+        present = {entry.name for entry in entries}
+    expected = {importers.CategoryImporter.get_file_name(), importers.CategorizedProductImporter.get_file_name()}
+    assert expected <= present
 
-        class TestImporter(Importer):
-            model = TestModel
 
-            class Columns:
-                pass
+def test_run_exports_jobs_in_dependency_order(importers, run_mocks):
+    """Test that run() streams each job from the source into the target in dependency order."""
+    source = run_mocks.source
 
-        slicer = DataSlicer([TestImporter])
+    result = DataSlicer.run(
+        source=source, target=run_mocks.target, jobs=[ImportJob(CategorizedProduct), ImportJob(Category)]
+    )
+
+    # Category must be exported before the products that reference it
+    expected_files = [
+        importers.CategoryImporter.get_file_name(),
+        importers.CategorizedProductImporter.get_file_name(),
+    ]
+    assert result["files_created"] == expected_files
+    assert result["total_rows_exported"] == 4
+    exported_models = [call.args[0] for call in source.execute_copy.call_args_list]
+    assert exported_models == [Category, CategorizedProduct]
+    # COPY output goes straight into the target's stream
+    assert [call.args[1].name for call in source.execute_copy.call_args_list] == expected_files
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            result = slicer.export_to_csv(temp_dir)
 
-            assert result is not None
-            assert "files_created" in result
-            assert len(result["files_created"]) == 1
-
-            # Check file was created
-            expected_file = os.path.join(temp_dir, TestImporter.get_file_name())
-            assert os.path.exists(expected_file)
-
-    def test_export_to_csv_multiple_models(self):
-        """Test exporting multiple models with dependencies."""
-
-        class Category(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_data_slicer"
-
-        class Product(models.Model):
-            name = models.CharField(max_length=100)
-            category = models.ForeignKey(Category, on_delete=models.CASCADE)
-
-            class Meta:
-                app_label = "test_data_slicer"
-
-        class CategoryImporter(Importer):
-            model = Category
-
-            class Columns:
-                pass
-
-        class ProductImporter(Importer):
-            model = Product
-
-            class Columns:
-                category = Category
-
-        slicer = DataSlicer([ProductImporter, CategoryImporter])
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            result = slicer.export_to_csv(temp_dir)
-
-            assert len(result["files_created"]) == 2
-
-            # Check both files were created
-            cat_file = os.path.join(temp_dir, CategoryImporter.get_file_name())
-            prod_file = os.path.join(temp_dir, ProductImporter.get_file_name())
-            assert os.path.exists(cat_file)
-            assert os.path.exists(prod_file)
-
-    def test_export_to_csv_with_querysets(self):
-        """Test exporting with custom QuerySet filtering."""
-
-        class TestModel(models.Model):
-            name = models.CharField(max_length=100)
-            active = models.BooleanField(default=True)
-
-            class Meta:
-                app_label = "test_data_slicer"
-
-        class TestImporter(Importer):
-            model = TestModel
-
-            class Columns:
-                pass
-
-        slicer = DataSlicer([TestImporter])
-
-        # Create mock QuerySet that will pass isinstance check
-        mock_queryset = MockQuerySet(model=TestModel)
-        querysets = {TestModel: mock_queryset}
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            result = slicer.export_to_csv(temp_dir, querysets=querysets)
-
-            assert "files_created" in result
-            assert len(result["files_created"]) == 1
-
-    def test_export_to_csv_custom_directory(self):
-        """Test exporting to custom directory path."""
-
-        class TestModel(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_data_slicer"
-
-        class TestImporter(Importer):
-            model = TestModel
-
-            class Columns:
-                pass
-
-        slicer = DataSlicer([TestImporter])
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            custom_subdir = os.path.join(temp_dir, "exports", "data")
-
-            slicer.export_to_csv(custom_subdir)
-
-            # Should create directory if it doesn't exist
-            assert os.path.exists(custom_subdir)
-
-            # Should create file in custom directory
-            expected_file = os.path.join(custom_subdir, TestImporter.get_file_name())
-            assert os.path.exists(expected_file)
+def test_run_uses_server_side_copy_when_target_supports_it(importers, run_mocks):
+    """Test that run() lets PostgreSQL write files directly when the target shares its filesystem."""
+    run_mocks.target.supports_server_side_copy.return_value = True
+    run_mocks.target.prepare_server_side_copy.side_effect = lambda filename: (f"/srv/{filename}", f"/data/{filename}")
+    run_mocks.source.generate_server_side_copy_statement.return_value = "COPY category"
+    run_mocks.source.execute_server_side_copy.return_value = {"rows_exported": 3}
+
+    result = DataSlicer.run(source=run_mocks.source, target=run_mocks.target, jobs=[ImportJob(Category)])
+
+    filename = importers.CategoryImporter.get_file_name()
+    assert result["files_created"] == [f"/data/{filename}"]
+    assert result["total_rows_exported"] == 3
+    run_mocks.source.execute_server_side_copy.assert_called_once_with("COPY category", f"/srv/{filename}")
+    assert run_mocks.source.generate_server_side_copy_statement.call_args.args[1] == f"/srv/{filename}"
+    run_mocks.source.execute_copy.assert_not_called()
+    run_mocks.target.open_stream.assert_not_called()
+
+
+def test_run_exports_each_dependency_level_concurrently(importers, run_mocks):
+    """Test that run() exports the independent jobs of one level at the same time."""
+    jobs = [ImportJob(CategorizedProduct), ImportJob(Category), ImportJob(Tenant)]
+    levels = ImportJob.group_by_dependency_level(jobs)
+    assert [[job.model for job in level] for level in levels] == [[Category, Tenant], [CategorizedProduct]]
+
+    # Both first-level exports must be in flight together to pass the barrier
+    first_level = threading.Barrier(2, timeout=5)
+    export_threads = set()
+    compile_threads = set()
+
+    def generate_copy_statement(queryset, _filename, exclude=None):
+        compile_threads.add(threading.get_ident())
+        return queryset.model
+
+    def execute_copy(model, _output_file):
+        export_threads.add(threading.get_ident())
+        if model is not CategorizedProduct:
+            first_level.wait()
+        return {"rows_exported": 1}
+
+    run_mocks.source.generate_copy_statement.side_effect = generate_copy_statement
+    run_mocks.source.execute_copy.side_effect = execute_copy
+
+    result = DataSlicer.run(source=run_mocks.source, target=run_mocks.target, jobs=jobs, max_workers=2)
+
+    assert result["files_created"] == [
+        importers.CategoryImporter.get_file_name(),
+        importers.TenantImporter.get_file_name(),
+        importers.CategorizedProductImporter.get_file_name(),
+    ]
+    assert result["total_rows_exported"] == 3
+    # Later levels reuse the same worker threads, so no extra source connections are opened
+    assert len(export_threads) == 2
+    # SQL is compiled up front on the calling thread, never on a worker
+    assert compile_threads == {threading.get_ident()}
+
+
+@pytest.mark.parametrize("max_workers", [0, -1])
+def test_run_rejects_max_workers_below_one(importers, run_mocks, max_workers):
+    """Test that run() refuses a worker count below one instead of falling back to the default."""
+    with pytest.raises(ValueError, match="max_workers must be at least 1"):
+        DataSlicer.run(
+            source=run_mocks.source, target=run_mocks.target, jobs=[ImportJob(Category)], max_workers=max_workers
+        )
+
+    run_mocks.source.execute_copy.assert_not_called()
+
+
+def test_run_exports_jobs_sharing_a_model_one_after_another(importers, run_mocks):
+    """Test that run() never exports two jobs for one model, and so one file, at the same time."""
+    books = Category.objects.filter(name="Books")
+    jobs = [ImportJob(Category), ImportJob(Category, query=books), ImportJob(Tenant)]
+    events = []
+    events_lock = threading.Lock()
+
+    def execute_copy(queryset, _output_file):
+        with events_lock:
+            events.append(("start", queryset))
+        time.sleep(0.05)
+        with events_lock:
+            events.append(("end", queryset))
+        return {"rows_exported": 1}
+
+    run_mocks.source.generate_copy_statement.side_effect = lambda queryset, _filename, exclude=None: queryset
+    run_mocks.source.execute_copy.side_effect = execute_copy
+
+    result = DataSlicer.run(source=run_mocks.source, target=run_mocks.target, jobs=jobs, max_workers=3)
+
+    category_events = [(event, queryset is books) for event, queryset in events if queryset.model is Category]
+    # The jobs run in the order they were given, the second only after the first has finished
+    assert category_events == [("start", False), ("end", False), ("start", True), ("end", True)]
+    category_file = importers.CategoryImporter.get_file_name()
+    assert result["files_created"] == [category_file, importers.TenantImporter.get_file_name(), category_file]
+    assert result["total_rows_exported"] == 3
+
+
+def test_run_reports_progress_per_job(importers, run_mocks):
+    """Test that run() advances the progress bar and calls back once per job."""
+    jobs = [ImportJob(CategorizedProduct), ImportJob(Category), ImportJob(Tenant)]
+    progress_callback = MagicMock()
+
+    with patch("tqdm.tqdm") as mock_tqdm:
+        DataSlicer.run(
+            source=run_mocks.source,
+            target=run_mocks.target,
+            jobs=jobs,
+            progress_callback=progress_callback,
+            max_workers=1,
+        )
+
+    pbar = mock_tqdm.return_value.__enter__.return_value
+    assert [call.args[0] for call in pbar.update.call_args_list] == [1, 1, 1]
+    assert progress_callback.call_count == 3
+    assert sum(call.args[0]["rows_exported"] for call in progress_callback.call_args_list) == 6
+
+
+def test_copy_statements_substitute_filter_values():
+    """Test that each queryset's filter values are substituted into its COPY statement."""
+    source = PostgresSource("postgresql://test")
+
+    statement = source.generate_copy_statement(Shop.objects.filter(tenant__id=1, name="Books"), "shop.csv")
+
+    assert statement == (
+        'COPY (SELECT "test_data_slicer_shop"."id", "test_data_slicer_shop"."name", '
+        '"test_data_slicer_shop"."tenant_id" FROM "test_data_slicer_shop" '
+        'WHERE ("test_data_slicer_shop"."name" = \'Books\' AND "test_data_slicer_shop"."tenant_id" = 1)) '
+        "TO STDOUT WITH (FORMAT CSV, HEADER)"
+    )
+
+
+def test_run_closes_worker_connections(importers, tmp_path):
+    """Test that repeated run() calls on one source do not accumulate open connections."""
+    opened = []
+
+    def connect(_connection_string):
+        conn = MagicMock(closed=False)
+        conn.close.side_effect = lambda: setattr(conn, "closed", True)
+        cursor = conn.cursor.return_value.__enter__.return_value
+        cursor.copy_expert.side_effect = lambda _statement, stream: stream.write(b"id,name\n1,Books\n")
+        opened.append(conn)
+        return conn
+
+    source = PostgresSource("postgresql://test")
+    target = FileTarget(str(tmp_path), overwrite=True)
+
+    with patch("django_gyro.sources.psycopg2.connect", side_effect=connect):
+        for _ in range(3):
+            result = DataSlicer.run(
+                source=source, target=target, jobs=[ImportJob(Category), ImportJob(Tenant)], max_workers=2
+            )
+            assert result["total_rows_exported"] == 2
+            assert [conn for conn in opened if not conn.closed] == []
+
+    assert opened
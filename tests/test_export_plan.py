@@ -5,7 +5,7 @@ ExportPlan represents a plan for exporting data from Django models
 with proper dependency analysis for ordering.
 """
 
-from unittest.mock import Mock, patch
+from unittest.mock import patch
 
 import pytest
 from django.db import models
@@ -13,6 +13,72 @@ from django.db import models
 from django_gyro.core import Importer
 from django_gyro.importing import ExportPlan
 
+from .test_utils import MockQuerySet
+
+APP_LABEL = "test_export_plan"
+
+
+# Importers are still declared per test, since the registry is cleared between tests
+class ExportPlanTestModel(models.Model):
+    name = models.CharField(max_length=100)
+    active = models.BooleanField(default=True)
+
+    class Meta:
+        app_label = APP_LABEL
+
+
+class ExportPlanOtherModel(models.Model):
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        app_label = APP_LABEL
+
+
+class Tenant(models.Model):
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        app_label = APP_LABEL
+
+
+class Shop(models.Model):
+    tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE)
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        app_label = APP_LABEL
+
+
+class Customer(models.Model):
+    shop = models.ForeignKey(Shop, on_delete=models.CASCADE)
+    tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE)
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        app_label = APP_LABEL
+
+
+class ModelA(models.Model):
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        app_label = APP_LABEL
+
+
+class ModelB(models.Model):
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        app_label = APP_LABEL
+
+
+class Category(models.Model):
+    name = models.CharField(max_length=100)
+    parent = models.ForeignKey("self", null=True, blank=True, on_delete=models.CASCADE)
+
+    class Meta:
+        app_label = APP_LABEL
+
 
 class TestExportPlan:
     """Tests for ExportPlan behavior (formerly ImportJob)."""
@@ -31,14 +97,6 @@ class TestExportPlan:
 
     def test_creates_with_model_only(self):
         """ExportPlan can be created with just a model."""
-
-        # Setup
-        class ExportPlanTestModel(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_export_plan"
-
         # Exercise
         plan = ExportPlan(model=ExportPlanTestModel)
 
@@ -48,26 +106,14 @@ class TestExportPlan:
 
     def test_creates_with_model_and_queryset(self):
         """ExportPlan can be created with model and QuerySet."""
-
         # Setup
-        class ExportPlanTestModel2(models.Model):
-            name = models.CharField(max_length=100)
-            active = models.BooleanField(default=True)
-
-            class Meta:
-                app_label = "test_export_plan"
-
-        # Mock QuerySet that passes validation
-        from django.db.models.query import QuerySet
-
-        mock_queryset = Mock(spec=QuerySet)
-        mock_queryset.model = ExportPlanTestModel2
+        mock_queryset = MockQuerySet(ExportPlanTestModel)
 
         # Exercise
-        plan = ExportPlan(model=ExportPlanTestModel2, query=mock_queryset)
+        plan = ExportPlan(model=ExportPlanTestModel, query=mock_queryset)
 
         # Verify
-        assert plan.model == ExportPlanTestModel2
+        assert plan.model == ExportPlanTestModel
         assert plan.query == mock_queryset
 
     def test_validates_model_is_django_model(self):
@@ -83,61 +129,23 @@ class TestExportPlan:
 
     def test_validates_query_is_queryset(self):
         """ExportPlan validates that query is a QuerySet."""
-
-        # Setup
-        class ExportPlanTestModel(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_export_plan"
-
         # Exercise & Verify
         with pytest.raises(TypeError, match="query must be a Django QuerySet or None"):
             ExportPlan(model=ExportPlanTestModel, query="not a queryset")
 
     def test_validates_query_model_matches_plan_model(self):
         """ExportPlan validates that QuerySet model matches plan model."""
-
         # Setup
-        class ExportPlanTestModel3(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_export_plan"
-
-        class ExportPlanTestModel4(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_export_plan"
-
-        # Mock QuerySet with different model
-        from django.db.models.query import QuerySet
-
-        mock_queryset = Mock(spec=QuerySet)
-        mock_queryset.model = ExportPlanTestModel4
+        mock_queryset = MockQuerySet(ExportPlanOtherModel)
 
         # Exercise & Verify
         with pytest.raises(ValueError, match="QuerySet model does not match"):
-            ExportPlan(model=ExportPlanTestModel3, query=mock_queryset)
+            ExportPlan(model=ExportPlanTestModel, query=mock_queryset)
 
     def test_identifies_direct_dependencies(self):
         """ExportPlan identifies direct model dependencies."""
 
         # Setup
-        class Tenant(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_export_plan"
-
-        class Shop(models.Model):
-            tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE)
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_export_plan"
-
         # Mock importers
         class TenantImporter(Importer):
             model = Tenant
@@ -172,12 +180,6 @@ class TestExportPlan:
         """ExportPlan handles models with no dependencies."""
 
         # Setup
-        class Tenant(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_export_plan"
-
         # Mock importer with no dependencies
         class TenantImporter(Importer):
             model = Tenant
@@ -200,12 +202,6 @@ class TestExportPlan:
         """ExportPlan caches dependency computations for performance."""
 
         # Setup
-        class ExportPlanTestModel(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_export_plan"
-
         class TestImporter(Importer):
             model = ExportPlanTestModel
 
@@ -225,22 +221,33 @@ class TestExportPlan:
             assert deps1 is deps2  # Same object reference (cached)
             mock_get_importer.assert_called_once()  # Only called once
 
-    def test_detects_circular_dependencies(self):
-        """ExportPlan detects circular dependencies."""
+    def test_recomputes_dependencies_after_late_importer_registration(self):
+        """Registering another importer invalidates cached dependencies that depend on it."""
 
         # Setup
-        class ModelA(models.Model):
-            name = models.CharField(max_length=100)
+        class CustomerImporter(Importer):
+            model = Customer
 
-            class Meta:
-                app_label = "test_export_plan"
+            class Columns:
+                shop = Shop
 
-        class ModelB(models.Model):
-            name = models.CharField(max_length=100)
+        plan = ExportPlan(model=Customer)
+        assert plan.get_dependencies() == [Shop]
 
-            class Meta:
-                app_label = "test_export_plan"
+        # Exercise - Shop's importer arrives late, e.g. from an app imported afterwards
+        class ShopImporter(Importer):
+            model = Shop
 
+            class Columns:
+                tenant = Tenant
+
+        # Verify
+        assert plan.get_dependencies() == [Shop, Tenant]
+
+    def test_detects_circular_dependencies(self):
+        """ExportPlan detects circular dependencies."""
+
+        # Setup
         # Mock circular dependency: A depends on B, B depends on A
         class ImporterA(Importer):
             model = ModelA
@@ -272,26 +279,6 @@ class TestExportPlan:
         """ExportPlan can sort multiple plans by dependency order."""
 
         # Setup
-        class Tenant(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_export_plan"
-
-        class Shop(models.Model):
-            tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE)
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_export_plan"
-
-        class Customer(models.Model):
-            shop = models.ForeignKey(Shop, on_delete=models.CASCADE)
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_export_plan"
-
         # Mock importers with dependencies
         class TenantImporter(Importer):
             model = Tenant
@@ -320,7 +307,7 @@ class TestExportPlan:
                 return CustomerImporter
             return None
 
-        with patch.object(Importer, "get_importer_for_model", side_effect=mock_get_importer):
+        with patch.object(Importer, "get_importer_for_model", side_effect=mock_get_importer) as mock_get:
             # Create plans in wrong order
             customer_plan = ExportPlan(model=Customer)
             shop_plan = ExportPlan(model=Shop)
@@ -336,18 +323,42 @@ class TestExportPlan:
             assert sorted_plans[0].model == Tenant  # No dependencies
             assert sorted_plans[1].model == Shop  # Depends on Tenant
             assert sorted_plans[2].model == Customer  # Depends on Shop
+            # Shared ancestors are introspected once, not once per plan reaching them
+            assert mock_get.call_count == 3
 
-    def test_handles_self_referential_models(self):
-        """ExportPlan handles models that reference themselves."""
+    def test_sort_keeps_every_plan_for_a_model(self):
+        """Plans sharing a model but filtering differently are all kept, in dependency order."""
 
         # Setup
-        class Category(models.Model):
-            name = models.CharField(max_length=100)
-            parent = models.ForeignKey("self", null=True, blank=True, on_delete=models.CASCADE)
+        class TenantImporter(Importer):
+            model = Tenant
+
+            class Columns:
+                pass
+
+        class ShopImporter(Importer):
+            model = Shop
+
+            class Columns:
+                tenant = Tenant
 
-            class Meta:
-                app_label = "test_export_plan"
+        importers = {Tenant: TenantImporter, Shop: ShopImporter}
 
+        with patch.object(Importer, "get_importer_for_model", side_effect=importers.get):
+            shop_plan = ExportPlan(model=Shop)
+            acme_plan = ExportPlan(model=Tenant, query=Tenant.objects.filter(name="acme"))
+            beta_plan = ExportPlan(model=Tenant, query=Tenant.objects.filter(name="beta"))
+
+            # Exercise
+            sorted_plans = ExportPlan.sort_by_dependencies([shop_plan, acme_plan, beta_plan])
+
+            # Verify
+            assert sorted_plans == [acme_plan, beta_plan, shop_plan]
+
+    def test_handles_self_referential_models(self):
+        """ExportPlan handles models that reference themselves."""
+
+        # Setup
         class CategoryImporter(Importer):
             model = Category
 
@@ -366,23 +377,91 @@ class TestExportPlan:
             assert Category in dependencies
             assert len(dependencies) == 1
 
-    def test_provides_string_representation(self):
-        """ExportPlan provides useful string representation."""
+    def test_collects_transitive_dependencies_once(self):
+        """ExportPlan follows dependencies of dependencies and lists each model once."""
 
         # Setup
-        class ExportPlanTestModel(models.Model):
-            name = models.CharField(max_length=100)
+        class TenantImporter(Importer):
+            model = Tenant
 
-            class Meta:
-                app_label = "test_export_plan"
+            class Columns:
+                pass
 
+        class ShopImporter(Importer):
+            model = Shop
+
+            class Columns:
+                tenant = Tenant
+
+        class CustomerImporter(Importer):
+            model = Customer
+
+            class Columns:
+                shop = Shop
+                tenant = Tenant
+
+        importers = {Tenant: TenantImporter, Shop: ShopImporter, Customer: CustomerImporter}
+
+        with patch.object(Importer, "get_importer_for_model", side_effect=importers.get):
+            plan = ExportPlan(model=Customer)
+
+            # Exercise
+            dependencies = plan.get_dependencies()
+
+            # Verify
+            assert dependencies == [Shop, Tenant]
+
+    def test_lists_dependencies_depth_first(self):
+        """Each dependency is followed by its own dependencies before the next sibling."""
+
+        # Setup
+        class TenantImporter(Importer):
+            model = Tenant
+
+            class Columns:
+                pass
+
+        class ShopImporter(Importer):
+            model = Shop
+
+            class Columns:
+                tenant = Tenant
+
+        class OtherImporter(Importer):
+            model = ExportPlanOtherModel
+
+            class Columns:
+                pass
+
+        class CustomerImporter(Importer):
+            model = Customer
+
+            class Columns:
+                shop = Shop
+                supplier = ExportPlanOtherModel
+
+        importers = {
+            Tenant: TenantImporter,
+            Shop: ShopImporter,
+            ExportPlanOtherModel: OtherImporter,
+            Customer: CustomerImporter,
+        }
+
+        with patch.object(Importer, "get_importer_for_model", side_effect=importers.get):
+            plan = ExportPlan(model=Customer)
+
+            # Exercise
+            dependencies = plan.get_dependencies()
+
+            # Verify
+            assert dependencies == [Shop, Tenant, ExportPlanOtherModel]
+
+    def test_provides_string_representation(self):
+        """ExportPlan provides useful string representation."""
         # Exercise
         plan_without_query = ExportPlan(model=ExportPlanTestModel)
 
-        from django.db.models.query import QuerySet
-
-        mock_queryset = Mock(spec=QuerySet)
-        mock_queryset.model = ExportPlanTestModel
+        mock_queryset = MockQuerySet(ExportPlanTestModel)
         plan_with_query = ExportPlan(model=ExportPlanTestModel, query=mock_queryset)
 
         # Verify
@@ -394,24 +473,51 @@ class TestExportPlan:
 
     def test_equality_based_on_model_and_query(self):
         """Two ExportPlans are equal if they have same model and query."""
+        # Setup
+        queryset = ExportPlanTestModel.objects.filter(name="acme")
+
+        # Exercise
+        plan1 = ExportPlan(model=ExportPlanTestModel, query=queryset)
+        plan2 = ExportPlan(model=ExportPlanTestModel, query=queryset)
+        plan3 = ExportPlan(model=ExportPlanTestModel)  # Different (no query)
+
+        # Verify
+        assert plan1 == plan2
+        assert plan1 != plan3
+
+    def test_deduplicates_plans_with_equivalent_querysets(self):
+        """Plans over separately built but identical querysets hash and compare equal."""
 
         # Setup
-        class ExportPlanTestModel(models.Model):
-            name = models.CharField(max_length=100)
+        def plan_for(name):
+            return ExportPlan(model=ExportPlanTestModel, query=ExportPlanTestModel.objects.filter(name=name))
 
-            class Meta:
-                app_label = "test_export_plan"
+        # Exercise
+        plans = {plan_for("acme"), plan_for("acme"), plan_for("beta")}
 
-        from django.db.models.query import QuerySet
+        # Verify
+        assert len(plans) == 2
+        assert plan_for("acme") in plans
+        assert plan_for("acme") != ExportPlan(model=ExportPlanTestModel)
 
-        mock_queryset = Mock(spec=QuerySet)
-        mock_queryset.model = ExportPlanTestModel
+    def test_compares_querysets_that_match_nothing_by_identity(self):
+        """Querysets that compile to no SQL fall back to comparing by identity."""
+        # Setup
+        empty = ExportPlanTestModel.objects.filter(name__in=[])
 
         # Exercise
-        plan1 = ExportPlan(model=ExportPlanTestModel, query=mock_queryset)
-        plan2 = ExportPlan(model=ExportPlanTestModel, query=mock_queryset)
-        plan3 = ExportPlan(model=ExportPlanTestModel)  # Different (no query)
+        plan = ExportPlan(model=ExportPlanTestModel, query=empty)
 
         # Verify
-        assert plan1 == plan2
-        assert plan1 != plan3
+        assert plan == ExportPlan(model=ExportPlanTestModel, query=empty)
+        assert plan != ExportPlan(model=ExportPlanTestModel, query=ExportPlanTestModel.objects.filter(name__in=[]))
+
+    def test_propagates_query_compilation_errors(self):
+        """Errors compiling a queryset surface instead of silently disabling deduplication."""
+        # Setup
+        plan = ExportPlan(model=ExportPlanTestModel, query=ExportPlanTestModel.objects.all())
+
+        # Exercise & Verify
+        with patch.object(type(plan.query.query), "sql_with_params", side_effect=RuntimeError("broken")):
+            with pytest.raises(RuntimeError, match="broken"):
+                hash(plan)
@@ -0,0 +1,179 @@
+"""
+Tests for streaming export output from PostgresSource into FileTarget.
+
+COPY output is written straight into the target file instead of being
+buffered in a Python string or staged in a temporary file. When PostgreSQL
+shares a filesystem with the target, the server writes the file itself.
+"""
+
+import io
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from django_gyro.sources import PostgresSource
+from django_gyro.targets import FileTarget
+
+from .test_utils import mock_pg_connection
+
+
+class TestFileTargetStreaming:
+    """Tests for FileTarget streamed writes."""
+
+    def test_writes_chunks_and_counts_rows(self, tmp_path):
+        """write_csv_stream writes every chunk and counts rows across chunk boundaries."""
+        # Setup
+        target = FileTarget(str(tmp_path))
+        chunks = iter([b"id,name\n1,Jo", b"hn\n2,Jane"])
+
+        # Exercise
+        result = target.write_csv_stream("people.csv", chunks)
+
+        # Verify
+        assert (tmp_path / "people.csv").read_bytes() == b"id,name\n1,John\n2,Jane"
+        assert result["rows_written"] == 3
+        assert result["bytes_written"] == 21
+
+    def test_refuses_to_overwrite_existing_file(self, tmp_path):
+        """Streamed writes fail on an existing file unless overwrite is enabled."""
+        # Setup
+        (tmp_path / "people.csv").write_bytes(b"original\n")
+        target = FileTarget(str(tmp_path))
+
+        # Exercise & Verify
+        with pytest.raises(ValueError, match="Files already exist"):
+            target.write_csv_stream("people.csv", [b"replacement\n"])
+        assert (tmp_path / "people.csv").read_bytes() == b"original\n"
+
+        FileTarget(str(tmp_path), overwrite=True).write_csv_stream("people.csv", [b"replacement\n"])
+        assert (tmp_path / "people.csv").read_bytes() == b"replacement\n"
+
+    def test_checks_each_existing_path(self, tmp_path):
+        """check_existing_files resolves nested and parent-relative paths on their own."""
+        # Setup
+        (tmp_path / "exports").mkdir()
+        (tmp_path / "exports" / "people.csv").write_bytes(b"id\n")
+        (tmp_path / "shared.csv").write_bytes(b"id\n")
+        target = FileTarget(str(tmp_path / "exports"))
+
+        # Exercise
+        existing = target.check_existing_files(["people.csv", "../shared.csv", "missing/people.csv", "missing.csv"])
+
+        # Verify
+        assert existing == ["people.csv", "../shared.csv"]
+
+    def test_removes_partial_file_when_write_fails(self, tmp_path):
+        """A stream that fails part-way leaves no file behind, even when overwriting."""
+        # Setup
+        (tmp_path / "people.csv").write_bytes(b"id,name\n1,John\n")
+        target = FileTarget(str(tmp_path), overwrite=True)
+
+        def chunks():
+            yield b"id,name\n1,Jo"
+            raise RuntimeError("connection lost")
+
+        # Exercise & Verify
+        with pytest.raises(RuntimeError, match="connection lost"):
+            target.write_csv_stream("people.csv", chunks())
+        assert list(tmp_path.iterdir()) == []
+
+    def test_exclusive_stream_can_be_retried_after_failure(self, tmp_path):
+        """Without overwrite, a failed stream does not leave a file that blocks the retry."""
+        # Setup
+        target = FileTarget(str(tmp_path))
+        source = PostgresSource("postgresql://test")
+        connection = mock_pg_connection()
+        cursor = connection.cursor.return_value
+        attempts = []
+
+        def copy_expert(sql, f):
+            attempts.append(sql)
+            if len(attempts) == 1:
+                f.write(b"id,name\n1,Ac")
+                raise OSError("server closed the connection")
+            f.write(b"id,name\n1,Acme\n")
+
+        cursor.copy_expert.side_effect = copy_expert
+
+        # Exercise
+        with patch.object(source, "connect", return_value=connection):
+            with pytest.raises(Exception, match="server closed"):
+                with target.open_stream("tenants.csv") as stream:
+                    source.execute_copy("COPY (SELECT 1) TO STDOUT", stream)
+            with target.open_stream("tenants.csv") as stream:
+                result = source.execute_copy("COPY (SELECT 1) TO STDOUT", stream)
+
+        # Verify
+        assert (tmp_path / "tenants.csv").read_bytes() == b"id,name\n1,Acme\n"
+        assert result["rows_exported"] == 1
+
+    def test_write_csv_uses_stream(self, tmp_path):
+        """write_csv encodes the string once and reports the same statistics."""
+        # Setup
+        target = FileTarget(str(tmp_path))
+
+        # Exercise
+        result = target.write_csv("tenants.csv", "id,name\n1,Acme\n")
+
+        # Verify
+        assert (tmp_path / "tenants.csv").read_text(encoding="utf-8") == "id,name\n1,Acme\n"
+        assert result["rows_written"] == 2
+
+    def test_prepares_server_side_copy(self, tmp_path):
+        """A server_path enables server-side COPY for PostgreSQL sources and maps file paths onto it."""
+        # Setup
+        target = FileTarget(str(tmp_path), server_path="/srv/exports")
+
+        # Exercise
+        server_file, local_file = target.prepare_server_side_copy("data/people.csv")
+
+        # Verify
+        assert target.supports_server_side_copy(PostgresSource("postgresql://test"))
+        assert not target.supports_server_side_copy(MagicMock())
+        assert not FileTarget(str(tmp_path)).supports_server_side_copy(PostgresSource("postgresql://test"))
+        assert server_file == "/srv/exports/data/people.csv"
+        assert local_file == str(tmp_path / "data" / "people.csv")
+        assert (tmp_path / "data").is_dir()
+
+
+class TestPostgresSourceStreaming:
+    """Tests for PostgresSource COPY into caller-provided streams."""
+
+    def test_copies_into_stream_and_counts_rows(self):
+        """execute_copy writes COPY output into a stream and counts rows as it passes."""
+        # Setup
+        source = PostgresSource("postgresql://test")
+        connection = mock_pg_connection()
+        cursor = connection.cursor.return_value
+        cursor.copy_expert.side_effect = lambda _sql, f: [f.write(b"id,name\n"), f.write(b"1,Acme\n2,Beta\n")]
+        stream = io.BytesIO()
+
+        # Exercise
+        with patch.object(source, "connect", return_value=connection):
+            result = source.execute_copy("COPY (SELECT 1) TO STDOUT", stream)
+
+        # Verify
+        assert stream.getvalue() == b"id,name\n1,Acme\n2,Beta\n"
+        assert result["rows_exported"] == 2
+        assert result["file_size"] == 22
+
+    def test_postgres_source_generates_server_side_copy(self):
+        """Server-side exports COPY into a quoted server file path instead of STDOUT."""
+        # Setup
+        source = PostgresSource("postgresql://test")
+        connection = mock_pg_connection()
+        cursor = connection.cursor.return_value
+        cursor.rowcount = 2
+        queryset = MagicMock()
+        queryset.query.sql_with_params.return_value = ('SELECT "shop"."id" FROM "shop" WHERE "shop"."id" > %s', (0,))
+
+        # Exercise
+        with patch.object(source, "connect", return_value=connection):
+            result = source.export_queryset_server_side(queryset, "/srv/exports/bob's shop.csv")
+
+        # Verify
+        cursor.execute.assert_called_once_with(
+            'COPY (SELECT "shop"."id" FROM "shop" WHERE "shop"."id" > 0) '
+            "TO '/srv/exports/bob''s shop.csv' WITH (FORMAT CSV, HEADER)"
+        )
+        assert result == {"rows_exported": 2, "file_path": "/srv/exports/bob's shop.csv"}
@@ -7,62 +7,101 @@ Following the test plan Phase 2: ImportJob Definition
 - Dependency graph computation and caching
 """
 
-import time
-
 from django.db import models
 
 from django_gyro import Importer, ImportJob
 
 from .test_utils import DatabaseMockingTestMixin
 
-# Create unique suffix to avoid model conflicts
-UNIQUE_SUFFIX = str(int(time.time() * 1000000))[-6:]
+APP_LABEL = "test_import_job"
 
 
-class TestImportJobCreation(DatabaseMockingTestMixin):
-    """Test ImportJob instantiation and basic validation."""
+# Models are registered with Django once per module. Importers are still declared
+# inside each test, since the importer registry is cleared between tests.
+class JobModel(models.Model):
+    name = models.CharField(max_length=100)
 
-    def setUp(self):
-        """Clear the registry before each test."""
-        if hasattr(Importer, "_registry"):
-            Importer._registry.clear()
-        if hasattr(ImportJob, "_dependency_cache"):
-            ImportJob._dependency_cache.clear()
+    class Meta:
+        app_label = APP_LABEL
 
-    def tearDown(self):
-        """Clean up after each test."""
-        if hasattr(Importer, "_registry"):
-            Importer._registry.clear()
-        if hasattr(ImportJob, "_dependency_cache"):
-            ImportJob._dependency_cache.clear()
 
-    def test_import_job_creation_with_model_only(self):
-        """Test creating ImportJob with model only."""
+class OtherJobModel(models.Model):
+    name = models.CharField(max_length=100)
 
-        class TestModelJobCreation1(models.Model):
-            name = models.CharField(max_length=100)
+    class Meta:
+        app_label = APP_LABEL
 
-            class Meta:
-                app_label = "test_import_job"
 
-        job = ImportJob(model=TestModelJobCreation1)
+class CategoryJob(models.Model):
+    name = models.CharField(max_length=100)
 
-        assert job.model == TestModelJobCreation1
-        assert job.query is None
+    class Meta:
+        app_label = APP_LABEL
 
-    def test_import_job_creation_with_model_and_query(self):
-        """Test creating ImportJob with model and QuerySet."""
 
-        class TestModelJobCreation2(models.Model):
-            name = models.CharField(max_length=100)
+class CategorizedProductJob(models.Model):
+    name = models.CharField(max_length=100)
+    category = models.ForeignKey(CategoryJob, on_delete=models.CASCADE)
+
+    class Meta:
+        app_label = APP_LABEL
+
+
+class TenantJob(models.Model):
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        app_label = APP_LABEL
+
+
+class ShopJob(models.Model):
+    name = models.CharField(max_length=100)
+    tenant = models.ForeignKey(TenantJob, on_delete=models.CASCADE)
+
+    class Meta:
+        app_label = APP_LABEL
+
+
+class ShopProductJob(models.Model):
+    name = models.CharField(max_length=100)
+    shop = models.ForeignKey(ShopJob, on_delete=models.CASCADE)
+
+    class Meta:
+        app_label = APP_LABEL
+
+
+class CyclicAJob(models.Model):
+    name = models.CharField(max_length=100)
+    b_ref = models.ForeignKey("CyclicBJob", on_delete=models.CASCADE, null=True)
+
+    class Meta:
+        app_label = APP_LABEL
+
+
+class CyclicBJob(models.Model):
+    name = models.CharField(max_length=100)
+    a_ref = models.ForeignKey(CyclicAJob, on_delete=models.CASCADE, null=True)
+
+    class Meta:
+        app_label = APP_LABEL
+
 
-            class Meta:
-                app_label = "test_import_job"
+class TestImportJobCreation(DatabaseMockingTestMixin):
+    """Test ImportJob instantiation and basic validation."""
 
-        queryset = TestModelJobCreation2.objects.filter(name="test")
-        job = ImportJob(model=TestModelJobCreation2, query=queryset)
+    def test_import_job_creation_with_model_only(self):
+        """Test creating ImportJob with model only."""
+        job = ImportJob(model=JobModel)
 
-        assert job.model == TestModelJobCreation2
+        assert job.model == JobModel
+        assert job.query is None
+
+    def test_import_job_creation_with_model_and_query(self):
+        """Test creating ImportJob with model and QuerySet."""
+        queryset = JobModel.objects.filter(name="test")
+        job = ImportJob(model=JobModel, query=queryset)
+
+        assert job.model == JobModel
         assert job.query == queryset
 
     def test_import_job_invalid_model_types(self):
@@ -93,103 +132,48 @@ class TestImportJobCreation(DatabaseMockingTestMixin):
 
     def test_import_job_invalid_queryset_type(self):
         """Test that invalid QuerySet types raise errors."""
-
-        class TestModelJobCreation3(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_import_job"
-
         try:
-            ImportJob(model=TestModelJobCreation3, query="not_a_queryset")
+            ImportJob(model=JobModel, query="not_a_queryset")
             raise AssertionError("Expected TypeError")
         except TypeError as e:
             assert "must be a Django QuerySet or None" in str(e)
 
         try:
-            ImportJob(model=TestModelJobCreation3, query=[])
+            ImportJob(model=JobModel, query=[])
             raise AssertionError("Expected TypeError")
         except TypeError as e:
             assert "must be a Django QuerySet or None" in str(e)
 
     def test_import_job_queryset_model_mismatch(self):
         """Test that QuerySet must match the model."""
-
-        class TestModelJobCreation4(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_import_job"
-
-        class TestModelJobCreation5(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_import_job"
-
-        wrong_queryset = TestModelJobCreation5.objects.all()
+        wrong_queryset = OtherJobModel.objects.all()
 
         try:
-            ImportJob(model=TestModelJobCreation4, query=wrong_queryset)
+            ImportJob(model=JobModel, query=wrong_queryset)
             raise AssertionError("Expected ValueError")
         except ValueError as e:
             assert "QuerySet model does not match ImportJob model" in str(e)
 
     def test_import_job_empty_queryset_allowed(self):
         """Test that empty QuerySets are allowed."""
+        empty_queryset = JobModel.objects.none()
+        job = ImportJob(model=JobModel, query=empty_queryset)
 
-        class TestModelJobCreation6(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_import_job"
-
-        empty_queryset = TestModelJobCreation6.objects.none()
-        job = ImportJob(model=TestModelJobCreation6, query=empty_queryset)
-
-        assert job.model == TestModelJobCreation6
+        assert job.model == JobModel
         assert job.query == empty_queryset
 
 
 class TestImportJobProperties(DatabaseMockingTestMixin):
     """Test ImportJob properties and immutability."""
 
-    def setUp(self):
-        """Clear the registry before each test."""
-        if hasattr(Importer, "_registry"):
-            Importer._registry.clear()
-        if hasattr(ImportJob, "_dependency_cache"):
-            ImportJob._dependency_cache.clear()
-
-    def tearDown(self):
-        """Clean up after each test."""
-        if hasattr(Importer, "_registry"):
-            Importer._registry.clear()
-        if hasattr(ImportJob, "_dependency_cache"):
-            ImportJob._dependency_cache.clear()
-
     def test_model_property_returns_correct_class(self):
         """Test that model property returns the correct model class."""
-
-        class TestModelJobProperties1(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_import_job"
-
-        job = ImportJob(model=TestModelJobProperties1)
-        assert job.model == TestModelJobProperties1
+        job = ImportJob(model=JobModel)
+        assert job.model == JobModel
 
     def test_model_property_immutable_after_creation(self):
         """Test that model property cannot be changed after creation."""
-
-        class TestModelJobProperties2(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_import_job"
-
-        job = ImportJob(model=TestModelJobProperties2)
+        job = ImportJob(model=JobModel)
 
         # Should not be able to modify model
         try:
@@ -200,163 +184,88 @@ class TestImportJobProperties(DatabaseMockingTestMixin):
 
     def test_query_property_returns_queryset(self):
         """Test that query property returns the QuerySet."""
-
-        class TestModelJobProperties3(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_import_job"
-
-        queryset = TestModelJobProperties3.objects.filter(name="test")
-        job = ImportJob(model=TestModelJobProperties3, query=queryset)
+        queryset = JobModel.objects.filter(name="test")
+        job = ImportJob(model=JobModel, query=queryset)
 
         assert job.query == queryset
 
     def test_query_property_handles_none_values(self):
         """Test that query property handles None values."""
-
-        class TestModelJobProperties4(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_import_job"
-
-        job = ImportJob(model=TestModelJobProperties4)
+        job = ImportJob(model=JobModel)
         assert job.query is None
 
 
 class TestImportJobDependencies(DatabaseMockingTestMixin):
     """Test ImportJob dependency analysis and graph computation."""
 
-    def setUp(self):
-        """Clear the registry before each test."""
-        if hasattr(Importer, "_registry"):
-            Importer._registry.clear()
-        if hasattr(ImportJob, "_dependency_cache"):
-            ImportJob._dependency_cache.clear()
-
-    def tearDown(self):
-        """Clean up after each test."""
-        if hasattr(Importer, "_registry"):
-            Importer._registry.clear()
-        if hasattr(ImportJob, "_dependency_cache"):
-            ImportJob._dependency_cache.clear()
-
     def test_get_dependencies_identifies_foreign_key_dependencies(self):
         """Test that get_dependencies identifies FK dependencies."""
 
-        class CategoryJobDeps1(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_import_job"
-
-        class ProductJobDeps1(models.Model):
-            name = models.CharField(max_length=100)
-            category = models.ForeignKey(CategoryJobDeps1, on_delete=models.CASCADE)
-
-            class Meta:
-                app_label = "test_import_job"
-
         # Create importers
         class CategoryImporter(Importer):
-            model = CategoryJobDeps1
+            model = CategoryJob
 
             class Columns:
                 pass
 
         class ProductImporter(Importer):
-            model = ProductJobDeps1
+            model = CategorizedProductJob
 
             class Columns:
-                category = CategoryJobDeps1
+                category = CategoryJob
 
-        job = ImportJob(model=ProductJobDeps1)
+        job = ImportJob(model=CategorizedProductJob)
         dependencies = job.get_dependencies()
 
         # Product should depend on Category
-        assert CategoryJobDeps1 in dependencies
+        assert CategoryJob in dependencies
 
     def test_get_dependencies_returns_dependency_chain(self):
         """Test that get_dependencies returns the full dependency chain."""
 
-        class TenantJobDeps2(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_import_job"
-
-        class ShopJobDeps2(models.Model):
-            name = models.CharField(max_length=100)
-            tenant = models.ForeignKey(TenantJobDeps2, on_delete=models.CASCADE)
-
-            class Meta:
-                app_label = "test_import_job"
-
-        class ProductJobDeps2(models.Model):
-            name = models.CharField(max_length=100)
-            shop = models.ForeignKey(ShopJobDeps2, on_delete=models.CASCADE)
-
-            class Meta:
-                app_label = "test_import_job"
-
         # Create importers
         class TenantImporter(Importer):
-            model = TenantJobDeps2
+            model = TenantJob
 
             class Columns:
                 pass
 
         class ShopImporter(Importer):
-            model = ShopJobDeps2
+            model = ShopJob
 
             class Columns:
-                tenant = TenantJobDeps2
+                tenant = TenantJob
 
         class ProductImporter(Importer):
-            model = ProductJobDeps2
+            model = ShopProductJob
 
             class Columns:
-                shop = ShopJobDeps2
+                shop = ShopJob
 
-        job = ImportJob(model=ProductJobDeps2)
+        job = ImportJob(model=ShopProductJob)
         dependencies = job.get_dependencies()
 
         # Product should depend on both Shop and Tenant
-        assert ShopJobDeps2 in dependencies
-        assert TenantJobDeps2 in dependencies
+        assert ShopJob in dependencies
+        assert TenantJob in dependencies
 
     def test_get_dependencies_handles_circular_references(self):
         """Test that circular dependencies are detected."""
 
-        class ModelAJobDeps3(models.Model):
-            name = models.CharField(max_length=100)
-            b_ref = models.ForeignKey("ModelBJobDeps3", on_delete=models.CASCADE, null=True)
-
-            class Meta:
-                app_label = "test_import_job"
-
-        class ModelBJobDeps3(models.Model):
-            name = models.CharField(max_length=100)
-            a_ref = models.ForeignKey(ModelAJobDeps3, on_delete=models.CASCADE, null=True)
-
-            class Meta:
-                app_label = "test_import_job"
-
         # Create importers
         class ModelAImporter(Importer):
-            model = ModelAJobDeps3
+            model = CyclicAJob
 
             class Columns:
-                b_ref = ModelBJobDeps3
+                b_ref = CyclicBJob
 
         class ModelBImporter(Importer):
-            model = ModelBJobDeps3
+            model = CyclicBJob
 
             class Columns:
-                a_ref = ModelAJobDeps3
+                a_ref = CyclicAJob
 
-        job = ImportJob(model=ModelAJobDeps3)
+        job = ImportJob(model=CyclicAJob)
 
         # Should detect circular dependency
         try:
@@ -368,33 +277,20 @@ class TestImportJobDependencies(DatabaseMockingTestMixin):
     def test_get_dependencies_caches_computation(self):
         """Test that dependency computation is cached for performance."""
 
-        class CategoryJobDeps4(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_import_job"
-
-        class ProductJobDeps4(models.Model):
-            name = models.CharField(max_length=100)
-            category = models.ForeignKey(CategoryJobDeps4, on_delete=models.CASCADE)
-
-            class Meta:
-                app_label = "test_import_job"
-
         # Create importers
         class CategoryImporter(Importer):
-            model = CategoryJobDeps4
+            model = CategoryJob
 
             class Columns:
                 pass
 
         class ProductImporter(Importer):
-            model = ProductJobDeps4
+            model = CategorizedProductJob
 
             class Columns:
-                category = CategoryJobDeps4
+                category = CategoryJob
 
-        job = ImportJob(model=ProductJobDeps4)
+        job = ImportJob(model=CategorizedProductJob)
 
         # First call should compute and cache
         deps1 = job.get_dependencies()
@@ -406,113 +302,86 @@ class TestImportJobDependencies(DatabaseMockingTestMixin):
         # Verify cache exists
         assert hasattr(ImportJob, "_dependency_cache")
 
+    def test_recomputes_dependencies_after_late_importer_registration(self):
+        """Test that registering another importer invalidates cached dependencies."""
 
-class TestImportJobDependencyOrdering(DatabaseMockingTestMixin):
-    """Test dependency ordering functionality for ImportJobs."""
-
-    def setUp(self):
-        """Clear the registry before each test."""
-        if hasattr(Importer, "_registry"):
-            Importer._registry.clear()
-        if hasattr(ImportJob, "_dependency_cache"):
-            ImportJob._dependency_cache.clear()
+        class ProductImporter(Importer):
+            model = ShopProductJob
 
-    def tearDown(self):
-        """Clean up after each test."""
-        if hasattr(Importer, "_registry"):
-            Importer._registry.clear()
-        if hasattr(ImportJob, "_dependency_cache"):
-            ImportJob._dependency_cache.clear()
+            class Columns:
+                shop = ShopJob
 
-    def test_sort_jobs_by_dependency_order(self):
-        """Test sorting jobs by dependency order."""
+        job = ImportJob(model=ShopProductJob)
+        assert job.get_dependencies() == [ShopJob]
 
-        class TenantJobOrder1(models.Model):
-            name = models.CharField(max_length=100)
+        # ShopJob's importer arrives late, e.g. from an app imported afterwards
+        class ShopImporter(Importer):
+            model = ShopJob
 
-            class Meta:
-                app_label = "test_import_job"
+            class Columns:
+                tenant = TenantJob
 
-        class ShopJobOrder1(models.Model):
-            name = models.CharField(max_length=100)
-            tenant = models.ForeignKey(TenantJobOrder1, on_delete=models.CASCADE)
+        assert job.get_dependencies() == [ShopJob, TenantJob]
 
-            class Meta:
-                app_label = "test_import_job"
 
-        class ProductJobOrder1(models.Model):
-            name = models.CharField(max_length=100)
-            shop = models.ForeignKey(ShopJobOrder1, on_delete=models.CASCADE)
+class TestImportJobDependencyOrdering(DatabaseMockingTestMixin):
+    """Test dependency ordering functionality for ImportJobs."""
 
-            class Meta:
-                app_label = "test_import_job"
+    def test_sort_jobs_by_dependency_order(self):
+        """Test sorting jobs by dependency order."""
 
         # Create importers
         class TenantImporter(Importer):
-            model = TenantJobOrder1
+            model = TenantJob
 
             class Columns:
                 pass
 
         class ShopImporter(Importer):
-            model = ShopJobOrder1
+            model = ShopJob
 
             class Columns:
-                tenant = TenantJobOrder1
+                tenant = TenantJob
 
         class ProductImporter(Importer):
-            model = ProductJobOrder1
+            model = ShopProductJob
 
             class Columns:
-                shop = ShopJobOrder1
+                shop = ShopJob
 
         # Create jobs in wrong order
         jobs = [
-            ImportJob(model=ProductJobOrder1),
-            ImportJob(model=TenantJobOrder1),
-            ImportJob(model=ShopJobOrder1),
+            ImportJob(model=ShopProductJob),
+            ImportJob(model=TenantJob),
+            ImportJob(model=ShopJob),
         ]
 
         sorted_jobs = ImportJob.sort_by_dependencies(jobs)
 
         # Should be ordered: Tenant, Shop, Product
-        assert sorted_jobs[0].model == TenantJobOrder1
-        assert sorted_jobs[1].model == ShopJobOrder1
-        assert sorted_jobs[2].model == ProductJobOrder1
+        assert sorted_jobs[0].model == TenantJob
+        assert sorted_jobs[1].model == ShopJob
+        assert sorted_jobs[2].model == ShopProductJob
 
     def test_detect_circular_dependencies_in_job_list(self):
         """Test detection of circular dependencies in job list."""
 
-        class ModelAJobOrder2(models.Model):
-            name = models.CharField(max_length=100)
-            b_ref = models.ForeignKey("ModelBJobOrder2", on_delete=models.CASCADE, null=True)
-
-            class Meta:
-                app_label = "test_import_job"
-
-        class ModelBJobOrder2(models.Model):
-            name = models.CharField(max_length=100)
-            a_ref = models.ForeignKey(ModelAJobOrder2, on_delete=models.CASCADE, null=True)
-
-            class Meta:
-                app_label = "test_import_job"
-
         # Create importers with circular dependency
         class ModelAImporter(Importer):
-            model = ModelAJobOrder2
+            model = CyclicAJob
 
             class Columns:
-                b_ref = ModelBJobOrder2
+                b_ref = CyclicBJob
 
         class ModelBImporter(Importer):
-            model = ModelBJobOrder2
+            model = CyclicBJob
 
             class Columns:
-                a_ref = ModelAJobOrder2
+                a_ref = CyclicAJob
 
         jobs = [
-            ImportJob(model=ModelAJobOrder2),
-            ImportJob(model=ModelBJobOrder2),
+            ImportJob(model=CyclicAJob),
+            ImportJob(model=CyclicBJob),
         ]
 
         try:
@@ -524,34 +393,22 @@ class TestImportJobDependencyOrdering(DatabaseMockingTestMixin):
     def test_handle_independent_models_ordering(self):
         """Test that independent models can be in any order."""
 
-        class IndependentAJobOrder3(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_import_job"
-
-        class IndependentBJobOrder3(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_import_job"
-
         # Create importers
         class IndependentAImporter(Importer):
-            model = IndependentAJobOrder3
+            model = TenantJob
 
             class Columns:
                 pass
 
         class IndependentBImporter(Importer):
-            model = IndependentBJobOrder3
+            model = CategoryJob
 
             class Columns:
                 pass
 
         jobs = [
-            ImportJob(model=IndependentBJobOrder3),
-            ImportJob(model=IndependentAJobOrder3),
+            ImportJob(model=CategoryJob),
+            ImportJob(model=TenantJob),
         ]
 
         # Should not raise any errors
@@ -560,4 +417,4 @@ class TestImportJobDependencyOrdering(DatabaseMockingTestMixin):
         # Both orders should be valid since they're independent
         assert len(sorted_jobs) == 2
         models_in_result = {job.model for job in sorted_jobs}
-        assert models_in_result == {IndependentAJobOrder3, IndependentBJobOrder3}
+        assert models_in_result == {TenantJob, CategoryJob}
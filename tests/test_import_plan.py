@@ -13,6 +13,45 @@ from django.db import models
 
 from django_gyro.importing import ImportPlan, SequentialRemappingStrategy
 
+from .test_utils import write_csv_files
+
+APP_LABEL = "test_import_plan"
+
+
+class ImportPlanTestModel(models.Model):
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        app_label = APP_LABEL
+
+
+class ImportPlanTenant(models.Model):
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        app_label = APP_LABEL
+
+
+class ImportPlanShop(models.Model):
+    tenant = models.ForeignKey(ImportPlanTenant, on_delete=models.CASCADE)
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        app_label = APP_LABEL
+
+
+@pytest.fixture(scope="module")
+def import_plan_csvs(tmp_path_factory):
+    """CSV files written once and shared by every test; none of the tests modify them."""
+    return write_csv_files(
+        tmp_path_factory.mktemp("import_plan"),
+        {
+            "test.csv": "name,email\nJohn,john@example.com\nJane,jane@example.com\nBob,bob@example.com\n",
+            "tenant.csv": "",
+            "shop.csv": "",
+        },
+    )
+
 
 class TestImportPlan:
     """Tests for ImportPlan value object behavior."""
@@ -29,296 +68,141 @@ class TestImportPlan:
 
         clear_django_gyro_registries()
 
-    def test_creates_with_model_and_csv_path(self):
+    def test_creates_with_model_and_csv_path(self, import_plan_csvs):
         """ImportPlan requires a model and CSV path."""
-
         # Setup
-        class ImportPlanTestModel(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_import_plan"
-
-        import tempfile
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            csv_path = Path(temp_dir) / "test.csv"
-            csv_path.touch()
+        csv_path = import_plan_csvs["test.csv"]
 
-            # Exercise
-            plan = ImportPlan(model=ImportPlanTestModel, csv_path=csv_path)
+        # Exercise
+        plan = ImportPlan(model=ImportPlanTestModel, csv_path=csv_path)
 
-            # Verify
-            assert plan.model == ImportPlanTestModel
-            assert plan.csv_path == csv_path
-            assert plan.dependencies == []
-            assert plan.id_remapping_strategy is None
+        # Verify
+        assert plan.model == ImportPlanTestModel
+        assert plan.csv_path == csv_path
+        assert plan.dependencies == []
+        assert plan.id_remapping_strategy is None
 
-    def test_provides_model_label(self):
+    def test_provides_model_label(self, import_plan_csvs):
         """ImportPlan provides a convenient model label."""
-
         # Setup
-        class ImportPlanTestModel(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_import_plan"
-
-        import tempfile
+        csv_path = import_plan_csvs["test.csv"]
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            csv_path = Path(temp_dir) / "test.csv"
-            csv_path.touch()
+        plan = ImportPlan(model=ImportPlanTestModel, csv_path=csv_path)
 
-            plan = ImportPlan(model=ImportPlanTestModel, csv_path=csv_path)
+        # Exercise
+        label = plan.model_label
 
-            # Exercise
-            label = plan.model_label
+        # Verify
+        assert label == "test_import_plan.ImportPlanTestModel"
 
-            # Verify
-            assert label == "test_import_plan.ImportPlanTestModel"
-
-    def test_can_have_dependencies(self):
+    def test_can_have_dependencies(self, import_plan_csvs):
         """ImportPlan can depend on other ImportPlans."""
-
         # Setup
-        class ImportPlanTenant(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_import_plan"
-
-        class ImportPlanShop(models.Model):
-            tenant = models.ForeignKey(ImportPlanTenant, on_delete=models.CASCADE)
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_import_plan"
-
-        import tempfile
+        tenant_csv, shop_csv = import_plan_csvs["tenant.csv"], import_plan_csvs["shop.csv"]
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            tenant_csv = Path(temp_dir) / "tenant.csv"
-            shop_csv = Path(temp_dir) / "shop.csv"
-            tenant_csv.touch()
-            shop_csv.touch()
+        tenant_plan = ImportPlan(model=ImportPlanTenant, csv_path=tenant_csv)
+        shop_plan = ImportPlan(model=ImportPlanShop, csv_path=shop_csv, dependencies=[tenant_plan])
 
-            tenant_plan = ImportPlan(model=ImportPlanTenant, csv_path=tenant_csv)
-            shop_plan = ImportPlan(model=ImportPlanShop, csv_path=shop_csv, dependencies=[tenant_plan])
-
-            # Exercise & Verify
-            assert len(shop_plan.dependencies) == 1
-            assert shop_plan.dependencies[0] == tenant_plan
+        # Exercise & Verify
+        assert len(shop_plan.dependencies) == 1
+        assert shop_plan.dependencies[0] == tenant_plan
 
-    def test_can_be_configured_with_remapping_strategy(self):
+    def test_can_be_configured_with_remapping_strategy(self, import_plan_csvs):
         """ImportPlan can have a specific ID remapping strategy."""
-
         # Setup
-        class ImportPlanTestModel(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_import_plan"
+        csv_path = import_plan_csvs["test.csv"]
 
-        import tempfile
+        strategy = Mock(spec=SequentialRemappingStrategy)
+        plan = ImportPlan(model=ImportPlanTestModel, csv_path=csv_path, id_remapping_strategy=strategy)
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            csv_path = Path(temp_dir) / "test.csv"
-            csv_path.touch()
-
-            strategy = Mock(spec=SequentialRemappingStrategy)
-            plan = ImportPlan(model=ImportPlanTestModel, csv_path=csv_path, id_remapping_strategy=strategy)
-
-            # Exercise & Verify
-            assert plan.id_remapping_strategy is strategy
+        # Exercise & Verify
+        assert plan.id_remapping_strategy is strategy
 
     def test_validates_csv_file_exists(self):
         """ImportPlan validates that the CSV file exists."""
-
         # Setup
-        class ImportPlanTestModel(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_import_plan"
-
         non_existent_csv = Path("/definitely/does/not/exist.csv")
 
         # Exercise & Verify
         with pytest.raises(ValueError, match="CSV file does not exist"):
             ImportPlan(model=ImportPlanTestModel, csv_path=non_existent_csv)
 
-    def test_discovers_foreign_key_dependencies(self):
+    def test_discovers_foreign_key_dependencies(self, import_plan_csvs):
         """ImportPlan can discover dependencies from model foreign keys."""
-
         # Setup
-        class ImportPlanTenant(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_import_plan"
-
-        class ImportPlanShop(models.Model):
-            tenant = models.ForeignKey(ImportPlanTenant, on_delete=models.CASCADE)
-            name = models.CharField(max_length=100)
+        csv_path = import_plan_csvs["shop.csv"]
 
-            class Meta:
-                app_label = "test_import_plan"
+        # Exercise
+        plan = ImportPlan(model=ImportPlanShop, csv_path=csv_path)
+        fk_dependencies = plan.discover_foreign_key_dependencies()
 
-        import tempfile
+        # Verify
+        assert ImportPlanTenant in fk_dependencies
+        assert len(fk_dependencies) == 1
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            csv_path = Path(temp_dir) / "shop.csv"
-            csv_path.touch()
-
-            # Exercise
-            plan = ImportPlan(model=ImportPlanShop, csv_path=csv_path)
-            fk_dependencies = plan.discover_foreign_key_dependencies()
-
-            # Verify
-            assert ImportPlanTenant in fk_dependencies
-            assert len(fk_dependencies) == 1
-
-    def test_calculates_import_order_weight(self):
+    def test_calculates_import_order_weight(self, import_plan_csvs):
         """ImportPlan calculates weight for dependency ordering."""
-
         # Setup
-        class ImportPlanTenant(models.Model):
-            name = models.CharField(max_length=100)
+        tenant_csv, shop_csv = import_plan_csvs["tenant.csv"], import_plan_csvs["shop.csv"]
 
-            class Meta:
-                app_label = "test_import_plan"
+        tenant_plan = ImportPlan(model=ImportPlanTenant, csv_path=tenant_csv)
+        shop_plan = ImportPlan(model=ImportPlanShop, csv_path=shop_csv, dependencies=[tenant_plan])
 
-        class ImportPlanShop(models.Model):
-            tenant = models.ForeignKey(ImportPlanTenant, on_delete=models.CASCADE)
-            name = models.CharField(max_length=100)
+        # Exercise
+        tenant_weight = tenant_plan.calculate_import_weight()
+        shop_weight = shop_plan.calculate_import_weight()
 
-            class Meta:
-                app_label = "test_import_plan"
+        # Verify
+        assert tenant_weight == 0  # No dependencies
+        assert shop_weight == 1  # One dependency
 
-        import tempfile
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            tenant_csv = Path(temp_dir) / "tenant.csv"
-            shop_csv = Path(temp_dir) / "shop.csv"
-            tenant_csv.touch()
-            shop_csv.touch()
-
-            tenant_plan = ImportPlan(model=ImportPlanTenant, csv_path=tenant_csv)
-            shop_plan = ImportPlan(model=ImportPlanShop, csv_path=shop_csv, dependencies=[tenant_plan])
-
-            # Exercise
-            tenant_weight = tenant_plan.calculate_import_weight()
-            shop_weight = shop_plan.calculate_import_weight()
-
-            # Verify
-            assert tenant_weight == 0  # No dependencies
-            assert shop_weight == 1  # One dependency
-
-    def test_estimates_row_count_from_csv(self):
+    def test_estimates_row_count_from_csv(self, import_plan_csvs):
         """ImportPlan can estimate row count from CSV file."""
-
         # Setup
-        class ImportPlanTestModel(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_import_plan"
-
-        import tempfile
+        csv_path = import_plan_csvs["test.csv"]
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            csv_path = Path(temp_dir) / "test.csv"
-            with open(csv_path, "w") as f:
-                f.write("name,email\n")
-                f.write("John,john@example.com\n")
-                f.write("Jane,jane@example.com\n")
-                f.write("Bob,bob@example.com\n")
+        plan = ImportPlan(model=ImportPlanTestModel, csv_path=csv_path)
 
-            plan = ImportPlan(model=ImportPlanTestModel, csv_path=csv_path)
+        # Exercise
+        row_count = plan.estimate_row_count()
 
-            # Exercise
-            row_count = plan.estimate_row_count()
+        # Verify
+        assert row_count == 3  # 3 data rows (excluding header)
 
-            # Verify
-            assert row_count == 3  # 3 data rows (excluding header)
-
-    def test_equality_based_on_model_and_path(self):
+    def test_equality_based_on_model_and_path(self, import_plan_csvs):
         """Two ImportPlans are equal if they have same model and CSV path."""
-
         # Setup
-        class ImportPlanTestModel(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_import_plan"
-
-        import tempfile
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            csv_path = Path(temp_dir) / "test.csv"
-            csv_path.touch()
+        csv_path = import_plan_csvs["test.csv"]
 
-            plan1 = ImportPlan(model=ImportPlanTestModel, csv_path=csv_path)
-            plan2 = ImportPlan(model=ImportPlanTestModel, csv_path=csv_path)
+        plan1 = ImportPlan(model=ImportPlanTestModel, csv_path=csv_path)
+        plan2 = ImportPlan(model=ImportPlanTestModel, csv_path=csv_path)
 
-            # Exercise & Verify
-            assert plan1 == plan2
+        # Exercise & Verify
+        assert plan1 == plan2
 
-    def test_can_be_used_as_dependency(self):
+    def test_can_be_used_as_dependency(self, import_plan_csvs):
         """ImportPlan can be used as a dependency in other plans."""
-
         # Setup
-        class ImportPlanTenant(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_import_plan"
-
-        class ImportPlanShop(models.Model):
-            tenant = models.ForeignKey(ImportPlanTenant, on_delete=models.CASCADE)
-            name = models.CharField(max_length=100)
+        tenant_csv, shop_csv = import_plan_csvs["tenant.csv"], import_plan_csvs["shop.csv"]
 
-            class Meta:
-                app_label = "test_import_plan"
+        tenant_plan = ImportPlan(model=ImportPlanTenant, csv_path=tenant_csv)
+        shop_plan = ImportPlan(model=ImportPlanShop, csv_path=shop_csv, dependencies=[tenant_plan])
 
-        import tempfile
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            tenant_csv = Path(temp_dir) / "tenant.csv"
-            shop_csv = Path(temp_dir) / "shop.csv"
-            tenant_csv.touch()
-            shop_csv.touch()
-
-            tenant_plan = ImportPlan(model=ImportPlanTenant, csv_path=tenant_csv)
-            shop_plan = ImportPlan(model=ImportPlanShop, csv_path=shop_csv, dependencies=[tenant_plan])
-
-            # Exercise & Verify
-            assert tenant_plan in shop_plan.dependencies
-            assert shop_plan.has_dependency(tenant_plan)
+        # Exercise & Verify
+        assert tenant_plan in shop_plan.dependencies
+        assert shop_plan.has_dependency(tenant_plan)
 
-    def test_provides_string_representation(self):
+    def test_provides_string_representation(self, import_plan_csvs):
         """ImportPlan provides useful string representation."""
-
         # Setup
-        class ImportPlanTestModel(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_import_plan"
-
-        import tempfile
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            csv_path = Path(temp_dir) / "test.csv"
-            csv_path.touch()
+        csv_path = import_plan_csvs["test.csv"]
 
-            plan = ImportPlan(model=ImportPlanTestModel, csv_path=csv_path)
+        plan = ImportPlan(model=ImportPlanTestModel, csv_path=csv_path)
 
-            # Exercise
-            string_repr = str(plan)
+        # Exercise
+        string_repr = str(plan)
 
-            # Verify
-            assert "ImportPlan" in string_repr
-            assert "ImportPlanTestModel" in string_repr
-            assert "test.csv" in string_repr
+        # Verify
+        assert "ImportPlan" in string_repr
+        assert "ImportPlanTestModel" in string_repr
+        assert "test.csv" in string_repr
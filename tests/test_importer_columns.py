@@ -21,16 +21,6 @@ from .test_utils import DatabaseMockingTestMixin
 class TestImporterColumnsValidation(DatabaseMockingTestMixin):
     """Test Columns validation within Importer classes."""
 
-    def setUp(self):
-        """Clear the registry before each test."""
-        if hasattr(Importer, "_registry"):
-            Importer._registry.clear()
-
-    def tearDown(self):
-        """Clean up after each test."""
-        if hasattr(Importer, "_registry"):
-            Importer._registry.clear()
-
     def test_columns_valid_foreign_key_reference(self):
         """Test that valid foreign key columns are accepted."""
 
@@ -230,16 +220,6 @@ class TestImporterColumnsValidation(DatabaseMockingTestMixin):
 class TestImporterColumnsRegistryLookup(DatabaseMockingTestMixin):
     """Test Columns validation with registry lookup functionality."""
 
-    def setUp(self):
-        """Clear the registry before each test."""
-        if hasattr(Importer, "_registry"):
-            Importer._registry.clear()
-
-    def tearDown(self):
-        """Clean up after each test."""
-        if hasattr(Importer, "_registry"):
-            Importer._registry.clear()
-
     def test_columns_finds_referenced_model_importers(self):
         """Test that Columns validation finds referenced model importers."""
 
@@ -18,16 +18,6 @@ from .test_utils import DatabaseMockingTestMixin
 class TestImporterMetaclassRegistry(DatabaseMockingTestMixin):
     """Test the ImporterMeta metaclass and registry functionality."""
 
-    def setUp(self):
-        """Clear the registry before each test."""
-        if hasattr(Importer, "_registry"):
-            Importer._registry.clear()
-
-    def tearDown(self):
-        """Clean up after each test."""
-        if hasattr(Importer, "_registry"):
-            Importer._registry.clear()
-
     def test_importer_model_registration_valid(self):
         """Test that Importer classes register their models correctly."""
 
@@ -126,16 +116,6 @@ class TestImporterMetaclassRegistry(DatabaseMockingTestMixin):
 class TestImporterFileNaming(DatabaseMockingTestMixin):
     """Test file naming functionality for Importer classes."""
 
-    def setUp(self):
-        """Clear the registry before each test."""
-        if hasattr(Importer, "_registry"):
-            Importer._registry.clear()
-
-    def tearDown(self):
-        """Clean up after each test."""
-        if hasattr(Importer, "_registry"):
-            Importer._registry.clear()
-
     def test_get_file_name_generates_table_name(self):
         """Test that get_file_name returns the correct table name."""
 
@@ -200,16 +180,6 @@ class TestImporterFileNaming(DatabaseMockingTestMixin):
 class TestImporterRegistryLookup(DatabaseMockingTestMixin):
     """Test registry lookup functionality."""
 
-    def setUp(self):
-        """Clear the registry before each test."""
-        if hasattr(Importer, "_registry"):
-            Importer._registry.clear()
-
-    def tearDown(self):
-        """Clean up after each test."""
-        if hasattr(Importer, "_registry"):
-            Importer._registry.clear()
-
     def test_registry_cleanup_between_tests(self):
         """Test that registry is properly cleared between tests."""
         # Registry should be empty at start of test
@@ -5,6 +5,7 @@ PostgresBulkLoader handles high-performance bulk loading of CSV data
 into PostgreSQL using COPY operations with staging tables.
 """
 
+import io
 from pathlib import Path
 from unittest.mock import Mock, patch
 
@@ -13,7 +14,20 @@ from django.db import models
 
 from django_gyro.importing import ImportContext, PostgresBulkLoader
 
-from .test_utils import clear_django_gyro_registries
+from .test_utils import build_csv, clear_django_gyro_registries, mock_pg_connection, write_csv_files
+
+# CSV bodies shared by several tests; built once instead of per test
+PEOPLE_CSV = build_csv(
+    ["name", "email"],
+    [{"name": "John", "email": "john@example.com"}, {"name": "Jane", "email": "jane@example.com"}],
+)
+SHOP_CSV = build_csv(
+    ["id", "name", "tenant_id"],
+    [{"id": 1, "name": "Shop1", "tenant_id": 100}, {"id": 2, "name": "Shop2", "tenant_id": 200}],
+)
+LARGE_CSV = build_csv(["name", "value"], ({"name": f"Row{i}", "value": i} for i in range(1000)))
+SINGLE_NAME_CSV = build_csv(["name"], [{"name": "John"}])
+SINGLE_NAME_CSV_TEMPLATE = "name\n{name}\n"
 
 
 class TestPostgresBulkLoader:
@@ -65,26 +79,19 @@ class TestPostgresBulkLoader:
         loader = PostgresBulkLoader()
         mock_cursor = Mock()
 
-        import tempfile
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
-            f.write("name,email\n")
-            f.write("John,john@example.com\n")
-            f.write("Jane,jane@example.com\n")
-            csv_path = Path(f.name)
+        csv_path = io.StringIO(PEOPLE_CSV)
 
-        try:
-            # Exercise
-            loader._copy_csv_to_staging(mock_cursor, csv_path, TestModel)
+        # Exercise
+        loader._copy_csv_to_staging(mock_cursor, csv_path, TestModel)
 
-            # Verify
-            mock_cursor.copy_expert.assert_called_once()
-            call_args = mock_cursor.copy_expert.call_args
-            copy_sql = call_args[0][0]
-            assert 'COPY "import_staging_test_model" ("name", "email") FROM STDIN' in copy_sql
-            assert "WITH CSV HEADER" in copy_sql
-        finally:
-            csv_path.unlink()
+        # Verify
+        mock_cursor.copy_expert.assert_called_once()
+        call_args = mock_cursor.copy_expert.call_args
+        copy_sql = call_args[0][0]
+        assert 'COPY "import_staging_test_model" ("name", "email") FROM STDIN' in copy_sql
+        assert "WITH CSV HEADER" in copy_sql
+        # The stream is rewound so COPY ... HEADER still sees the header row
+        assert call_args[0][1].read().startswith("name,email\n")
 
     def test_applies_foreign_key_remapping_efficiently(self):
         """PostgresBulkLoader applies FK remapping using CASE statements."""
@@ -140,6 +147,23 @@ class TestPostgresBulkLoader:
         # Verify - no SQL should be executed
         mock_cursor.execute.assert_not_called()
 
+    def test_skips_identity_pairs_in_id_mapping(self):
+        """PostgresBulkLoader only rewrites IDs whose mapping actually changes them."""
+        # Setup
+        loader = PostgresBulkLoader()
+        mock_cursor = Mock()
+
+        # Exercise
+        loader._apply_fk_remapping(mock_cursor, "import_staging_shop", "tenant_id", {1: 1, 2: 2})
+        loader._apply_fk_remapping(mock_cursor, "import_staging_shop", "tenant_id", {1: 1, 2: 20})
+
+        # Verify - the all-identity mapping runs no SQL, the mixed one updates only ID 2
+        mock_cursor.execute.assert_called_once()
+        sql = mock_cursor.execute.call_args[0][0]
+        assert 'WHEN "tenant_id" = 2 THEN 20' in sql
+        assert 'WHEN "tenant_id" = 1' not in sql
+        assert 'WHERE "tenant_id" IN (2)' in sql
+
     def test_inserts_from_staging_to_target_table(self):
         """PostgresBulkLoader inserts data from staging to target table."""
 
@@ -202,33 +226,21 @@ class TestPostgresBulkLoader:
 
         loader = PostgresBulkLoader()
 
-        import tempfile
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
-            f.write("name,email\n")
-            f.write("John,john@example.com\n")
-            f.write("Jane,jane@example.com\n")
-            csv_path = Path(f.name)
+        csv_path = io.StringIO(PEOPLE_CSV)
 
         # Mock database connection
-        mock_connection = Mock()
-        mock_cursor = Mock()
-        mock_cursor.__enter__ = Mock(return_value=mock_cursor)
-        mock_cursor.__exit__ = Mock(return_value=None)
+        mock_connection = mock_pg_connection()
+        mock_cursor = mock_connection.cursor.return_value
         mock_cursor.rowcount = 2  # Mock the rowcount for test data
-        mock_connection.cursor.return_value = mock_cursor
 
-        try:
-            # Exercise
-            result = loader.load_csv_with_copy(model=TestModel, csv_path=csv_path, connection=mock_connection)
+        # Exercise
+        result = loader.load_csv_with_copy(model=TestModel, csv_path=csv_path, connection=mock_connection)
 
-            # Verify workflow steps
-            assert mock_cursor.execute.call_count >= 3  # Create, Insert, etc.
-            assert mock_cursor.copy_expert.call_count == 1  # COPY operation
-            assert "rows_loaded" in result
-            assert "staging_table" in result
-        finally:
-            csv_path.unlink()
+        # Verify workflow steps
+        assert mock_cursor.execute.call_count >= 3  # Create, Insert, etc.
+        assert mock_cursor.copy_expert.call_count == 1  # COPY operation
+        assert "rows_loaded" in result
+        assert "staging_table" in result
 
     def test_applies_id_remapping_during_load(self):
         """PostgresBulkLoader applies ID remapping during load process."""
@@ -251,21 +263,12 @@ class TestPostgresBulkLoader:
 
         loader = PostgresBulkLoader()
 
-        import tempfile
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
-            f.write("id,name,tenant_id\n")
-            f.write("1,Shop1,100\n")
-            f.write("2,Shop2,200\n")
-            csv_path = Path(f.name)
+        csv_path = io.StringIO(SHOP_CSV)
 
         # Mock database connection
-        mock_connection = Mock()
-        mock_cursor = Mock()
-        mock_cursor.__enter__ = Mock(return_value=mock_cursor)
-        mock_cursor.__exit__ = Mock(return_value=None)
+        mock_connection = mock_pg_connection()
+        mock_cursor = mock_connection.cursor.return_value
         mock_cursor.rowcount = 2  # Mock the rowcount for test data
-        mock_connection.cursor.return_value = mock_cursor
 
         # ID mappings
         id_mappings = {
@@ -273,18 +276,13 @@ class TestPostgresBulkLoader:
             "test_postgres_bulk_loader.Tenant": {100: 1000, 200: 2000},
         }
 
-        try:
-            # Exercise
-            loader.load_csv_with_copy(
-                model=Shop, csv_path=csv_path, connection=mock_connection, id_mappings=id_mappings
-            )
+        # Exercise
+        loader.load_csv_with_copy(model=Shop, csv_path=csv_path, connection=mock_connection, id_mappings=id_mappings)
 
-            # Verify remapping was applied
-            executed_sql = [call[0][0] for call in mock_cursor.execute.call_args_list]
-            remapping_sql = [sql for sql in executed_sql if "CASE" in sql]
-            assert len(remapping_sql) >= 1  # At least one remapping operation
-        finally:
-            csv_path.unlink()
+        # Verify remapping was applied
+        executed_sql = [call[0][0] for call in mock_cursor.execute.call_args_list]
+        remapping_sql = [sql for sql in executed_sql if "CASE" in sql]
+        assert len(remapping_sql) >= 1  # At least one remapping operation
 
     def test_handles_large_csv_files_efficiently(self):
         """PostgresBulkLoader handles large CSV files without memory issues."""
@@ -300,33 +298,20 @@ class TestPostgresBulkLoader:
 
         loader = PostgresBulkLoader()
 
-        # Create large CSV file
-        import tempfile
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
-            f.write("name,value\n")
-            # Write 1000 rows
-            for i in range(1000):
-                f.write(f"Row{i},{i}\n")
-            csv_path = Path(f.name)
+        # Create large CSV stream with 1000 rows
+        csv_path = io.StringIO(LARGE_CSV)
 
         # Mock database connection
-        mock_connection = Mock()
-        mock_cursor = Mock()
-        mock_cursor.__enter__ = Mock(return_value=mock_cursor)
-        mock_cursor.__exit__ = Mock(return_value=None)
+        mock_connection = mock_pg_connection()
+        mock_cursor = mock_connection.cursor.return_value
         mock_cursor.rowcount = 1000  # Mock the rowcount for large file
-        mock_connection.cursor.return_value = mock_cursor
 
-        try:
-            # Exercise
-            result = loader.load_csv_with_copy(model=TestModel, csv_path=csv_path, connection=mock_connection)
+        # Exercise
+        result = loader.load_csv_with_copy(model=TestModel, csv_path=csv_path, connection=mock_connection)
 
-            # Verify
-            assert result["rows_loaded"] > 0
-            assert "staging_table" in result
-        finally:
-            csv_path.unlink()
+        # Verify
+        assert result["rows_loaded"] > 0
+        assert "staging_table" in result
 
     def test_provides_detailed_error_information(self):
         """PostgresBulkLoader provides detailed error information on failure."""
@@ -342,29 +327,18 @@ class TestPostgresBulkLoader:
         loader = PostgresBulkLoader()
 
         # Mock database connection that fails
-        mock_connection = Mock()
-        mock_cursor = Mock()
-        mock_cursor.__enter__ = Mock(return_value=mock_cursor)
-        mock_cursor.__exit__ = Mock(return_value=None)
+        mock_connection = mock_pg_connection()
+        mock_cursor = mock_connection.cursor.return_value
         mock_cursor.execute.side_effect = Exception("Database error")
-        mock_connection.cursor.return_value = mock_cursor
-
-        import tempfile
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
-            f.write("name\n")
-            f.write("John\n")
-            csv_path = Path(f.name)
+        csv_path = io.StringIO(SINGLE_NAME_CSV)
 
-        try:
-            # Exercise & Verify
-            with pytest.raises(Exception) as exc_info:
-                loader.load_csv_with_copy(model=TestModel, csv_path=csv_path, connection=mock_connection)
+        # Exercise & Verify
+        with pytest.raises(Exception) as exc_info:
+            loader.load_csv_with_copy(model=TestModel, csv_path=csv_path, connection=mock_connection)
 
-            # Should provide context about the failure
-            assert "Database error" in str(exc_info.value)
-        finally:
-            csv_path.unlink()
+        # Should provide context about the failure
+        assert "Database error" in str(exc_info.value)
 
     def test_validates_csv_file_exists(self):
         """PostgresBulkLoader validates CSV file existence."""
@@ -397,32 +371,19 @@ class TestPostgresBulkLoader:
 
         loader = PostgresBulkLoader()
 
-        import tempfile
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
-            f.write("name\n")
-            f.write("John\n")
-            csv_path = Path(f.name)
+        csv_path = io.StringIO(SINGLE_NAME_CSV)
 
         # Mock database connection
-        mock_connection = Mock()
-        mock_cursor = Mock()
-        mock_cursor.__enter__ = Mock(return_value=mock_cursor)
-        mock_cursor.__exit__ = Mock(return_value=None)
-        mock_connection.cursor.return_value = mock_cursor
-
-        try:
-            # Exercise
-            loader.load_csv_with_copy(
-                model=TestModel, csv_path=csv_path, connection=mock_connection, cleanup_staging=True
-            )
+        mock_connection = mock_pg_connection()
+        mock_cursor = mock_connection.cursor.return_value
 
-            # Verify cleanup
-            executed_sql = [call[0][0] for call in mock_cursor.execute.call_args_list]
-            cleanup_sql = [sql for sql in executed_sql if "DROP TABLE" in sql]
-            assert len(cleanup_sql) >= 1  # At least one DROP TABLE
-        finally:
-            csv_path.unlink()
+        # Exercise
+        loader.load_csv_with_copy(model=TestModel, csv_path=csv_path, connection=mock_connection, cleanup_staging=True)
+
+        # Verify cleanup
+        executed_sql = [call[0][0] for call in mock_cursor.execute.call_args_list]
+        cleanup_sql = [sql for sql in executed_sql if "DROP TABLE" in sql]
+        assert len(cleanup_sql) >= 1  # At least one DROP TABLE
 
     def test_supports_batch_processing(self):
         """PostgresBulkLoader supports batch processing of multiple CSV files."""
@@ -437,39 +398,24 @@ class TestPostgresBulkLoader:
 
         loader = PostgresBulkLoader()
 
-        # Create multiple CSV files
-        import tempfile
-
-        csv_files = []
-        for i in range(3):
-            with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
-                f.write("name\n")
-                f.write(f"Name{i}\n")
-                csv_files.append(Path(f.name))
+        # Create multiple CSV streams
+        csv_files = [io.StringIO(SINGLE_NAME_CSV_TEMPLATE.format_map({"name": f"Name{i}"})) for i in range(3)]
 
         # Mock database connection
-        mock_connection = Mock()
-        mock_cursor = Mock()
-        mock_cursor.__enter__ = Mock(return_value=mock_cursor)
-        mock_cursor.__exit__ = Mock(return_value=None)
-        mock_connection.cursor.return_value = mock_cursor
+        mock_connection = mock_pg_connection()
 
-        try:
-            # Exercise
-            results = loader.load_csv_batch(model=TestModel, csv_paths=csv_files, connection=mock_connection)
+        # Exercise
+        results = loader.load_csv_batch(model=TestModel, csv_paths=csv_files, connection=mock_connection)
 
-            # Verify
-            assert len(results) == 3
-            assert all("rows_loaded" in result for result in results)
-        finally:
-            for csv_file in csv_files:
-                csv_file.unlink()
+        # Verify
+        assert len(results) == 3
+        assert all("rows_loaded" in result for result in results)
 
 
 class TestPostgresBulkLoaderIntegration:
     """Integration tests for PostgresBulkLoader with other components."""
 
-    def test_integrates_with_import_context(self):
+    def test_integrates_with_import_context(self, temp_dir):
         """PostgresBulkLoader integrates with ImportContext for configuration."""
 
         # Setup
@@ -480,35 +426,25 @@ class TestPostgresBulkLoaderIntegration:
                 app_label = "test_postgres_bulk_loader"
                 db_table = "test_model"
 
-        import tempfile
+        csv_path = write_csv_files(temp_dir, {"test.csv": SINGLE_NAME_CSV})["test.csv"]
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            csv_path = Path(temp_dir) / "test.csv"
-            with open(csv_path, "w") as f:
-                f.write("name\n")
-                f.write("John\n")
+        context = ImportContext(source_directory=Path(temp_dir), use_copy=True, batch_size=1000)
 
-            context = ImportContext(source_directory=Path(temp_dir), use_copy=True, batch_size=1000)
-
-            loader = PostgresBulkLoader()
+        loader = PostgresBulkLoader()
 
-            # Mock database connection
-            mock_connection = Mock()
-            mock_cursor = Mock()
-            mock_cursor.__enter__ = Mock(return_value=mock_cursor)
-            mock_cursor.__exit__ = Mock(return_value=None)
-            mock_connection.cursor.return_value = mock_cursor
+        # Mock database connection
+        mock_connection = mock_pg_connection()
 
-            # Exercise
-            result = loader.load_csv_with_context(
-                model=TestModel, csv_path=csv_path, context=context, connection=mock_connection
-            )
+        # Exercise
+        result = loader.load_csv_with_context(
+            model=TestModel, csv_path=csv_path, context=context, connection=mock_connection
+        )
 
-            # Verify
-            assert "rows_loaded" in result
-            assert result["used_copy"] is True
+        # Verify
+        assert "rows_loaded" in result
+        assert result["used_copy"] is True
 
-    def test_respects_import_context_configuration(self):
+    def test_respects_import_context_configuration(self, temp_dir):
         """PostgresBulkLoader respects ImportContext configuration."""
 
         # Setup
@@ -519,35 +455,29 @@ class TestPostgresBulkLoaderIntegration:
                 app_label = "test_postgres_bulk_loader"
                 db_table = "test_model"
 
-        import tempfile
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            csv_path = Path(temp_dir) / "test.csv"
-            with open(csv_path, "w") as f:
-                f.write("name\n")
-                f.write("John\n")
+        csv_path = write_csv_files(temp_dir, {"test.csv": SINGLE_NAME_CSV})["test.csv"]
 
-            context = ImportContext(
-                source_directory=Path(temp_dir),
-                use_copy=False,  # Disable COPY, use INSERT
-                batch_size=10,
-            )
+        context = ImportContext(
+            source_directory=Path(temp_dir),
+            use_copy=False,  # Disable COPY, use INSERT
+            batch_size=10,
+        )
 
-            loader = PostgresBulkLoader()
+        loader = PostgresBulkLoader()
 
-            # Exercise
-            with patch.object(loader, "load_csv_with_insert") as mock_insert:
-                mock_insert.return_value = {"rows_loaded": 1, "used_copy": False}
+        # Exercise
+        with patch.object(loader, "load_csv_with_insert") as mock_insert:
+            mock_insert.return_value = {"rows_loaded": 1, "used_copy": False}
 
-                result = loader.load_csv_with_context(
-                    model=TestModel, csv_path=csv_path, context=context, connection=Mock()
-                )
+            result = loader.load_csv_with_context(
+                model=TestModel, csv_path=csv_path, context=context, connection=Mock()
+            )
 
-                # Verify fallback to INSERT was used
-                mock_insert.assert_called_once()
-                assert result["used_copy"] is False
+            # Verify fallback to INSERT was used
+            mock_insert.assert_called_once()
+            assert result["used_copy"] is False
 
-    def test_quotes_reserved_keywords_in_sql_statements(self):
+    def test_quotes_reserved_keywords_in_sql_statements(self, temp_dir):
         """PostgresBulkLoader properly quotes PostgreSQL reserved keywords in SQL statements."""
 
         # Setup - Create a model with reserved keywords as column names
@@ -572,22 +502,16 @@ class TestPostgresBulkLoaderIntegration:
         assert 'LIKE "reserved_keywords_test"' in create_sql
 
         # Test 2: COPY statement quotes column names
-        import tempfile
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            csv_path = Path(temp_dir) / "test.csv"
-            with open(csv_path, "w") as f:
-                f.write("user,order,table\n")
-                f.write("john,1,users\n")
+        csv_path = write_csv_files(temp_dir, {"test.csv": "user,order,table\njohn,1,users\n"})["test.csv"]
 
-            # Mock the copy_expert method
-            mock_cursor.copy_expert = Mock()
+        # Mock the copy_expert method
+        mock_cursor.copy_expert = Mock()
 
-            loader._copy_csv_to_staging(mock_cursor, csv_path, TestModel)
+        loader._copy_csv_to_staging(mock_cursor, csv_path, TestModel)
 
-            copy_sql = mock_cursor.copy_expert.call_args[0][0]
-            assert 'COPY "import_staging_reserved_keywords_test"' in copy_sql
-            assert '("user", "order", "table")' in copy_sql
+        copy_sql = mock_cursor.copy_expert.call_args[0][0]
+        assert 'COPY "import_staging_reserved_keywords_test"' in copy_sql
+        assert '("user", "order", "table")' in copy_sql
 
         # Test 3: UPDATE statement quotes column names (for ID remapping)
         mapping = {1: 10, 2: 20}
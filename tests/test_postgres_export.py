@@ -12,30 +12,96 @@ from unittest.mock import Mock, patch
 
 from django.db import models
 
-from django_gyro import Importer
-
 from .test_utils import DatabaseMockingTestMixin
 
+APP_LABEL = "test_postgres_export"
 
-class TestPostgresExportSQLGeneration(DatabaseMockingTestMixin):
-    """Test PostgreSQL export SQL generation functionality."""
 
-    def test_converts_django_queryset_to_sql(self):
-        """Test converting Django QuerySet to proper SQL."""
+def _meta(db_table):
+    """Build the Meta class shared by this module's models."""
+    return type("Meta", (), {"app_label": APP_LABEL, "db_table": db_table})
+
+
+# Models are defined once at import time instead of inside every test, so
+# Django's model metaclass and app registry bookkeeping run once per session.
+# PostgresExporter never looks up importers, so none are registered here.
+class PgSqlModel1(models.Model):
+    name = models.CharField(max_length=100)
+    active = models.BooleanField(default=True)
+
+    Meta = _meta("pg_sql_model1")
+
+
+class PgSqlModel2(models.Model):
+    name = models.CharField(max_length=100)
+    age = models.IntegerField()
+    active = models.BooleanField(default=True)
+
+    Meta = _meta("pg_sql_model2")
+
+
+class PgSqlModel3(models.Model):
+    name = models.CharField(max_length=100)
+
+    Meta = _meta("pg_sql_model3")
+
+
+class PgSqlModel4(models.Model):
+    name = models.CharField(max_length=100)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    Meta = _meta("pg_sql_model4")
+
+
+class PgCsvModel1(models.Model):
+    id = models.AutoField(primary_key=True)
+    name = models.CharField(max_length=100)
+    email = models.EmailField()
+    active = models.BooleanField(default=True)
+
+    Meta = _meta("pg_csv_model1")
+
+
+class PgCsvModel2(models.Model):
+    name = models.CharField(max_length=100)
+    description = models.TextField(blank=True)
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    Meta = _meta("pg_csv_model2")
+
+
+class PgFkCategory(models.Model):
+    name = models.CharField(max_length=100)
+
+    Meta = _meta("pg_fk_category")
+
+
+class PgFkSupplier(models.Model):
+    name = models.CharField(max_length=100)
 
-        class PgSqlModel1(models.Model):
-            name = models.CharField(max_length=100)
-            active = models.BooleanField(default=True)
+    Meta = _meta("pg_fk_supplier")
 
-            class Meta:
-                app_label = "test_postgres_export"
-                db_table = "pg_sql_model1"
 
-        class PgSqlImporter1(Importer):
-            model = PgSqlModel1
+class PgFkProduct(models.Model):
+    name = models.CharField(max_length=100)
+    category = models.ForeignKey(PgFkCategory, on_delete=models.CASCADE)
+    supplier = models.ForeignKey(PgFkSupplier, on_delete=models.CASCADE)
 
-            class Columns:
-                pass
+    Meta = _meta("pg_fk_product")
+
+
+class PgProgressModel(models.Model):
+    name = models.CharField(max_length=100)
+
+    Meta = _meta("pg_progress_model")
+
+
+class TestPostgresExportSQLGeneration(DatabaseMockingTestMixin):
+    """Test PostgreSQL export SQL generation functionality."""
+
+    def test_converts_django_queryset_to_sql(self):
+        """Test converting Django QuerySet to proper SQL."""
 
         # Create a QuerySet
         queryset = PgSqlModel1.objects.filter(active=True)
@@ -57,21 +123,6 @@ class TestPostgresExportSQLGeneration(DatabaseMockingTestMixin):
     def test_handles_complex_where_clauses(self):
         """Test SQL generation with complex WHERE conditions."""
 
-        class PgSqlModel2(models.Model):
-            name = models.CharField(max_length=100)
-            age = models.IntegerField()
-            active = models.BooleanField(default=True)
-
-            class Meta:
-                app_label = "test_postgres_export"
-                db_table = "pg_sql_model2"
-
-        class PgSqlImporter2(Importer):
-            model = PgSqlModel2
-
-            class Columns:
-                pass
-
         # Create complex QuerySet
         queryset = PgSqlModel2.objects.filter(active=True, age__gte=18, name__icontains="test").exclude(age__gt=65)
 
@@ -90,19 +141,6 @@ class TestPostgresExportSQLGeneration(DatabaseMockingTestMixin):
     def test_generates_proper_copy_statements(self):
         """Test generation of PostgreSQL COPY statements."""
 
-        class PgSqlModel3(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_postgres_export"
-                db_table = "pg_sql_model3"
-
-        class PgSqlImporter3(Importer):
-            model = PgSqlModel3
-
-            class Columns:
-                pass
-
         queryset = PgSqlModel3.objects.all()
 
         from django_gyro.exporters import PostgresExporter
@@ -121,20 +159,6 @@ class TestPostgresExportSQLGeneration(DatabaseMockingTestMixin):
     def test_handles_queryset_with_ordering(self):
         """Test SQL generation preserves QuerySet ordering."""
 
-        class PgSqlModel4(models.Model):
-            name = models.CharField(max_length=100)
-            created_at = models.DateTimeField(auto_now_add=True)
-
-            class Meta:
-                app_label = "test_postgres_export"
-                db_table = "pg_sql_model4"
-
-        class PgSqlImporter4(Importer):
-            model = PgSqlModel4
-
-            class Columns:
-                pass
-
         # Create ordered QuerySet
         queryset = PgSqlModel4.objects.order_by("-created_at", "name")
 
@@ -156,22 +180,6 @@ class TestPostgresExportCSVGeneration(DatabaseMockingTestMixin):
     def test_includes_proper_csv_headers(self):
         """Test CSV export includes correct headers."""
 
-        class PgCsvModel1(models.Model):
-            id = models.AutoField(primary_key=True)
-            name = models.CharField(max_length=100)
-            email = models.EmailField()
-            active = models.BooleanField(default=True)
-
-            class Meta:
-                app_label = "test_postgres_export"
-                db_table = "pg_csv_model1"
-
-        class PgCsvImporter1(Importer):
-            model = PgCsvModel1
-
-            class Columns:
-                pass
-
         from django_gyro.exporters import PostgresExporter
 
         exporter = PostgresExporter("postgresql://test")
@@ -186,22 +194,6 @@ class TestPostgresExportCSVGeneration(DatabaseMockingTestMixin):
     def test_exports_all_model_fields(self):
         """Test that all model fields are included in export."""
 
-        class PgCsvModel2(models.Model):
-            name = models.CharField(max_length=100)
-            description = models.TextField(blank=True)
-            price = models.DecimalField(max_digits=10, decimal_places=2)
-            created_at = models.DateTimeField(auto_now_add=True)
-
-            class Meta:
-                app_label = "test_postgres_export"
-                db_table = "pg_csv_model2"
-
-        class PgCsvImporter2(Importer):
-            model = PgCsvModel2
-
-            class Columns:
-                pass
-
         from django_gyro.exporters import PostgresExporter
 
         exporter = PostgresExporter("postgresql://test")
@@ -217,20 +209,6 @@ class TestPostgresExportCSVGeneration(DatabaseMockingTestMixin):
     def test_handles_null_values_correctly(self):
         """Test proper handling of NULL values in CSV export."""
 
-        class PgCsvModel3(models.Model):
-            name = models.CharField(max_length=100)
-            optional_field = models.CharField(max_length=100, null=True, blank=True)
-
-            class Meta:
-                app_label = "test_postgres_export"
-                db_table = "pg_csv_model3"
-
-        class PgCsvImporter3(Importer):
-            model = PgCsvModel3
-
-            class Columns:
-                pass
-
         from django_gyro.exporters import PostgresExporter
 
         exporter = PostgresExporter("postgresql://test")
@@ -247,20 +225,6 @@ class TestPostgresExportCSVGeneration(DatabaseMockingTestMixin):
     def test_escapes_csv_special_characters(self):
         """Test proper escaping of CSV special characters."""
 
-        class PgCsvModel4(models.Model):
-            name = models.CharField(max_length=100)
-            description = models.TextField()
-
-            class Meta:
-                app_label = "test_postgres_export"
-                db_table = "pg_csv_model4"
-
-        class PgCsvImporter4(Importer):
-            model = PgCsvModel4
-
-            class Columns:
-                pass
-
         from django_gyro.exporters import PostgresExporter
 
         exporter = PostgresExporter("postgresql://test")
@@ -284,39 +248,12 @@ class TestPostgresExportForeignKeyHandling(DatabaseMockingTestMixin):
     def test_exports_foreign_key_ids_correctly(self):
         """Test that foreign key IDs are exported correctly."""
 
-        class PgFkCategory1(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_postgres_export"
-                db_table = "pg_fk_category1"
-
-        class PgFkProduct1(models.Model):
-            name = models.CharField(max_length=100)
-            category = models.ForeignKey(PgFkCategory1, on_delete=models.CASCADE)
-
-            class Meta:
-                app_label = "test_postgres_export"
-                db_table = "pg_fk_product1"
-
-        class PgFkCategoryImporter1(Importer):
-            model = PgFkCategory1
-
-            class Columns:
-                pass
-
-        class PgFkProductImporter1(Importer):
-            model = PgFkProduct1
-
-            class Columns:
-                category = PgFkCategory1
-
         from django_gyro.exporters import PostgresExporter
 
         exporter = PostgresExporter("postgresql://test")
 
         # Get field mapping for Product
-        field_mapping = exporter.get_field_mapping(PgFkProduct1)
+        field_mapping = exporter.get_field_mapping(PgFkProduct)
 
         # Should include category_id field
         assert "category_id" in field_mapping or "category" in field_mapping
@@ -324,33 +261,6 @@ class TestPostgresExportForeignKeyHandling(DatabaseMockingTestMixin):
     def test_handles_null_foreign_keys(self):
         """Test handling of NULL foreign key relationships."""
 
-        class PgFkCategory2(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_postgres_export"
-                db_table = "pg_fk_category2"
-
-        class PgFkProduct2(models.Model):
-            name = models.CharField(max_length=100)
-            category = models.ForeignKey(PgFkCategory2, on_delete=models.CASCADE, null=True)
-
-            class Meta:
-                app_label = "test_postgres_export"
-                db_table = "pg_fk_product2"
-
-        class PgFkCategoryImporter2(Importer):
-            model = PgFkCategory2
-
-            class Columns:
-                pass
-
-        class PgFkProductImporter2(Importer):
-            model = PgFkProduct2
-
-            class Columns:
-                category = PgFkCategory2
-
         from django_gyro.exporters import PostgresExporter
 
         exporter = PostgresExporter("postgresql://test")
@@ -366,53 +276,11 @@ class TestPostgresExportForeignKeyHandling(DatabaseMockingTestMixin):
     def test_handles_multiple_foreign_key_relationships(self):
         """Test handling of multiple FK relationships in same model."""
 
-        class PgFkCategory3(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_postgres_export"
-                db_table = "pg_fk_category3"
-
-        class PgFkSupplier3(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_postgres_export"
-                db_table = "pg_fk_supplier3"
-
-        class PgFkProduct3(models.Model):
-            name = models.CharField(max_length=100)
-            category = models.ForeignKey(PgFkCategory3, on_delete=models.CASCADE)
-            supplier = models.ForeignKey(PgFkSupplier3, on_delete=models.CASCADE)
-
-            class Meta:
-                app_label = "test_postgres_export"
-                db_table = "pg_fk_product3"
-
-        class PgFkCategoryImporter3(Importer):
-            model = PgFkCategory3
-
-            class Columns:
-                pass
-
-        class PgFkSupplierImporter3(Importer):
-            model = PgFkSupplier3
-
-            class Columns:
-                pass
-
-        class PgFkProductImporter3(Importer):
-            model = PgFkProduct3
-
-            class Columns:
-                category = PgFkCategory3
-                supplier = PgFkSupplier3
-
         from django_gyro.exporters import PostgresExporter
 
         exporter = PostgresExporter("postgresql://test")
 
-        field_mapping = exporter.get_field_mapping(PgFkProduct3)
+        field_mapping = exporter.get_field_mapping(PgFkProduct)
 
         # Should handle multiple FK fields
         fk_fields = [field for field in field_mapping if field.endswith("_id")]
@@ -425,19 +293,6 @@ class TestPostgresExportProgressTracking(DatabaseMockingTestMixin):
     def test_shows_progress_for_large_exports(self):
         """Test progress tracking for large dataset exports."""
 
-        class PgProgressModel1(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_postgres_export"
-                db_table = "pg_progress_model1"
-
-        class PgProgressImporter1(Importer):
-            model = PgProgressModel1
-
-            class Columns:
-                pass
-
         from django_gyro.exporters import PostgresExporter
 
         exporter = PostgresExporter("postgresql://test")
@@ -446,11 +301,11 @@ class TestPostgresExportProgressTracking(DatabaseMockingTestMixin):
         progress_callback = Mock()
 
         # Test export with progress tracking
-        with patch("django_gyro.exporters.PostgresExporter.execute_export") as mock_export:
+        with patch.object(PostgresExporter, "execute_export") as mock_export:
             mock_export.return_value = {"rows_exported": 10000}
 
             result = exporter.export_with_progress(
-                PgProgressModel1.objects.all(), "test.csv", progress_callback=progress_callback
+                PgProgressModel.objects.all(), "test.csv", progress_callback=progress_callback
             )
 
             # Should call progress callback
@@ -460,19 +315,6 @@ class TestPostgresExportProgressTracking(DatabaseMockingTestMixin):
     def test_updates_progress_bars(self):
         """Test progress bar updates during export."""
 
-        class PgProgressModel2(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_postgres_export"
-                db_table = "pg_progress_model2"
-
-        class PgProgressImporter2(Importer):
-            model = PgProgressModel2
-
-            class Columns:
-                pass
-
         from django_gyro.exporters import PostgresExporter
 
         exporter = PostgresExporter("postgresql://test")
@@ -490,19 +332,6 @@ class TestPostgresExportProgressTracking(DatabaseMockingTestMixin):
     def test_completion_notifications(self):
         """Test completion notifications for exports."""
 
-        class PgProgressModel3(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_postgres_export"
-                db_table = "pg_progress_model3"
-
-        class PgProgressImporter3(Importer):
-            model = PgProgressModel3
-
-            class Columns:
-                pass
-
         from django_gyro.exporters import PostgresExporter
 
         exporter = PostgresExporter("postgresql://test")
@@ -511,11 +340,11 @@ class TestPostgresExportProgressTracking(DatabaseMockingTestMixin):
         completion_callback = Mock()
 
         # Test export completion
-        with patch("django_gyro.exporters.PostgresExporter.execute_export") as mock_export:
+        with patch.object(PostgresExporter, "execute_export") as mock_export:
             mock_export.return_value = {"rows_exported": 1000, "file_size": 50000, "duration": 2.5}
 
             exporter.export_with_completion(
-                PgProgressModel3.objects.all(), "test.csv", completion_callback=completion_callback
+                PgProgressModel.objects.all(), "test.csv", completion_callback=completion_callback
             )
 
             # Should call completion callback with results
@@ -528,29 +357,16 @@ class TestPostgresExportProgressTracking(DatabaseMockingTestMixin):
     def test_handles_export_interruption(self):
         """Test handling of interrupted exports."""
 
-        class PgProgressModel4(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_postgres_export"
-                db_table = "pg_progress_model4"
-
-        class PgProgressImporter4(Importer):
-            model = PgProgressModel4
-
-            class Columns:
-                pass
-
         from django_gyro.exporters import PostgresExporter
 
         exporter = PostgresExporter("postgresql://test")
 
         # Mock export interruption
-        with patch("django_gyro.exporters.PostgresExporter.execute_export") as mock_export:
+        with patch.object(PostgresExporter, "execute_export") as mock_export:
             mock_export.side_effect = KeyboardInterrupt("Export interrupted")
 
             try:
-                exporter.export_with_progress(PgProgressModel4.objects.all(), "test.csv")
+                exporter.export_with_progress(PgProgressModel.objects.all(), "test.csv")
                 raise AssertionError("Expected KeyboardInterrupt")
             except KeyboardInterrupt:
                 pass  # Expected behavior
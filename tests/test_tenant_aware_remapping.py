@@ -9,6 +9,60 @@ from django.db import models
 
 from django_gyro.importing import TenantAwareRemappingStrategy
 
+APP_LABEL = "test_tenant_aware_remapping"
+
+
+class Tenant(models.Model):
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        app_label = APP_LABEL
+
+
+class Shop(models.Model):
+    tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE)
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        app_label = APP_LABEL
+
+
+class Customer(models.Model):
+    tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE)
+    shop = models.ForeignKey(Shop, on_delete=models.CASCADE)
+    email = models.CharField(max_length=100)
+
+    class Meta:
+        app_label = APP_LABEL
+
+
+class Category(models.Model):
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        app_label = APP_LABEL
+
+
+class UnrelatedModel(models.Model):
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        app_label = APP_LABEL
+
+
+class CustomTenant(models.Model):
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        app_label = APP_LABEL
+
+
+class Org(models.Model):
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        app_label = APP_LABEL
+
 
 class TestTenantAwareRemappingStrategy:
     """Tests for TenantAwareRemappingStrategy behavior."""
@@ -29,12 +83,6 @@ class TestTenantAwareRemappingStrategy:
         """TenantAwareRemappingStrategy requires tenant model and mappings."""
 
         # Setup
-        class Tenant(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_tenant_aware_remapping"
-
         tenant_mappings = {1060: 10, 2000: 11}
 
         # Exercise
@@ -49,12 +97,6 @@ class TestTenantAwareRemappingStrategy:
         """TenantAwareRemappingStrategy generates FK field name from model name."""
 
         # Setup
-        class CustomTenant(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_tenant_aware_remapping"
-
         strategy = TenantAwareRemappingStrategy(tenant_model=CustomTenant, tenant_mappings={100: 1})
 
         # Exercise & Verify
@@ -64,32 +106,6 @@ class TestTenantAwareRemappingStrategy:
         """TenantAwareRemappingStrategy generates mappings for all models."""
 
         # Setup
-        class Tenant(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_tenant_aware_remapping"
-
-        class Shop(models.Model):
-            tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE)
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_tenant_aware_remapping"
-
-        class Customer(models.Model):
-            tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE)
-            email = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_tenant_aware_remapping"
-
-        class UnrelatedModel(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_tenant_aware_remapping"
-
         strategy = TenantAwareRemappingStrategy(tenant_model=Tenant, tenant_mappings={1060: 10, 2000: 11})
 
         # Exercise
@@ -106,25 +122,6 @@ class TestTenantAwareRemappingStrategy:
         """TenantAwareRemappingStrategy identifies which models reference tenant."""
 
         # Setup
-        class Tenant(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_tenant_aware_remapping"
-
-        class Shop(models.Model):
-            tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE)
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_tenant_aware_remapping"
-
-        class Category(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_tenant_aware_remapping"
-
         strategy = TenantAwareRemappingStrategy(tenant_model=Tenant, tenant_mappings={1000: 1})
 
         # Exercise
@@ -141,12 +138,6 @@ class TestTenantAwareRemappingStrategy:
         """TenantAwareRemappingStrategy provides filters for tenant-scoped exports."""
 
         # Setup
-        class Tenant(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_tenant_aware_remapping"
-
         strategy = TenantAwareRemappingStrategy(tenant_model=Tenant, tenant_mappings={1000: 1})
 
         # Exercise
@@ -159,12 +150,6 @@ class TestTenantAwareRemappingStrategy:
         """TenantAwareRemappingStrategy handles different tenant field naming."""
 
         # Setup
-        class Org(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_tenant_aware_remapping"
-
         strategy = TenantAwareRemappingStrategy(tenant_model=Org, tenant_mappings={500: 5})
 
         # Exercise & Verify
@@ -173,60 +158,10 @@ class TestTenantAwareRemappingStrategy:
         filter_params = strategy.get_tenant_filter_for_export(tenant_id=500)
         assert filter_params == {"org_id": 500}
 
-    def test_integrates_with_other_remapping_strategies(self):
-        """TenantAwareRemappingStrategy can be combined with other strategies."""
-
-        # Setup
-        class Tenant(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_tenant_aware_remapping"
-
-        class Shop(models.Model):
-            tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE)
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_tenant_aware_remapping"
-
-        tenant_strategy = TenantAwareRemappingStrategy(tenant_model=Tenant, tenant_mappings={1060: 10})
-
-        # Exercise
-        base_mappings = tenant_strategy.apply_to_all_models([Tenant, Shop])
-
-        # You could combine with other strategies like:
-        # sequential_strategy = SequentialRemappingStrategy(Shop)
-        # combined_mappings = {**base_mappings, 'test_tenant_aware_remapping.Shop': sequential_mappings}
-
-        # Verify base tenant mapping is correct
-        assert base_mappings["test_tenant_aware_remapping.Tenant"] == {1060: 10}
-
     def test_handles_multiple_tenant_models(self):
         """TenantAwareRemappingStrategy can handle scenarios with multiple tenant types."""
 
         # Setup
-        class Tenant(models.Model):
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_tenant_aware_remapping"
-
-        class Shop(models.Model):
-            tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE)
-            name = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_tenant_aware_remapping"
-
-        class Customer(models.Model):
-            tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE)
-            shop = models.ForeignKey(Shop, on_delete=models.CASCADE)
-            email = models.CharField(max_length=100)
-
-            class Meta:
-                app_label = "test_tenant_aware_remapping"
-
         tenant_strategy = TenantAwareRemappingStrategy(tenant_model=Tenant, tenant_mappings={1060: 10})
 
         shop_strategy = TenantAwareRemappingStrategy(tenant_model=Shop, tenant_mappings={2000: 100, 2001: 101})
@@ -67,24 +67,91 @@ class TestMyFeature(DjangoGyroTestMixin, TestCase):
                 app_label = 'test_myfeature'  # Unique per test file
 """
 
-from unittest.mock import Mock, patch
-
+import csv
+import io
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import django.db
+import psycopg2.extensions
 from django.db.models.query import QuerySet
 
 
 def mock_db_operations():
-    """Create a mock for database operations to prevent geo_db_type errors."""
-    mock_ops = Mock()
-    mock_ops.geo_db_type = Mock(return_value="geometry")
-    mock_ops.max_name_length = Mock(return_value=63)  # Standard PostgreSQL limit
-    return mock_ops
+    """Create a stub for database operations to prevent geo_db_type errors."""
+    return SimpleNamespace(
+        geo_db_type=lambda *_args, **_kwargs: "geometry",
+        max_name_length=lambda: 63,  # Standard PostgreSQL limit
+    )
 
 
 def mock_db_connection():
-    """Create a mock database connection."""
-    mock_conn = Mock()
-    mock_conn.ops = mock_db_operations()
-    return mock_conn
+    """Create a stub database connection."""
+    return SimpleNamespace(ops=mock_db_operations())
+
+
+def mock_pg_connection():
+    """
+    Create a spec-limited stand-in for a psycopg2 connection.
+
+    connection.cursor() always returns the same cursor mock, which works as a
+    context manager. Limiting both mocks to the psycopg2 API keeps typos in
+    tests from silently passing and avoids building arbitrary child mocks.
+    """
+    cursor = MagicMock(spec=psycopg2.extensions.cursor)
+    cursor.__enter__.return_value = cursor
+    cursor.__exit__.return_value = None
+    connection = MagicMock(spec=psycopg2.extensions.connection)
+    connection.cursor.return_value = cursor
+    return connection
+
+
+def build_csv(fieldnames, rows):
+    """
+    Render rows as CSV text with csv.DictWriter.
+
+    Lines end in a bare newline, matching what PostgreSQL COPY emits.
+
+    Args:
+        fieldnames: Column names, written as the header row
+        rows: Iterable of dicts keyed by column name
+
+    Returns:
+        The CSV document as a string
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+def write_csv_files(directory, files):
+    """
+    Write small fixture files into directory in one pass.
+
+    Each file is written with a single os.write() call instead of going
+    through Python's buffered text layer.
+
+    Args:
+        directory: Directory to write into
+        files: Mapping of file name to text content
+
+    Returns:
+        Dictionary of written paths keyed by file name
+    """
+    paths = {}
+    for name, content in files.items():
+        path = Path(directory, name)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, content.encode("utf-8"))
+        finally:
+            os.close(fd)
+        paths[name] = path
+    return paths
 
 
 class MockQuerySet(QuerySet):
@@ -96,6 +163,21 @@ class MockQuerySet(QuerySet):
         self._result_cache = []
 
 
+def clear_importer_registry():
+    """
+    Clear only the Importer model-to-importer registry.
+
+    This is the one registry that defining importers in a test mutates, so it
+    is cheap enough to reset around every test. Pair it with a module-scoped
+    clear_django_gyro_registries() call to reset the dependency caches.
+    """
+    # Import here to avoid circular imports
+    from django_gyro import Importer
+
+    if hasattr(Importer, "_registry"):
+        Importer._registry.clear()
+
+
 def clear_django_gyro_registries():
     """
     Clear all Django Gyro registries and caches.
@@ -106,23 +188,25 @@ def clear_django_gyro_registries():
     Clears:
     - Importer._registry: Model to importer mappings
     - ImportJob._dependency_cache: Dependency computation cache
-    - ExportPlan._dependency_cache: Export plan dependency cache
+    - ExportPlan caches: Transitive and per-model direct dependencies
+    - CircularDependencyResolver caches: Per-model FK fields
+    - importing._hashed_business_id: Hashed business key cache
     """
     # Import here to avoid circular imports
-    from django_gyro import Importer
     from django_gyro.core import ImportJob
-    from django_gyro.importing import ExportPlan
+    from django_gyro.importing import CircularDependencyResolver, ExportPlan, _hashed_business_id
 
     # Clear the main importer registry
-    if hasattr(Importer, "_registry"):
-        Importer._registry.clear()
+    clear_importer_registry()
 
     # Clear dependency caches
     if hasattr(ImportJob, "_dependency_cache"):
         ImportJob._dependency_cache.clear()
 
-    if hasattr(ExportPlan, "_dependency_cache"):
-        ExportPlan._dependency_cache.clear()
+    ExportPlan.clear_caches()
+    CircularDependencyResolver.clear_caches()
+
+    _hashed_business_id.cache_clear()
 
 
 class DjangoGyroTestMixin:
@@ -132,7 +216,7 @@ class DjangoGyroTestMixin:
 
     Use this mixin in test classes to automatically clear all Django Gyro
     registries before and after each test, ensuring proper test isolation.
-    Also patches database connections to prevent geo_db_type errors.
+    Also swaps in a mock database connection to prevent geo_db_type errors.
 
     Example:
         class TestMyFeature(DjangoGyroTestMixin, TestCase):
@@ -146,14 +230,14 @@ class DjangoGyroTestMixin:
         """Clear Django Gyro registries and mock database before each test."""
         super().setUp()
         clear_django_gyro_registries()
-        # Patch database connection to prevent geo_db_type errors
-        self.db_conn_patcher = patch("django.db.connection", mock_db_connection())
-        self.db_conn_patcher.start()
+        # Swap the database connection to prevent geo_db_type errors
+        self._original_connection = django.db.connection
+        django.db.connection = mock_db_connection()
 
     def tearDown(self):
         """Clear Django Gyro registries and stop database mocking after each test."""
         clear_django_gyro_registries()
-        self.db_conn_patcher.stop()
+        django.db.connection = self._original_connection
         super().tearDown()
 
 
@@ -167,10 +251,10 @@ class DatabaseMockingTestMixin:
     def setup_method(self):
         """Mock database connection before each test."""
         clear_django_gyro_registries()
-        self.db_conn_patcher = patch("django.db.connection", mock_db_connection())
-        self.db_conn_patcher.start()
+        self._original_connection = django.db.connection
+        django.db.connection = mock_db_connection()
 
     def teardown_method(self):
         """Stop database mocking after each test."""
         clear_django_gyro_registries()
-        self.db_conn_patcher.stop()
+        django.db.connection = self._original_connection